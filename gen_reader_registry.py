@@ -0,0 +1,12 @@
+#!/usr/bin/python
+"""
+Generate the static type reader registry
+"""
+
+from __future__ import print_function
+
+from xnb_parse.gen_reader_registry import main
+
+
+if __name__ == '__main__':
+    main()
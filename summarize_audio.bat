@@ -0,0 +1,2 @@
+@echo off
+"%~dp0bin\python\python_mcp.exe" "%~dpn0.py" %*
@@ -0,0 +1,12 @@
+#!/usr/bin/python
+"""
+Write peaks and levels sidecars for exported sounds
+"""
+
+from __future__ import print_function
+
+from xnb_parse.summarize_audio import main
+
+
+if __name__ == '__main__':
+    main()
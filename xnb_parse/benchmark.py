@@ -0,0 +1,601 @@
+"""
+Microbenchmarks for parser hot spots
+"""
+
+from __future__ import print_function
+
+import os
+import struct
+import sys
+import time
+from collections import OrderedDict
+from random import Random
+from timeit import default_timer
+
+from xnb_parse.binstream import BinaryStream, blob_data
+from xnb_parse.file_formats.adpcm import (ADPCM_BLOCK_HEADER_SIZE, ADPCM_COEF, decode_adpcm_numpy, decode_adpcm_python,
+                                          samples_per_block)
+from xnb_parse.file_formats.audio_summary import summarize_pcm_numpy, summarize_pcm_python
+from xnb_parse.file_formats.wav import WAVE_FORMAT_ADPCM, WAVE_FORMAT_PCM
+from xnb_parse.reader_schema import FIXED_KINDS, read_schema
+from xnb_parse.type_reader import ReaderError, TypeReaderPlugin
+from xnb_parse.type_readers import load_all
+from xnb_parse.type_readers.fez.fez_basic import (ActorTypeReader, CollisionTypeReader, FaceOrientationReader,
+                                                  SurfaceTypeReader)
+from xnb_parse.type_readers.fez.fez_graphics import (ShaderInstancedIndexedPrimitivesReader,
+                                                     VertexPositionNormalTextureInstanceReader)
+from xnb_parse.type_readers.fez.fez_level import (ArtObjectActorSettingsReader, EntityReader, SkyLayerReader,
+                                                 TrileEmplacementReader, VolumeActorSettingsReader)
+from xnb_parse.type_readers.xna_math import Vector4Reader
+from xnb_parse.type_readers.xna_primitive import Int32Reader, StringReader
+from xnb_parse.type_readers.xna_system import ArrayReader, DictionaryReader, ListReader
+from xnb_parse.type_spec import TypeSpec, _CACHED_TYPES
+from xnb_parse.xna_content_manager import ContentManager
+from xnb_parse.fez_content_manager import FezContentManager
+from xnb_parse.xnb_reader import XNBReader
+from xnb_parse.xna_types.fez.fez_level import (AmbienceTrack, ArtObjectInstance, BackgroundPlane, CameraNodeData,
+                                               ScriptTrigger, Sky, SkyLayer, Trile, TrileFace, Volume, WinConditions)
+from xnb_parse.xna_types.fez.fez_music import Loop
+
+
+try:
+    unichr
+except NameError:
+    unichr = chr
+
+
+_FEZ_AQN = ', FezEngine, Version=1.0.0.0, Culture=neutral, PublicKeyToken=null'
+_MSCORLIB_AQN = ', mscorlib, Version=4.0.0.0, Culture=neutral, PublicKeyToken=b77a5c561934e089'
+_XNA_AQN = ', Microsoft.Xna.Framework, Version=4.0.0.0, Culture=neutral, PublicKeyToken=842cf8be1de50553'
+
+# reader names as they appear in FEZ level and trile set headers, used when no content is given
+SAMPLE_READER_NAMES = [
+    'FezEngine.Readers.LevelReader' + _FEZ_AQN,
+    'FezEngine.Readers.TrileFaceReader' + _FEZ_AQN,
+    'FezEngine.Readers.TrileEmplacementReader' + _FEZ_AQN,
+    'Microsoft.Xna.Framework.Content.EnumReader`1[[FezEngine.FaceOrientation' + _FEZ_AQN + ']]',
+    'Microsoft.Xna.Framework.Content.EnumReader`1[[FezEngine.Structure.LiquidType' + _FEZ_AQN + ']]',
+    'Microsoft.Xna.Framework.Content.DictionaryReader`2[[System.Int32' + _MSCORLIB_AQN +
+    '],[FezEngine.Structure.Volume' + _FEZ_AQN + ']]',
+    'FezEngine.Readers.VolumeReader' + _FEZ_AQN,
+    'Microsoft.Xna.Framework.Content.ArrayReader`1[[FezEngine.FaceOrientation' + _FEZ_AQN + ']]',
+    'Microsoft.Xna.Framework.Content.DictionaryReader`2[[System.Int32' + _MSCORLIB_AQN +
+    '],[FezEngine.Structure.Scripting.Script' + _FEZ_AQN + ']]',
+    'FezEngine.Readers.ScriptReader' + _FEZ_AQN,
+    'Microsoft.Xna.Framework.Content.ListReader`1[[FezEngine.Structure.Scripting.ScriptTrigger' + _FEZ_AQN + ']]',
+    'Microsoft.Xna.Framework.Content.DictionaryReader`2[[FezEngine.Structure.TrileEmplacement' + _FEZ_AQN +
+    '],[FezEngine.Structure.TrileInstance' + _FEZ_AQN + ']]',
+    'FezEngine.Readers.TrileInstanceReader' + _FEZ_AQN,
+    'Microsoft.Xna.Framework.Content.ListReader`1[[FezEngine.Structure.TrileInstance' + _FEZ_AQN + ']]',
+    'Microsoft.Xna.Framework.Content.DictionaryReader`2[[System.Int32' + _MSCORLIB_AQN +
+    '],[FezEngine.Structure.ArtObjectInstance' + _FEZ_AQN + ']]',
+    'FezEngine.Readers.TrileSetReader' + _FEZ_AQN,
+    'FezEngine.Readers.ShaderInstancedIndexedPrimitivesReader`2[[FezEngine.Structure.Geometry.'
+    'VertexPositionNormalTextureInstance' + _FEZ_AQN + '],[Microsoft.Xna.Framework.Vector4' + _XNA_AQN + ']]',
+    'Microsoft.Xna.Framework.Content.ArrayReader`1[[FezEngine.Structure.Geometry.'
+    'VertexPositionNormalTextureInstance' + _FEZ_AQN + ']]',
+    'Microsoft.Xna.Framework.Content.Texture2DReader',
+    'Microsoft.Xna.Framework.Content.StringReader',
+    'Microsoft.Xna.Framework.Content.Int32Reader',
+    'FezEngine.Readers.MapTreeReader' + _FEZ_AQN,
+    'FezEngine.Readers.MapNodeReader' + _FEZ_AQN,
+    'Microsoft.Xna.Framework.Content.ListReader`1[[FezEngine.Structure.MapNode+Connection' + _FEZ_AQN + ']]',
+    'FezEngine.Readers.MapNodeConnectionReader' + _FEZ_AQN,
+]
+
+BENCHMARKS = OrderedDict()
+
+
+def benchmark(func):
+    BENCHMARKS[func.__name__.replace('bench_', '', 1)] = func
+    return func
+
+
+def time_call(func, number=1, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = default_timer()
+        for _ in range(number):
+            func()
+        elapsed = default_timer() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best / number
+
+
+def report(name, seconds, count=1, unit='op'):
+    print('{:<48} {:>12.3f} us/{}'.format(name, seconds * 1e6 / count, unit))
+
+
+def get_content_manager(content_dir):
+    for pak_file in FezContentManager.content_pak_files:
+        if os.path.isfile(os.path.join(content_dir, pak_file)):
+            return FezContentManager(content_dir)
+    return ContentManager(content_dir)
+
+
+def find_reader_names(content_dir):
+    content_manager = get_content_manager(content_dir)
+    reader_names = set()
+    for asset_name in content_manager.assets:
+        try:
+            xnb = content_manager.xnb(asset_name, parse=False)
+        except (ReaderError, IOError) as ex:
+            print("SKIPPED: '{}' {}: {}".format(asset_name, type(ex).__name__, ex), file=sys.stderr)
+            continue
+        for _ in range(xnb.read_7bit_encoded_int()):
+            reader_names.add(xnb.read_string())
+            xnb.read_int32()
+    return sorted(reader_names)
+
+
+@benchmark
+def bench_type_spec(content_dir=None):
+    if content_dir is not None:
+        reader_names = find_reader_names(content_dir)
+    else:
+        reader_names = SAMPLE_READER_NAMES
+    print('{} reader names'.format(len(reader_names)))
+
+    def parse_cold():
+        for reader_name in reader_names:
+            _CACHED_TYPES.clear()
+            TypeSpec.parse(reader_name)
+
+    def parse_warm():
+        for reader_name in reader_names:
+            TypeSpec.parse(reader_name)
+
+    report('TypeSpec.parse uncached', time_call(parse_cold, 100), len(reader_names), 'name')
+    parse_warm()
+    report('TypeSpec.parse cached', time_call(parse_warm, 1000), len(reader_names), 'name')
+
+
+def schema_readers():
+    load_all()
+    readers = [cls for cls in TypeReaderPlugin.__subclasses__() if hasattr(cls.read, 'fields')]
+    return sorted(readers, key=lambda cls: cls.__name__)
+
+
+# the hand-written readers the schemas replaced, the baseline for the compiled ones
+
+def _read_sky(stream):
+    name = stream.read_string()
+    background = stream.read_string()
+    wind_speed = stream.read_single()
+    density = stream.read_single()
+    fog_density = stream.read_single()
+    layers = stream.read_object(ListReader, [SkyLayerReader])
+    clouds = stream.read_object(ListReader, [StringReader])
+    shadows = stream.read_object(StringReader)
+    stars = stream.read_object(StringReader)
+    cloud_tint = stream.read_object(StringReader)
+    vertical_tiling = stream.read_boolean()
+    horizontal_scrolling = stream.read_boolean()
+    layer_base_height = stream.read_single()
+    inter_layer_vertical_distance = stream.read_single()
+    inter_layer_horizontal_distance = stream.read_single()
+    horizontal_distance = stream.read_single()
+    vertical_distance = stream.read_single()
+    layer_base_spacing = stream.read_single()
+    wind_parallax = stream.read_single()
+    wind_distance = stream.read_single()
+    clouds_parallax = stream.read_single()
+    shadow_opacity = stream.read_single()
+    foliage_shadows = stream.read_boolean()
+    no_per_face_layer_x_offset = stream.read_boolean()
+    layer_base_x_offset = stream.read_single()
+    return Sky(name, background, wind_speed, density, fog_density, layers, clouds, shadows, stars, cloud_tint,
+               vertical_tiling, horizontal_scrolling, layer_base_height, inter_layer_vertical_distance,
+               inter_layer_horizontal_distance, horizontal_distance, vertical_distance, layer_base_spacing,
+               wind_parallax, wind_distance, clouds_parallax, shadow_opacity, foliage_shadows,
+               no_per_face_layer_x_offset, layer_base_x_offset)
+
+
+def _read_sky_layer(stream):
+    name = stream.read_string()
+    in_front = stream.read_boolean()
+    opacity = stream.read_single()
+    fog_tint = stream.read_single()
+    return SkyLayer(name, in_front, opacity, fog_tint)
+
+
+def _read_trile(stream):
+    name = stream.read_string()
+    cubemap_path = stream.read_string()
+    size = stream.read_vector3()
+    offset = stream.read_vector3()
+    immaterial = stream.read_boolean()
+    see_through = stream.read_boolean()
+    thin = stream.read_boolean()
+    force_hugging = stream.read_boolean()
+    faces = stream.read_object(DictionaryReader, [FaceOrientationReader, CollisionTypeReader])
+    geometry = stream.read_object(ShaderInstancedIndexedPrimitivesReader,
+                                  [VertexPositionNormalTextureInstanceReader, Vector4Reader])
+    actor_settings_type = stream.read_object(ActorTypeReader)
+    actor_settings_face = stream.read_object(FaceOrientationReader)
+    surface_type = stream.read_object(SurfaceTypeReader)
+    atlas_offset = stream.read_vector2()
+    return Trile(name, cubemap_path, size, offset, immaterial, see_through, thin, force_hugging, faces, geometry,
+                 actor_settings_type, actor_settings_face, surface_type, atlas_offset)
+
+
+def _read_background_plane(stream):
+    position = stream.read_vector3()
+    rotation = stream.read_quaternion()
+    scale = stream.read_vector3()
+    size = stream.read_vector3()
+    texture_name = stream.read_string()
+    light_map = stream.read_boolean()
+    allow_overbrightness = stream.read_boolean()
+    filter_ = stream.read_color()
+    animated = stream.read_boolean()
+    doublesided = stream.read_boolean()
+    opacity = stream.read_single()
+    attached_group = stream.read_object(Int32Reader)
+    billboard = stream.read_boolean()
+    sync_with_samples = stream.read_boolean()
+    crosshatch = stream.read_boolean()
+    unknown = stream.read_boolean()
+    always_on_top = stream.read_boolean()
+    fullbright = stream.read_boolean()
+    pixelated_lightmap = stream.read_boolean()
+    x_texture_repeat = stream.read_boolean()
+    y_texture_repeat = stream.read_boolean()
+    clamp_texture = stream.read_boolean()
+    actor_type = stream.read_object(ActorTypeReader)
+    attached_plane = stream.read_object(Int32Reader)
+    parallax_factor = stream.read_single()
+    return BackgroundPlane(position, rotation, scale, size, texture_name, light_map, allow_overbrightness, filter_,
+                           animated, doublesided, opacity, attached_group, billboard, sync_with_samples, crosshatch,
+                           unknown, always_on_top, fullbright, pixelated_lightmap, x_texture_repeat, y_texture_repeat,
+                           clamp_texture, actor_type, attached_plane, parallax_factor)
+
+
+def _read_win_conditions(stream):
+    chest_count = stream.read_int32()
+    locked_door_count = stream.read_int32()
+    unlocked_door_count = stream.read_int32()
+    script_ids = stream.read_object(ListReader, [Int32Reader])
+    cube_shard_count = stream.read_int32()
+    other_collectible_count = stream.read_int32()
+    split_up_count = stream.read_int32()
+    secret_count = stream.read_int32()
+    return WinConditions(chest_count, locked_door_count, unlocked_door_count, script_ids, cube_shard_count,
+                         other_collectible_count, split_up_count, secret_count)
+
+
+def _read_volume(stream):
+    orientations = stream.read_object(ArrayReader, [FaceOrientationReader])
+    v_from = stream.read_vector3()
+    v_to = stream.read_vector3()
+    actor_settings = stream.read_object(VolumeActorSettingsReader)
+    return Volume(orientations, v_from, v_to, actor_settings)
+
+
+def _read_art_object_instance(stream):
+    name = stream.read_string()
+    position = stream.read_vector3()
+    rotation = stream.read_quaternion()
+    scale = stream.read_vector3()
+    actor_settings = stream.read_object(ArtObjectActorSettingsReader)
+    return ArtObjectInstance(name, position, rotation, scale, actor_settings)
+
+
+def _read_trile_face(stream):
+    trile_id = stream.read_object(TrileEmplacementReader)
+    face = stream.read_object(FaceOrientationReader)
+    return TrileFace(trile_id, face)
+
+
+def _read_ambience_track(stream):
+    name = stream.read_object(StringReader)
+    dawn = stream.read_boolean()
+    day = stream.read_boolean()
+    dusk = stream.read_boolean()
+    night = stream.read_boolean()
+    return AmbienceTrack(name, dawn, day, dusk, night)
+
+
+def _read_script_trigger(stream):
+    entity = stream.read_object(EntityReader)
+    event = stream.read_string()
+    return ScriptTrigger(entity, event)
+
+
+def _read_camera_node_data(stream):
+    perspective = stream.read_boolean()
+    pixels_per_trixel = stream.read_int32()
+    sound_name = stream.read_object(StringReader)
+    return CameraNodeData(perspective, pixels_per_trixel, sound_name)
+
+
+def _read_loop(stream):
+    duration = stream.read_int32()
+    loop_times_from = stream.read_int32()
+    loop_times_to = stream.read_int32()
+    name = stream.read_string()
+    trigger_from = stream.read_int32()
+    trigger_to = stream.read_int32()
+    delay = stream.read_int32()
+    night = stream.read_boolean()
+    day = stream.read_boolean()
+    dusk = stream.read_boolean()
+    dawn = stream.read_boolean()
+    fractional_time = stream.read_boolean()
+    one_at_a_time = stream.read_boolean()
+    cut_off_tail = stream.read_boolean()
+    return Loop(duration, loop_times_from, loop_times_to, name, trigger_from, trigger_to, delay, night, day, dusk, dawn,
+                fractional_time, one_at_a_time, cut_off_tail)
+
+
+HAND_WRITTEN_READERS = {
+    'SkyReader': _read_sky,
+    'SkyLayerReader': _read_sky_layer,
+    'TrileReader': _read_trile,
+    'BackgroundPlaneReader': _read_background_plane,
+    'LoopReader': _read_loop,
+    'WinConditionsReader': _read_win_conditions,
+    'VolumeReader': _read_volume,
+    'ArtObjectInstanceReader': _read_art_object_instance,
+    'TrileFaceReader': _read_trile_face,
+    'AmbienceTrackReader': _read_ambience_track,
+    'ScriptTriggerReader': _read_script_trigger,
+    'CameraNodeDataReader': _read_camera_node_data,
+}
+
+
+def sample_schema_data(fields):
+    """
+    build one object worth of data for a schema, nested objects are written as null
+    """
+    stream = BinaryStream()
+    for field in fields:
+        if field.kind == 'string':
+            stream.write_string(field.name)
+        elif field.kind == 'object':
+            stream.write_7bit_encoded_int(0)
+        else:
+            stream.write(b'\x01' * stream.calc_size(FIXED_KINDS[field.kind][0]))
+    return stream.getvalue()
+
+
+def _attrs(obj):
+    if hasattr(obj, '__dict__'):
+        return vars(obj)
+    return dict((name, getattr(obj, name)) for name in obj.__slots__)
+
+
+@benchmark
+def bench_schema(content_dir=None):
+    """
+    each compiled schema reader against the hand-written reader it replaced, or the generic field at a time
+    interpreter for schemas that never had one
+    """
+    count = 1000
+    for reader_class in schema_readers():
+        fields = reader_class.read.fields
+        result_type = reader_class.read.result_type
+        stream = XNBReader(sample_schema_data(fields) * count, parse=False)
+        reader = reader_class(stream)
+        baseline_name = 'hand-written'
+        read_baseline = HAND_WRITTEN_READERS.get(reader_class.__name__)
+        if read_baseline is None:
+            baseline_name = 'per field'
+
+            def read_baseline(baseline_stream):
+                return read_schema(baseline_stream, result_type, fields)
+
+        def read_compiled():
+            stream.seek(0)
+            for _ in range(count):
+                reader.read()
+
+        def read_baselines():
+            stream.seek(0)
+            for _ in range(count):
+                read_baseline(stream)
+
+        stream.seek(0)
+        compiled_value = reader.read()
+        stream.seek(0)
+        if _attrs(compiled_value) != _attrs(read_baseline(stream)):
+            raise ReaderError("Compiled schema mismatch: '{}'".format(reader_class.__name__))
+        compiled = time_call(read_compiled, 10)
+        baseline = time_call(read_baselines, 10)
+        report('{} {}'.format(reader_class.__name__, baseline_name), baseline, count, 'obj')
+        report('{} compiled ({:.1f}x)'.format(reader_class.__name__, baseline / compiled), compiled, count, 'obj')
+
+
+# sample script and dialogue text for the synthetic string benchmark
+_SAMPLE_STRINGS = [
+    'Level.DotTalk', 'Gomez', 'Volume[3].Enter', 'PlaySound("Ui/Menu/Confirm")', 'ArtObject[12].Open',
+    u'Caf\u00e9 \u2014 les \u00e9toiles', u'\u3053\u3093\u306b\u3061\u306f', 'WATERFALL_ALT', 'Hub', '',
+]
+# a SpriteFont character map, ASCII plus accented and CJK characters
+_SAMPLE_CHARS = [unichr(c) for c in list(range(32, 127)) + list(range(0xc0, 0x100)) + list(range(0x3041, 0x3097))]
+
+
+def find_string_assets(content_dir):
+    """
+    decompressed SpriteFont and level assets, the most string and char heavy content
+    """
+    content_manager = get_content_manager(content_dir)
+    assets = []
+    for asset_name in content_manager.assets:
+        try:
+            xnb = content_manager.xnb(asset_name, parse=False)
+        except (ReaderError, IOError) as ex:
+            print("SKIPPED: '{}' {}: {}".format(asset_name, type(ex).__name__, ex), file=sys.stderr)
+            continue
+        data = xnb.getvalue()
+        xnb.read_7bit_encoded_int()
+        reader_name = xnb.read_string()
+        if 'SpriteFontReader' in reader_name or 'LevelReader' in reader_name:
+            assets.append((asset_name, data, xnb.file_platform, xnb.file_version))
+    return assets
+
+
+@benchmark
+def bench_strings(content_dir=None):
+    fast_buffer = BinaryStream.fast_buffer
+    try:
+        if content_dir is not None:
+            assets = find_string_assets(content_dir)
+            print('{} SpriteFont and level assets'.format(len(assets)))
+
+            def parse_assets():
+                for _, data, file_platform, file_version in assets:
+                    XNBReader(data, file_platform, file_version)
+
+            for fast_buffer_mode in (False, True):
+                BinaryStream.fast_buffer = fast_buffer_mode
+                report('parse assets fast_buffer={}'.format(fast_buffer_mode), time_call(parse_assets, 3),
+                       len(assets), 'asset')
+            return
+
+        count = 1000
+        stream = BinaryStream()
+        positions = OrderedDict((name, []) for name in ['7bit_encoded_int', 'string', 'char', 'cstring'])
+        for i in range(count):
+            positions['7bit_encoded_int'].append(stream.tell())
+            stream.write_7bit_encoded_int(i * 37)
+            positions['string'].append(stream.tell())
+            stream.write_string(_SAMPLE_STRINGS[i % len(_SAMPLE_STRINGS)])
+            positions['char'].append(stream.tell())
+            stream.write_char(_SAMPLE_CHARS[i % len(_SAMPLE_CHARS)])
+            positions['cstring'].append(stream.tell())
+            stream.write_cstring(_SAMPLE_STRINGS[i % len(_SAMPLE_STRINGS)])
+        data = stream.getvalue()
+
+        for name, name_positions in positions.items():
+            for fast_buffer_mode in (False, True):
+                BinaryStream.fast_buffer = fast_buffer_mode
+                stream = BinaryStream(data)
+                seek = stream.seek
+                read = getattr(stream, 'read_' + name)
+
+                def read_all():
+                    for pos in name_positions:
+                        seek(pos)
+                        read()
+
+                report('read_{} fast_buffer={}'.format(name, fast_buffer_mode), time_call(read_all, 20), count)
+    finally:
+        BinaryStream.fast_buffer = fast_buffer
+
+
+def sample_adpcm_data(seconds, channels=2, samples_per_sec=44100, block_align=1024):
+    """
+    MS-ADPCM blocks with valid headers and noise for samples
+    """
+    random = Random(0)
+    block_count = -(-seconds * samples_per_sec // samples_per_block(block_align, channels))
+    header_size = ADPCM_BLOCK_HEADER_SIZE * channels
+    blocks = []
+    for _ in range(block_count):
+        block = bytearray(random.randrange(len(ADPCM_COEF)) for _ in range(channels))
+        deltas = [random.randrange(16, 512) for _ in range(channels)]
+        samples = [random.randrange(-2048, 2048) for _ in range(channels * 2)]
+        block += struct.pack('<{}h'.format(3 * channels), *(deltas + samples))
+        block += bytearray(random.getrandbits(8) for _ in range(block_align - header_size))
+        blocks.append(bytes(block))
+    return b''.join(blocks)
+
+
+def find_sounds(content_dir, format_tag):
+    """
+    (asset_name, SoundEffect) for the sounds in content_dir with the given format tag
+    """
+    content_manager = get_content_manager(content_dir)
+    sounds = []
+    for asset_name, info in content_manager.inspect_many():
+        if info.root_type != 'Microsoft.Xna.Framework.Audio.SoundEffect':
+            continue
+        sound = content_manager.load(asset_name)
+        if struct.unpack_from('<H', sound.sound_format)[0] == format_tag:
+            sounds.append((asset_name, sound))
+    return sounds
+
+
+@benchmark
+def bench_adpcm(content_dir=None):
+    decoders = [('python', decode_adpcm_python)]
+    if decode_adpcm_numpy is not None:
+        decoders.append(('numpy', decode_adpcm_numpy))
+    else:
+        print('numpy not available')
+    if content_dir is not None:
+        sounds = []
+        for asset_name, sound in find_sounds(content_dir, WAVE_FORMAT_ADPCM):
+            channels, samples_per_sec = struct.unpack_from('<H I', sound.sound_format, 2)
+            block_align = struct.unpack_from('<H', sound.sound_format, 12)[0]
+            sounds.append((blob_data(sound.sound_data), channels, block_align,
+                           len(sound.sound_data) / float(block_align) * samples_per_block(block_align, channels) /
+                           samples_per_sec))
+        print('{} MS-ADPCM sounds'.format(len(sounds)))
+    else:
+        seconds = 10
+        sounds = [(sample_adpcm_data(seconds), 2, 1024, seconds)]
+    duration = sum(sound[3] for sound in sounds)
+    if not duration:
+        return
+    for name, decoder in decoders:
+
+        def decode_all():
+            for data, channels, block_align, _ in sounds:
+                decoder(data, channels, block_align)
+
+        seconds = time_call(decode_all, 1, 3)
+        print('{:<48} {:>12.3f} s/hour of audio'.format('decode_adpcm_' + name, seconds * 3600 / duration))
+
+
+@benchmark
+def bench_audio_summary(content_dir=None):
+    summarizers = [('python', summarize_pcm_python)]
+    if summarize_pcm_numpy is not None:
+        summarizers.append(('numpy', summarize_pcm_numpy))
+    else:
+        print('numpy not available')
+    if content_dir is not None:
+        sounds = []
+        for asset_name, sound in find_sounds(content_dir, WAVE_FORMAT_PCM):
+            channels, samples_per_sec = struct.unpack_from('<H I', sound.sound_format, 2)
+            bits_per_sample = struct.unpack_from('<H', sound.sound_format, 14)[0]
+            sounds.append((blob_data(sound.sound_data), channels, samples_per_sec, bits_per_sample,
+                           len(sound.sound_data) / float(channels * bits_per_sample // 8 * samples_per_sec)))
+        print('{} PCM sounds'.format(len(sounds)))
+    else:
+        seconds = 60
+        random = Random(0)
+        data = bytes(bytearray(random.getrandbits(8) for _ in range(seconds * 44100 * 4)))
+        sounds = [(data, 2, 44100, 16, seconds)]
+    duration = sum(sound[4] for sound in sounds)
+    if not duration:
+        return
+    for name, summarizer in summarizers:
+
+        def summarize_all():
+            for data, channels, samples_per_sec, bits_per_sample, _ in sounds:
+                summarizer(data, channels, samples_per_sec, bits_per_sample)
+
+        seconds = time_call(summarize_all, 1, 3)
+        print('{:<48} {:>12.3f} s/hour of audio'.format('summarize_pcm_' + name, seconds * 3600 / duration))
+
+
+def main():
+    if 1 < len(sys.argv) <= 3 and (sys.argv[1] in BENCHMARKS or sys.argv[1] == 'all'):
+        totaltime = time.time()
+        content_dir = None
+        if len(sys.argv) > 2:
+            content_dir = os.path.normpath(sys.argv[2])
+        if sys.argv[1] == 'all':
+            names = list(BENCHMARKS.keys())
+        else:
+            names = [sys.argv[1]]
+        for name in names:
+            print('> {}'.format(name))
+            BENCHMARKS[name](content_dir)
+        print('> Done in {:.2f} seconds'.format(time.time() - totaltime))
+    else:
+        print('benchmark.py {}|all [content_dir]'.format('|'.join(BENCHMARKS.keys())), file=sys.stderr)
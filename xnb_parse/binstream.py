@@ -4,23 +4,285 @@
 
 from __future__ import print_function
 
+import mmap
+import os
+import pickle
 import struct
 import sys
-from io import BytesIO, SEEK_END
+from io import BytesIO, SEEK_SET, SEEK_END
 
 
 _TYPE_FMT = ['Q', 'q', 'I', 'i', 'H', 'h', 'B', 'b', 'f', 'd', '?']
+# most wave data read at once from a FileRegion
+DEFAULT_WINDOW = 4 * 1024 * 1024
+
+_PY3 = sys.version_info >= (3,)
+_PickleBuffer = getattr(pickle, 'PickleBuffer', None)
+if _PY3:
+    _unichr = chr
+else:
+    _unichr = unichr
+
+
+def _bytes(value):
+    # Blobs unpickled from a snapshot have a memoryview source
+    if isinstance(value, memoryview):
+        return value.tobytes()
+    return value
+
+
+class Blob(object):
+    """
+    length bytes at offset in source, a bytes object or mmap, only copied out when the data is asked for
+    """
+    __slots__ = ('source', 'offset', 'length')
+
+    def __init__(self, source, offset=0, length=None):
+        if length is None:
+            length = len(source) - offset
+        self.source = source
+        self.offset = offset
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.length)
+            if step != 1:
+                return self.data[key]
+            return _bytes(self.source[self.offset + start:self.offset + max(start, stop)])
+        if key < 0:
+            key += self.length
+        if not 0 <= key < self.length:
+            raise IndexError("Blob index out of range")
+        return self.source[self.offset + key]
+
+    def __repr__(self):
+        return 'Blob(o:{} l:{})'.format(self.offset, self.length)
+
+    def __reduce_ex__(self, protocol):
+        # pickle protocol 5 can pass the payload out of band without copying it
+        if protocol >= 5 and _PickleBuffer is not None:
+            return Blob, (_PickleBuffer(self.view()),)
+        return Blob, (self.data,)
+
+    @property
+    def data(self):
+        return _bytes(self.source[self.offset:self.offset + self.length])
+
+    def view(self):
+        """
+        memoryview of the data without copying, for writing out
+        """
+        try:
+            return memoryview(self.source)[self.offset:self.offset + self.length]
+        except TypeError:
+            return self.data
+
+    def close(self):
+        """
+        unmap an mmap source, it and every other Blob over it can no longer be read
+        """
+        if isinstance(self.source, mmap.mmap):
+            self.source.close()
+
+
+class FileRegion(Blob):
+    """
+    length bytes at offset in the file source, read in aligned windows when copied out instead of being held in
+    memory. chunks() reads whole multiples of alignment starting on an alignment boundary, at most window bytes at a
+    time into a single reused buffer
+    """
+    __slots__ = ('alignment', 'window')
+
+    def __init__(self, filename, offset=0, length=None, alignment=1, window=DEFAULT_WINDOW):
+        if length is None:
+            length = os.path.getsize(filename) - offset
+        Blob.__init__(self, filename, offset, length)
+        self.alignment = max(alignment, 1)
+        self.window = max(window // self.alignment, 1) * self.alignment
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __repr__(self):
+        return 'FileRegion(o:{} l:{} a:{} w:{})'.format(self.offset, self.length, self.alignment, self.window)
+
+    @property
+    def data(self):
+        with open(self.source, 'rb') as in_file:
+            in_file.seek(self.offset)
+            data = in_file.read(self.length)
+        if len(data) != self.length:
+            raise EOFError("Truncated file region: {} < {}".format(len(data), self.length))
+        return data
+
+    def view(self):
+        return self.data
+
+    def close(self):
+        pass
+
+    def chunks(self):
+        """
+        yields memoryviews over the region in order, each is only valid until the next is asked for
+        """
+        buf = bytearray(self.window)
+        buf_view = memoryview(buf)
+        pos = self.offset - self.offset % self.alignment
+        end = self.offset + self.length
+        # reads stop at the first alignment boundary past the region rather than filling the whole window
+        aligned_end = -(-end // self.alignment) * self.alignment
+        # unbuffered so each read is issued as is
+        with open(self.source, 'rb', 0) as in_file:
+            in_file.seek(pos)
+            while pos < end:
+                count = in_file.readinto(buf_view[:min(self.window, aligned_end - pos)])
+                if not count:
+                    raise EOFError("Truncated file region: {} < {}".format(pos - self.offset, self.length))
+                start = max(self.offset - pos, 0)
+                stop = min(end - pos, count)
+                if stop > start:
+                    yield buf_view[start:stop]
+                pos += count
+
+
+def decode_7bit_encoded_int(data, pos=0):
+    """
+    decode a 7 bit encoded int at pos in any buffer, returns the value and the position after it
+    """
+    value = 0
+    for shift in (0, 7, 14, 21, 28):
+        byte = struct.unpack_from('B', data, pos)[0]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+    raise ValueError("Shift out of range")
+
+
+def map_file(filename, offset=0, length=None):
+    """
+    Blob of length bytes at offset in filename over a read only mmap that ends with the range, so pages are only read
+    when used. Falls back to reading the range in where the file can not be mapped
+    """
+    if length is None:
+        length = os.path.getsize(filename) - offset
+    start = offset - offset % mmap.ALLOCATIONGRANULARITY
+    with open(filename, 'rb') as file_handle:
+        if length > 0:
+            try:
+                mapping = mmap.mmap(file_handle.fileno(), offset + length - start, access=mmap.ACCESS_READ,
+                                    offset=start)
+            except (EnvironmentError, ValueError):
+                pass
+            else:
+                return Blob(mapping, offset - start, length)
+        file_handle.seek(offset)
+        return Blob(file_handle.read(max(length, 0)))
+
+
+def buffer_bytes(data):
+    """
+    bytes of any bytes-like value, bytes() of a memoryview on Python 2 is its repr rather than its contents
+    """
+    if isinstance(data, memoryview):
+        return data.tobytes()
+    return bytes(data)
+
+
+def blob_data(value):
+    """
+    bytes for a Blob, other bytes-like values are passed through
+    """
+    if isinstance(value, Blob):
+        return value.data
+    return value
+
+
+def _maps_to_end(blob):
+    return isinstance(blob.source, mmap.mmap) and blob.offset + blob.length == len(blob.source)
 
 
 class BinaryStream(BytesIO):
+    # decode varints, chars and strings straight from the initial data instead of reading byte by byte, only
+    # possible on Python 3 where indexing bytes gives ints
+    fast_buffer = _PY3
+
     def __init__(self, data=None, filename=None, big_endian=False):
         if filename is not None:
             with open(filename, 'rb') as file_handle:
                 data = file_handle.read()
-        BytesIO.__init__(self, data)
+        self._map = None
+        if isinstance(data, Blob):
+            if self.fast_buffer and _maps_to_end(data):
+                self._init_mapped(data)
+                data = None
+            else:
+                data = data.data
+        if self._map is None:
+            BytesIO.__init__(self, data)
+            if self.fast_buffer and isinstance(data, bytes):
+                self._data = data
+            else:
+                self._data = None
         self._types = {k: None for k in _TYPE_FMT}
         self.set_endian(big_endian)
 
+    def _init_mapped(self, blob):
+        # read straight from the mmap, the stream data is never copied so Blobs read from it stay in the mapping.
+        # The mapping ends where the stream does, the fast paths work in offsets into it while seek and tell are
+        # relative to the start of the stream as with BytesIO
+        BytesIO.__init__(self)
+        self._map = blob.source
+        self._base = blob.offset
+        self._data = self._map
+        self._map.seek(self._base)
+        self.read = self._map.read
+        self._seek = self._map.seek
+        self._tell = self._map.tell
+        self.seek = self._mapped_seek
+        self.tell = self._mapped_tell
+
+    # absolute position in the initial data
+    _seek = BytesIO.seek
+    _tell = BytesIO.tell
+
+    def _mapped_seek(self, pos, whence=SEEK_SET):
+        if whence == SEEK_SET:
+            if pos < 0:
+                raise ValueError("negative seek value {}".format(pos))
+            pos += self._base
+        cur_pos = self._map.tell()
+        self._map.seek(pos, whence)
+        if self._map.tell() < self._base:
+            self._map.seek(cur_pos)
+            raise ValueError("seek before start of stream")
+        return self._map.tell() - self._base
+
+    def _mapped_tell(self):
+        return self._map.tell() - self._base
+
+    def getvalue(self):
+        if self._map is not None:
+            return self._map[self._base:]
+        return BytesIO.getvalue(self)
+
+    def write(self, value):
+        if self._map is not None:
+            raise IOError("Mapped stream is read only")
+        # the initial data no longer matches the stream contents
+        self._data = None
+        return BytesIO.write(self, value)
+
+    def truncate(self, size=None):
+        if self._map is not None:
+            raise IOError("Mapped stream is read only")
+        self._data = None
+        return BytesIO.truncate(self, size)
+
     def set_endian(self, big_endian=False):
         self.big_endian = big_endian
         if self.big_endian:
@@ -29,6 +291,18 @@ class BinaryStream(BytesIO):
             self._fmt_end = '<'
         self._types = {k: struct.Struct(self._fmt_end + k) for k, v in self._types.items()}
 
+    def read_blob(self, count):
+        """
+        Blob for the next count bytes, referencing the stream data rather than copying it when possible
+        """
+        data = self._data
+        if data is None:
+            return Blob(self.read(count))
+        pos = self._tell()
+        count = max(0, min(count, len(data) - pos))
+        self._seek(pos + count)
+        return Blob(data, pos, count)
+
     def peek(self, count):
         cur_pos = self.tell()
         value = self.read(count)
@@ -40,12 +314,36 @@ class BinaryStream(BytesIO):
             file_handle.write(self.getvalue())
 
     def length(self):
+        if self._map is not None:
+            return len(self._map) - self._base
         cur_pos = self.tell()
         cur_len = self.seek(0, SEEK_END)
         self.seek(cur_pos)
         return cur_len
 
     def read_7bit_encoded_int(self):
+        data = self._data
+        if data is not None:
+            pos = self._tell()
+            try:
+                byte = data[pos]
+                if byte < 0x80:
+                    self._seek(pos + 1)
+                    return byte
+                value = byte & 0x7F
+                for shift in (7, 14, 21, 28):
+                    pos += 1
+                    byte = data[pos]
+                    value |= (byte & 0x7F) << shift
+                    if byte < 0x80:
+                        self._seek(pos + 1)
+                        return value
+            except IndexError:
+                pass
+            # truncated or overlong, let the byte at a time version report it
+        return self._read_7bit_encoded_int()
+
+    def _read_7bit_encoded_int(self):
         value = 0
         shift = 0
         while shift < 32:
@@ -68,6 +366,29 @@ class BinaryStream(BytesIO):
         return bytes_written
 
     def read_char(self):
+        data = self._data
+        if data is not None:
+            pos = self._tell()
+            try:
+                raw_value = data[pos]
+                if raw_value < 0x80:
+                    self._seek(pos + 1)
+                    return _unichr(raw_value)
+                byte_count = 0
+                while raw_value & (0x80 >> byte_count):
+                    byte_count += 1
+                raw_value &= (1 << (8 - byte_count)) - 1
+                end = pos + byte_count
+                if byte_count > 1 and end <= len(data):
+                    for pos in range(pos + 1, end):
+                        raw_value = (raw_value << 6) | (data[pos] & 0x3f)
+                    self._seek(end)
+                    return _unichr(raw_value)
+            except IndexError:
+                pass
+        return self._read_char()
+
+    def _read_char(self):
         raw_value = self._types['B'].unpack(self.read(1))[0]
         byte_count = 0
         while raw_value & (0x80 >> byte_count):
@@ -77,15 +398,21 @@ class BinaryStream(BytesIO):
             raw_value <<= 6
             raw_value |= self._types['B'].unpack(self.read(1))[0] & 0x3f
             byte_count -= 1
-        if sys.version < '3':
-            return unichr(raw_value)
-        else:
-            return chr(raw_value)
+        return _unichr(raw_value)
 
     def write_char(self, value):
         return self.write(value.encode('utf-8'))
 
     def read_string(self):
+        data = self._data
+        if data is not None:
+            # short strings have a single byte length
+            pos = self._tell()
+            if pos < len(data) and data[pos] < 0x80:
+                end = pos + 1 + data[pos]
+                if end <= len(data):
+                    self._seek(end)
+                    return data[pos + 1:end].decode('utf-8')
         size = self.read_7bit_encoded_int()
         raw_value = self.read(size)
         return raw_value.decode('utf-8')
@@ -97,6 +424,16 @@ class BinaryStream(BytesIO):
         return bytes_written
 
     def read_cstring(self, encoding='utf-8'):
+        data = self._data
+        if data is not None:
+            pos = self._tell()
+            end = data.find(b'\x00', pos)
+            if end < 0:
+                end = max(len(data), pos)
+                self._seek(end)
+            else:
+                self._seek(end + 1)
+            return data[pos:end].decode(encoding)
         raw_value = bytearray()
         cur_byte = self.read(1)
         while cur_byte != b'\x00' and cur_byte != b'':
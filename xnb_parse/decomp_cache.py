@@ -0,0 +1,139 @@
+"""
+On-disk cache of decompressed XNB payloads, shared between tools and worker processes
+"""
+
+from __future__ import print_function
+
+import os
+import tempfile
+from threading import Lock
+
+from xnb_parse.dedup import content_hash, replace_file
+
+
+CACHE_EXTENSION = '.bin'
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+# evict down to this fraction of max_bytes so a full cache is not scanned on every store
+_EVICT_TARGET = 0.9
+
+
+class DecompressionCache(object):
+    """
+    decompressed payloads stored under cache_dir by hash of the compressed payload and uncompressed size.
+
+    entries are written to a temporary file and renamed into place so concurrent readers never see a partial entry,
+    reads touch the entry mtime which eviction uses to remove the least recently used entries first
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = os.path.normpath(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # stores that failed, counted by callers that carry on without the entry
+        self.write_errors = 0
+        self._size = None
+        self._lock = Lock()
+
+    @staticmethod
+    def key(in_buf, out_size):
+        return '{}_{}'.format(content_hash(in_buf), out_size)
+
+    def filename(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + CACHE_EXTENSION)
+
+    def get(self, key, out_size):
+        """
+        cached payload for key, or None
+        """
+        filename = self.filename(key)
+        try:
+            with open(filename, 'rb') as in_file:
+                data = in_file.read()
+        except (IOError, OSError):
+            self.misses += 1
+            return None
+        if len(data) != out_size:
+            self.misses += 1
+            return None
+        try:
+            os.utime(filename, None)
+        except OSError:
+            # evicted by another worker since
+            pass
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        filename = self.filename(key)
+        dirname = os.path.dirname(filename)
+        if not os.path.isdir(dirname):
+            try:
+                os.makedirs(dirname)
+            except OSError:
+                # created by another worker
+                if not os.path.isdir(dirname):
+                    raise
+        temp_handle, temp_filename = tempfile.mkstemp(suffix='.tmp', prefix=key, dir=dirname)
+        try:
+            with os.fdopen(temp_handle, 'wb') as out_file:
+                out_file.write(data)
+            replace_file(temp_filename, filename)
+        except (IOError, OSError):
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+            raise
+        with self._lock:
+            if self._size is None:
+                self._size = self.size()
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self.evict(int(self.max_bytes * _EVICT_TARGET))
+
+    def entries(self):
+        """
+        yields (mtime, size, filename) for each entry in the cache
+        """
+        if not os.path.isdir(self.cache_dir):
+            return
+        for path, _, filelist in os.walk(self.cache_dir):
+            for filename in filelist:
+                if not filename.endswith(CACHE_EXTENSION):
+                    continue
+                filename = os.path.join(path, filename)
+                try:
+                    stat = os.stat(filename)
+                except OSError:
+                    continue
+                yield stat.st_mtime, stat.st_size, filename
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, target_bytes=0):
+        """
+        remove least recently used entries until the cache holds at most target_bytes
+        """
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, filename in entries:
+            if total <= target_bytes:
+                break
+            try:
+                os.remove(filename)
+                self.evictions += 1
+            except OSError:
+                # removed by another worker
+                pass
+            total -= size
+        self._size = total
+
+    def clear(self):
+        self.evict(0)
+
+    def report(self):
+        return '{} hits, {} misses, {} evictions, {} not written, {:,} bytes cached'.format(
+            self.hits, self.misses, self.evictions, self.write_errors, self.size())
+
@@ -0,0 +1,208 @@
+"""
+Content hash dedup for extracted assets
+"""
+
+from __future__ import print_function
+
+import hashlib
+import json
+import os
+import shutil
+from collections import OrderedDict
+
+
+MANIFEST_FILENAME = 'dedup_manifest.json'
+
+if hasattr(hashlib, 'blake2b'):
+    def content_hash(data):
+        return hashlib.blake2b(data, digest_size=20).hexdigest()
+else:
+    # no BLAKE2 before Python 3.6
+    def content_hash(data):
+        return hashlib.sha1(data).hexdigest()
+
+
+def remove_existing(filename):
+    """
+    remove filename before rewriting it, it may be a hard link shared with other outputs from an earlier run
+    """
+    if os.path.lexists(filename):
+        os.remove(filename)
+
+
+def replace_file(src, dst):
+    """
+    atomically move src over dst, readers see either the old or the new file and never a partial one
+    """
+    try:
+        os.replace(src, dst)
+    except AttributeError:
+        # no os.replace before Python 3.3, rename does not overwrite on Windows
+        if os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+
+
+# how duplicates are written, copy by default as hard linked outputs share their content and an edit to one in place
+# changes every copy. link hard links them to the first copy, listing only records them in the manifest
+DEDUP_ENV = 'XNB_PARSE_DEDUP'
+DEDUP_COPY = 'copy'
+DEDUP_LINK = 'link'
+DEDUP_LIST = 'list'
+DEDUP_MODES = (DEDUP_COPY, DEDUP_LINK, DEDUP_LIST)
+
+
+def dedup_mode_from_environment():
+    mode = os.environ.get(DEDUP_ENV, DEDUP_COPY).lower()
+    if mode not in DEDUP_MODES:
+        raise ValueError("Unknown {}: '{}', expected one of {}".format(DEDUP_ENV, mode, ', '.join(DEDUP_MODES)))
+    return mode
+
+
+class ContentDedup(object):
+    """
+    tracks content already written under out_dir. Duplicates are written as set by mode, DEDUP_COPY copies the first
+    file so only the work producing it is saved, DEDUP_LINK hard links to it where the file system allows and
+    DEDUP_LIST does not write them at all. Duplicates not written, including links that fail, are recorded in a
+    manifest of duplicate -> original paths relative to out_dir, merged with the one from earlier runs.
+    mode defaults to XNB_PARSE_DEDUP from the environment, or DEDUP_COPY
+    """
+
+    def __init__(self, out_dir, mode=None):
+        self.out_dir = os.path.normpath(out_dir)
+        if mode is None:
+            mode = dedup_mode_from_environment()
+        if mode == DEDUP_LINK and not hasattr(os, 'link'):
+            mode = DEDUP_LIST
+        self.mode = mode
+        self.originals = {}
+        self.manifest_filename = os.path.join(self.out_dir, MANIFEST_FILENAME)
+        self.manifest = self._load_manifest()
+        self.files = 0
+        self.duplicates = 0
+        self.total_bytes = 0
+        self.saved_bytes = 0
+        self.saved_seconds = 0.0
+
+    def find(self, digest):
+        """
+        filename first written for digest, or None
+        """
+        try:
+            return self.originals[digest][0]
+        except KeyError:
+            return None
+
+    def add(self, digest, filename, size, seconds=0.0):
+        """
+        record filename as the first copy of digest, seconds is what producing it cost
+        """
+        self.originals[digest] = (filename, size, seconds)
+        self.manifest.pop(self._relpath(filename), None)
+        self.files += 1
+        self.total_bytes += size
+
+    def kept(self, digest, filename):
+        """
+        record filename, left as it was by an earlier run, as holding digest. Counted as a duplicate if the content
+        was seen before in this run, and as saving space if it is a link to the first copy
+        """
+        if self.find(digest) is None:
+            self.add(digest, filename, os.path.getsize(filename))
+            return
+        original, size, _ = self.originals[digest]
+        self.files += 1
+        self.duplicates += 1
+        self.total_bytes += size
+        if _same_file(original, filename):
+            self.saved_bytes += size
+
+    def duplicate(self, digest, filename):
+        """
+        make filename a copy of the content already written for digest
+        """
+        original, size, seconds = self.originals[digest]
+        self.files += 1
+        self.duplicates += 1
+        self.total_bytes += size
+        self.saved_seconds += seconds
+        dirname = os.path.dirname(filename)
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        remove_existing(filename)
+        relpath = self._relpath(filename)
+        if self.mode == DEDUP_COPY:
+            shutil.copyfile(original, filename)
+            self.manifest.pop(relpath, None)
+            return
+        if self.mode == DEDUP_LINK:
+            try:
+                os.link(original, filename)
+                self.saved_bytes += size
+                self.manifest.pop(relpath, None)
+                return
+            except OSError:
+                self.mode = DEDUP_LIST
+        self.manifest[relpath] = self._relpath(original)
+        self.saved_bytes += size
+
+    def write(self, filename, data):
+        """
+        write data to filename unless the same content was written before
+        """
+        digest = content_hash(data)
+        if self.find(digest) is not None:
+            self.duplicate(digest, filename)
+            return False
+        dirname = os.path.dirname(filename)
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        remove_existing(filename)
+        with open(filename, 'wb') as out_file:
+            out_file.write(data)
+        self.add(digest, filename, len(data))
+        return True
+
+    def save_manifest(self):
+        """
+        save the duplicates listed by this and earlier runs, dropping any whose original is gone. Returns the manifest
+        filename, or None if no duplicates are listed
+        """
+        for relpath, original in list(self.manifest.items()):
+            if not os.path.isfile(os.path.join(self.out_dir, os.path.normpath(original))):
+                del self.manifest[relpath]
+        if not self.manifest:
+            remove_existing(self.manifest_filename)
+            return None
+        temp_filename = self.manifest_filename + '.tmp'
+        with open(temp_filename, 'w') as out_file:
+            json.dump({'duplicates': self.manifest}, out_file, indent=1, sort_keys=True)
+        replace_file(temp_filename, self.manifest_filename)
+        return self.manifest_filename
+
+    def report(self):
+        lines = ['{} files, {} duplicates'.format(self.files, self.duplicates),
+                 'saved {:,} of {:,} bytes'.format(self.saved_bytes, self.total_bytes)]
+        if self.saved_seconds:
+            lines.append('saved {:.2f} seconds of processing'.format(self.saved_seconds))
+        if self.manifest:
+            lines.append('{} duplicates listed in {}'.format(len(self.manifest), MANIFEST_FILENAME))
+        return '\n'.join(lines)
+
+    def _relpath(self, filename):
+        return os.path.relpath(filename, self.out_dir).replace(os.sep, '/')
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_filename, 'r') as in_file:
+                return OrderedDict(sorted(json.load(in_file).get('duplicates', {}).items()))
+        except (IOError, OSError, ValueError):
+            return OrderedDict()
+
+
+def _same_file(filename, other):
+    try:
+        return os.path.samefile(filename, other)
+    except (AttributeError, OSError):
+        # no samefile on Windows before Python 3.2
+        return False
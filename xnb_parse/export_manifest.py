@@ -0,0 +1,174 @@
+"""
+Manifest of exported assets, used to skip unchanged inputs on re-export
+"""
+
+from __future__ import print_function
+
+import json
+import os
+from threading import Lock
+
+from xnb_parse.dedup import content_hash, replace_file
+
+
+MANIFEST_SUFFIX = '.manifest.json'
+_MANIFEST_VERSION = 1
+# modules and packages whose code decides what is parsed and exported. The tools, caches and instrumentation around
+# them are left out, editing those leaves manifests and snapshot caches valid
+VERSIONED_SOURCES = ('binstream.py', 'fez_content_manager.py', 'fez_music_content_manager.py', 'identify.py',
+                     'reader_schema.py', 'type_reader.py', 'type_reader_manager.py', 'type_reader_registry.py',
+                     'type_spec.py', 'xna_content_manager.py', 'xna_native.py', 'xnb_reader.py', 'file_formats',
+                     'type_readers', 'xact', 'xna_types')
+
+_code_version = None
+_code_version_lock = Lock()
+
+
+def code_version():
+    """
+    hash of the VERSIONED_SOURCES, anything exported or cached by different code is stale
+    """
+    global _code_version
+    if _code_version is None:
+        with _code_version_lock:
+            if _code_version is None:
+                package_dir = os.path.dirname(os.path.abspath(__file__))
+                sources = []
+                for source in VERSIONED_SOURCES:
+                    source = os.path.join(package_dir, source)
+                    if not os.path.isdir(source):
+                        sources.append(source)
+                        continue
+                    for path, _, filelist in os.walk(source):
+                        for filename in filelist:
+                            if filename.endswith('.py'):
+                                sources.append(os.path.join(path, filename))
+                parts = []
+                for filename in sorted(sources):
+                    with open(filename, 'rb') as in_file:
+                        parts.append(os.path.relpath(filename, package_dir).replace(os.sep, '/').encode('utf-8'))
+                        parts.append(content_hash(in_file.read()).encode('ascii'))
+                _code_version = content_hash(b'\n'.join(parts))
+    return _code_version
+
+
+def file_hash(filename):
+    with open(filename, 'rb') as in_file:
+        return content_hash(in_file.read())
+
+
+class ExportManifest(object):
+    """
+    per asset source hash and outputs, stored next to out_dir as <out_dir>.<tool>.manifest.json.
+
+    for each asset call is_current, and if it is call keep, otherwise export it and call record with its outputs.
+    finish removes the outputs of assets that were neither kept nor recorded and saves the manifest
+    """
+
+    def __init__(self, out_dir, tool):
+        self.out_dir = os.path.normpath(out_dir)
+        self.filename = self.out_dir + '.' + tool + MANIFEST_SUFFIX
+        self.code_version = code_version()
+        self.assets = {}
+        self.seen = set()
+        self.claimed = set()
+        self.skipped = 0
+        self.exported = 0
+        self.removed = 0
+        if os.path.isfile(self.filename):
+            try:
+                with open(self.filename, 'r') as in_file:
+                    manifest = json.load(in_file)
+                if manifest.get('manifest_version') == _MANIFEST_VERSION:
+                    self.assets = manifest.get('assets', {})
+            except ValueError:
+                pass
+
+    def stat_digest(self, key, stat):
+        """
+        digest recorded for key if its source still has the same size and mtime, saves hashing unchanged files
+        """
+        entry = self.assets.get(key)
+        if entry is not None and entry.get('stat') == list(stat):
+            return entry['hash']
+        return None
+
+    def is_current(self, key, digest):
+        """
+        True if key was exported from the same source by the same code and all its outputs are still there
+        """
+        entry = self.assets.get(key)
+        if entry is None or entry.get('code_version') != self.code_version or entry.get('hash') != digest:
+            return False
+        for output in entry['outputs']:
+            if not os.path.isfile(os.path.join(self.out_dir, os.path.normpath(output))):
+                return False
+        return True
+
+    def keep(self, key, stat=None):
+        entry = self.assets[key]
+        if stat is not None:
+            entry['stat'] = list(stat)
+        self.seen.add(key)
+        self.claimed.update(entry['outputs'])
+        self.skipped += 1
+
+    def failed(self, key):
+        """
+        leave the outputs of key from an earlier run alone, it is retried next time as its hash is not updated
+        """
+        self.seen.add(key)
+
+    def record(self, key, digest, outputs, stat=None):
+        """
+        record the outputs written for key, skipping any already claimed by another asset in this run
+        """
+        outputs = sorted(set(self._relpath(output) for output in outputs) - self.claimed)
+        self.claimed.update(outputs)
+        old_entry = self.assets.get(key)
+        if old_entry is not None:
+            self._remove_outputs(set(old_entry['outputs']) - set(outputs) - self.claimed)
+        entry = {'hash': digest, 'code_version': self.code_version, 'outputs': outputs}
+        if stat is not None:
+            entry['stat'] = list(stat)
+        self.assets[key] = entry
+        self.seen.add(key)
+        self.exported += 1
+
+    def finish(self):
+        # outputs of stale assets written again by another asset in this run are kept
+        for key in sorted(set(self.assets) - self.seen):
+            self._remove_outputs(set(self.assets.pop(key)['outputs']) - self.claimed)
+        dirname = os.path.dirname(self.filename)
+        if dirname and not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        temp_filename = self.filename + '.tmp'
+        with open(temp_filename, 'w') as out_file:
+            json.dump({'manifest_version': _MANIFEST_VERSION, 'assets': self.assets}, out_file, indent=1,
+                      sort_keys=True)
+        replace_file(temp_filename, self.filename)
+
+    def report(self):
+        return '{} exported, {} unchanged, {} outputs removed'.format(self.exported, self.skipped, self.removed)
+
+    def _relpath(self, filename):
+        return os.path.relpath(filename, self.out_dir).replace(os.sep, '/')
+
+    def _remove_outputs(self, outputs):
+        for output in outputs:
+            filename = os.path.join(self.out_dir, os.path.normpath(output))
+            if os.path.lexists(filename):
+                os.remove(filename)
+                self.removed += 1
+            # prune directories left empty
+            dirname = os.path.dirname(filename)
+            while dirname != self.out_dir and dirname.startswith(self.out_dir) and os.path.isdir(dirname):
+                if os.listdir(dirname):
+                    break
+                os.rmdir(dirname)
+                dirname = os.path.dirname(dirname)
+
+
+def file_stat(filename):
+    stat = os.stat(filename)
+    return stat.st_size, int(stat.st_mtime * 1000)
@@ -4,42 +4,86 @@ Fez ContentManager
 
 from __future__ import print_function
 
+import mmap
 import os
+import struct
 
 from xnb_parse.identify import identify_buffer
 from xnb_parse.xna_content_manager import ContentManager
 from xnb_parse.xnb_reader import XNBReader
-from xnb_parse.binstream import BinaryStream
+from xnb_parse.binstream import Blob, decode_7bit_encoded_int
+from xnb_parse.pipeline_metrics import stage
 
 
 class FezContentManager(ContentManager):
     content_pak_files = ['Essentials.pak', 'Updates.pak', 'Other.pak']
 
     def find_assets(self):
+        # the pak each asset is in, for mapping just the asset when parsing it
+        self._asset_paks = {}
+        self._pak_maps = []
         for pak_file in self.content_pak_files:
             filename = os.path.join(self.root_dir, pak_file)
-            if os.path.isfile(filename):
-                stream = BinaryStream(filename=filename)
-                capacity = stream.read_int32()
+            if os.path.isfile(filename) and os.path.getsize(filename):
+                # map the pak and hand out Blobs into it, asset data is only paged in when used
+                with open(filename, 'rb') as file_handle:
+                    pak_data = mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+                self._pak_maps.append(pak_data)
+                capacity = struct.unpack_from('<i', pak_data, 0)[0]
+                pos = 4
                 for _ in range(capacity):
-                    asset_name = stream.read_string()
-                    asset_size = stream.read_int32()
-                    asset_data = stream.read(asset_size)
+                    name_size, pos = decode_7bit_encoded_int(pak_data, pos)
+                    asset_name = pak_data[pos:pos + name_size].decode('utf-8')
+                    pos += name_size
+                    asset_size = struct.unpack_from('<i', pak_data, pos)[0]
+                    pos += 4
+                    asset_data = Blob(pak_data, pos, asset_size)
+                    pos += asset_size
                     asset_name = asset_name.replace('\\', '/')
                     asset_name = asset_name.lower()
+                    self._asset_paks.setdefault(asset_name, filename)
                     yield asset_name, asset_data
 
     def xnb(self, asset_name, expected_type=None, parse=True):
         asset_name = asset_name.replace('\\', '/')
         asset_name = asset_name.lower()
-        return XNBReader.load(data=self._asset_dict[asset_name], expected_type=expected_type, parse=parse)
+        asset_data = self._asset_dict[asset_name]
+        # a mapping of its own that ends with the asset, so the reader can parse it in place
+        return XNBReader.load(filename=self._asset_paks[asset_name], expected_type=expected_type, parse=parse,
+                              offset=asset_data.offset, length=asset_data.length)
+
+    def close(self):
+        for pak_data in self._pak_maps:
+            pak_data.close()
+        self._pak_maps = []
+
+    def inspect(self, asset_name):
+        asset_name = asset_name.replace('\\', '/')
+        asset_name = asset_name.lower()
+        return XNBReader.inspect(data=self._asset_dict[asset_name])
+
+    def asset_data(self, asset_name):
+        asset_name = asset_name.replace('\\', '/')
+        asset_name = asset_name.lower()
+        return self._asset_dict[asset_name]
+
+    def snapshot_stat_key(self, asset_name, expected_type=None):
+        # assets are slices of a pak, hashing the mapped data does not read anything twice
+        return None
+
+    def save_filename(self, asset_name, out_dir):
+        extension = identify_buffer(self._asset_dict[asset_name])
+        return os.path.join(out_dir, os.path.normpath(asset_name) + extension)
 
-    def save(self, asset_name, out_dir):
+    def save(self, asset_name, out_dir, dedup=None):
         asset_data = self._asset_dict[asset_name]
-        extension = identify_buffer(asset_data)
-        filename = os.path.join(out_dir, os.path.normpath(asset_name) + extension)
-        dirname = os.path.dirname(filename)
-        if not os.path.isdir(dirname):
-            os.makedirs(dirname)
-        with open(filename, 'wb') as out_file:
-            out_file.write(asset_data)
+        filename = self.save_filename(asset_name, out_dir)
+        with stage('write'):
+            if dedup is not None:
+                return dedup.write(filename, asset_data.view())
+            dirname = os.path.dirname(filename)
+            if not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            with open(filename, 'wb') as out_file:
+                out_file.write(asset_data.view())
+        return True
@@ -8,21 +8,61 @@ import sys
 import os
 import time
 
+from xnb_parse.dedup import ContentDedup, content_hash, remove_existing
+from xnb_parse.export_manifest import ExportManifest
 from xnb_parse.fez_content_manager import FezContentManager
+from xnb_parse.pipeline_metrics import PipelineMetrics, dump_metrics
 from xnb_parse.type_reader import ReaderError
+from xnb_parse.xnb_reader import XNB_EXTENSION
 
 
-def unpack(content_dir, out_dir):
+def unpack(content_dir, out_dir, incremental=True):
     content_manager = FezContentManager(content_dir)
     out_dir = os.path.normpath(out_dir)
-    for asset_name in content_manager.assets:
-        print(asset_name)
-        try:
-            xnb = content_manager.xnb(asset_name, parse=False)
-            out_file = os.path.join(out_dir, os.path.normpath(asset_name))
-            xnb.save(filename=out_file)
-        except ReaderError as ex:
-            print("FAILED: '{}' {}: {}".format(asset_name, type(ex).__name__, ex), file=sys.stderr)
+    dedup = ContentDedup(out_dir)
+    manifest = None
+    if incremental:
+        manifest = ExportManifest(out_dir, 'fez_decomp')
+    metrics = PipelineMetrics('fez_decomp').start()
+    try:
+        for asset_name in content_manager.assets:
+            try:
+                asset_data = content_manager.asset_data(asset_name)
+                digest = content_hash(asset_data.view())
+                out_file = os.path.join(out_dir, os.path.normpath(asset_name)) + XNB_EXTENSION
+                if manifest is not None and manifest.is_current(asset_name, digest):
+                    manifest.keep(asset_name)
+                    metrics.skip(asset_name)
+                    dedup.kept(digest, out_file)
+                    continue
+                print(asset_name)
+                with metrics.asset(asset_name) as timer:
+                    timer.bytes_in = len(asset_data)
+                    # identical packed assets decompress identically, copy or link the first one instead
+                    if dedup.find(digest) is not None:
+                        dedup.duplicate(digest, out_file)
+                    else:
+                        start = time.time()
+                        xnb = content_manager.xnb(asset_name, parse=False)
+                        remove_existing(out_file)
+                        xnb.save(filename=out_file)
+                        timer.bytes_out = os.path.getsize(out_file)
+                        dedup.add(digest, out_file, timer.bytes_out, time.time() - start)
+                if manifest is not None:
+                    manifest.record(asset_name, digest, [out_file])
+            except ReaderError as ex:
+                print("FAILED: '{}' {}: {}".format(asset_name, type(ex).__name__, ex), file=sys.stderr)
+                if manifest is not None:
+                    manifest.failed(asset_name)
+    finally:
+        content_manager.close()
+        metrics.stop()
+    dedup.save_manifest()
+    print(dedup.report())
+    if manifest is not None:
+        manifest.finish()
+        print(manifest.report())
+    dump_metrics(metrics)
 
 
 def main():
@@ -14,9 +14,12 @@ from xnb_parse.fez_music_content_manager import FezMusicContentManager
 def unpack(content_dir, out_dir):
     content_manager = FezMusicContentManager(content_dir)
     out_dir = os.path.normpath(out_dir)
-    for asset_name in content_manager.assets:
-        print(asset_name)
-        content_manager.save(asset_name, out_dir)
+    try:
+        for asset_name in content_manager.assets:
+            print(asset_name)
+            content_manager.save(asset_name, out_dir)
+    finally:
+        content_manager.close()
 
 
 def main():
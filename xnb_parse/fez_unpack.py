@@ -8,15 +8,47 @@ import sys
 import os
 import time
 
+from xnb_parse.dedup import ContentDedup, content_hash
+from xnb_parse.export_manifest import ExportManifest
 from xnb_parse.fez_content_manager import FezContentManager
+from xnb_parse.pipeline_metrics import PipelineMetrics, dump_metrics
 
 
-def unpack(content_dir, out_dir):
+def unpack(content_dir, out_dir, incremental=True):
     content_manager = FezContentManager(content_dir)
     out_dir = os.path.normpath(out_dir)
-    for asset_name in content_manager.assets:
-        print(asset_name)
-        content_manager.save(asset_name, out_dir)
+    dedup = ContentDedup(out_dir)
+    manifest = None
+    if incremental:
+        manifest = ExportManifest(out_dir, 'fez_unpack')
+    metrics = PipelineMetrics('fez_unpack').start()
+    try:
+        for asset_name in content_manager.assets:
+            asset_data = content_manager.asset_data(asset_name)
+            if manifest is not None:
+                digest = content_hash(asset_data.view())
+                out_file = content_manager.save_filename(asset_name, out_dir)
+                if manifest.is_current(asset_name, digest):
+                    manifest.keep(asset_name)
+                    metrics.skip(asset_name)
+                    dedup.kept(digest, out_file)
+                    continue
+            print(asset_name)
+            with metrics.asset(asset_name) as timer:
+                timer.bytes_in = len(asset_data)
+                if content_manager.save(asset_name, out_dir, dedup):
+                    timer.bytes_out = len(asset_data)
+            if manifest is not None:
+                manifest.record(asset_name, digest, [out_file])
+    finally:
+        content_manager.close()
+        metrics.stop()
+    dedup.save_manifest()
+    print(dedup.report())
+    if manifest is not None:
+        manifest.finish()
+        print(manifest.report())
+    dump_metrics(metrics)
 
 
 def main():
@@ -0,0 +1,154 @@
+"""
+Decode MS-ADPCM to 16 bit PCM
+"""
+
+from __future__ import print_function
+
+import struct
+import sys
+from array import array
+
+from xnb_parse.type_reader import ReaderError
+
+
+ADPCM_COEF = [
+    (256, 0),
+    (512, -256),
+    (0, 0),
+    (192, 64),
+    (240, 0),
+    (460, -208),
+    (392, -232)
+]
+ADPCM_ADAPTATION = [230, 230, 230, 230, 307, 409, 512, 614, 768, 614, 512, 409, 307, 230, 230, 230]
+ADPCM_MIN_DELTA = 16
+# keeps corrupt data from growing delta without bound, as other decoders do
+ADPCM_MAX_DELTA = 0x7fffffff // 768
+# per channel predictor index, delta, sample1 and sample2
+ADPCM_BLOCK_HEADER_SIZE = 7
+
+_PY3 = sys.version_info >= (3,)
+
+
+def samples_per_block(block_align, channels):
+    return ((block_align - ADPCM_BLOCK_HEADER_SIZE * channels) * 8) // (4 * channels) + 2
+
+
+def decoded_size(data_size, channels, block_align):
+    """
+    bytes of 16 bit PCM that data_size bytes of MS-ADPCM decode to, the last block may be short
+    """
+    (block_count, last_size) = divmod(data_size, block_align)
+    samples = block_count * samples_per_block(block_align, channels)
+    if last_size:
+        samples += samples_per_block(last_size, channels)
+    return samples * channels * 2
+
+
+def _check_block(block_size, channels, coefs, predictors):
+    if block_size < ADPCM_BLOCK_HEADER_SIZE * channels:
+        raise ReaderError("Truncated ADPCM block: {}".format(block_size))
+    for predictor in predictors:
+        if predictor >= len(coefs):
+            raise ReaderError("Invalid ADPCM predictor: {}".format(predictor))
+
+
+def decode_adpcm_python(data, channels, block_align, coefs=ADPCM_COEF):
+    """
+    pure Python decoder, one sample at a time
+    """
+    samples = array('h')
+    header_fmt = '<{}h'.format(3 * channels)
+    for block_start in range(0, len(data), block_align):
+        block = bytearray(data[block_start:block_start + block_align])
+        predictors = block[:channels]
+        _check_block(len(block), channels, coefs, predictors)
+        header = struct.unpack_from(header_fmt, bytes(block), channels)
+        delta = list(header[:channels])
+        sample1 = list(header[channels:2 * channels])
+        sample2 = list(header[2 * channels:])
+        coef1 = [coefs[predictor][0] for predictor in predictors]
+        coef2 = [coefs[predictor][1] for predictor in predictors]
+        samples.extend(sample2)
+        samples.extend(sample1)
+        channel = 0
+        for value in block[ADPCM_BLOCK_HEADER_SIZE * channels:]:
+            for nibble in (value >> 4, value & 0x0f):
+                predicted = (sample1[channel] * coef1[channel] + sample2[channel] * coef2[channel]) >> 8
+                if nibble >= 8:
+                    sample = predicted + (nibble - 16) * delta[channel]
+                else:
+                    sample = predicted + nibble * delta[channel]
+                if sample > 32767:
+                    sample = 32767
+                elif sample < -32768:
+                    sample = -32768
+                samples.append(sample)
+                sample2[channel] = sample1[channel]
+                sample1[channel] = sample
+                delta[channel] = min(max((ADPCM_ADAPTATION[nibble] * delta[channel]) >> 8, ADPCM_MIN_DELTA),
+                                     ADPCM_MAX_DELTA)
+                channel += 1
+                if channel == channels:
+                    channel = 0
+    if sys.byteorder == 'big':
+        samples.byteswap()
+    if _PY3:
+        return samples.tobytes()
+    return samples.tostring()
+
+
+try:
+    import numpy as np
+
+    def decode_adpcm_numpy(data, channels, block_align, coefs=ADPCM_COEF):
+        """
+        vectorized decoder, steps through the samples of every block and channel at once
+        """
+        header_size = ADPCM_BLOCK_HEADER_SIZE * channels
+        data = np.frombuffer(data, dtype=np.uint8)
+        block_count = -(-len(data) // block_align)
+        if not block_count:
+            return b''
+        last_size = len(data) - (block_count - 1) * block_align
+        if last_size < block_align:
+            # decode the short last block padded out and trim it afterwards
+            data = np.concatenate([data, np.zeros(block_align - last_size, dtype=np.uint8)])
+        blocks = data.reshape(block_count, block_align)
+        predictors = blocks[:, :channels].astype(np.intp)
+        _check_block(last_size, channels, coefs, [int(predictors.max())])
+        header = np.ascontiguousarray(blocks[:, channels:header_size]).view('<i2').reshape(block_count, 3, channels)
+        delta = header[:, 0, :].astype(np.int64)
+        sample1 = header[:, 1, :].astype(np.int64)
+        sample2 = header[:, 2, :].astype(np.int64)
+        coef = np.array(coefs, dtype=np.int64)
+        coef1 = coef[predictors, 0]
+        coef2 = coef[predictors, 1]
+        packed = blocks[:, header_size:]
+        nibbles = np.empty((block_count, packed.shape[1] * 2), dtype=np.uint8)
+        nibbles[:, 0::2] = packed >> 4
+        nibbles[:, 1::2] = packed & 0x0f
+        steps = nibbles.shape[1] // channels
+        nibbles = nibbles[:, :steps * channels].reshape(block_count, steps, channels)
+        signed = nibbles.astype(np.int64)
+        signed[signed >= 8] -= 16
+        adaptation = np.array(ADPCM_ADAPTATION, dtype=np.int64)[nibbles]
+        samples = np.empty((block_count, steps + 2, channels), dtype='<i2')
+        samples[:, 0, :] = sample2
+        samples[:, 1, :] = sample1
+        for step in range(steps):
+            sample = np.clip(((sample1 * coef1 + sample2 * coef2) >> 8) + signed[:, step, :] * delta, -32768, 32767)
+            samples[:, step + 2, :] = sample
+            sample2 = sample1
+            sample1 = sample
+            delta = np.clip((adaptation[:, step, :] * delta) >> 8, ADPCM_MIN_DELTA, ADPCM_MAX_DELTA)
+        samples = samples.reshape(block_count, (steps + 2) * channels)
+        if last_size < block_align:
+            last_count = (2 + ((last_size - header_size) * 2) // channels) * channels
+            return samples[:-1].tobytes() + samples[-1, :last_count].tobytes()
+        return samples.tobytes()
+
+    decode_adpcm = decode_adpcm_numpy
+except ImportError:
+    decode_adpcm_numpy = None
+    decode_adpcm = decode_adpcm_python
@@ -0,0 +1,231 @@
+"""
+Waveform peaks and levels of PCM sounds, stored in compact sidecar files
+"""
+
+from __future__ import print_function
+
+import math
+import struct
+import sys
+from array import array
+
+from xnb_parse.type_reader import ReaderError
+from xnb_parse.binstream import Blob, buffer_bytes
+
+
+SUMMARY_EXTENSION = '.peaks'
+# columns in the min/max peak arrays, enough for a waveform thumbnail
+DEFAULT_BINS = 1024
+SUMMARY_MAGIC = b'XAPK'
+_SUMMARY_VERSION = 1
+_SUMMARY_HEADER = struct.Struct('<4s H H I Q I')
+_SUMMARY_LEVELS = struct.Struct('<f f')
+# sum of squares is taken this many samples at a time so long sounds do not need a wide copy of every sample
+_RMS_CHUNK = 1024 * 1024
+
+_PY3 = sys.version_info >= (3,)
+
+
+class AudioSummary(object):
+    """
+    per channel peak and RMS levels as fractions of full scale, and min/max peak arrays of signed 8 bit values
+    with bins columns, mins[channel][column] and maxs[channel][column]
+    """
+
+    def __init__(self, channels, sample_rate, frames, peaks, rms, mins, maxs):
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.frames = frames
+        self.peaks = peaks
+        self.rms = rms
+        self.mins = mins
+        self.maxs = maxs
+
+    def __str__(self):
+        return 'AudioSummary c:{} r:{} f:{} peak:{} rms:{}'.format(
+            self.channels, self.sample_rate, self.frames, ' '.join('{:.1f}dB'.format(v) for v in self.peak_db),
+            ' '.join('{:.1f}dB'.format(v) for v in self.rms_db))
+
+    @property
+    def bins(self):
+        if not self.mins:
+            return 0
+        return len(self.mins[0])
+
+    @property
+    def duration(self):
+        if not self.sample_rate:
+            return 0.0
+        return self.frames / float(self.sample_rate)
+
+    @property
+    def peak_db(self):
+        return [to_db(value) for value in self.peaks]
+
+    @property
+    def rms_db(self):
+        return [to_db(value) for value in self.rms]
+
+    def write(self, filename):
+        with open(filename, 'wb') as out_file:
+            out_file.write(_SUMMARY_HEADER.pack(SUMMARY_MAGIC, _SUMMARY_VERSION, self.channels, self.sample_rate,
+                                                self.frames, self.bins))
+            for (peak, rms) in zip(self.peaks, self.rms):
+                out_file.write(_SUMMARY_LEVELS.pack(peak, rms))
+            # columns interleaved by channel, min then max, as a waveform is drawn
+            minmax = array('b')
+            for column in range(self.bins):
+                for channel in range(self.channels):
+                    minmax.append(self.mins[channel][column])
+                    minmax.append(self.maxs[channel][column])
+            out_file.write(_array_bytes(minmax))
+
+    @classmethod
+    def read(cls, filename):
+        with open(filename, 'rb') as in_file:
+            data = in_file.read()
+        (magic, version, channels, sample_rate, frames, bins) = _SUMMARY_HEADER.unpack_from(data, 0)
+        if magic != SUMMARY_MAGIC:
+            raise ReaderError("bad summary magic: '{!r}'".format(magic))
+        if version != _SUMMARY_VERSION:
+            raise ReaderError("Unknown summary version: {}".format(version))
+        pos = _SUMMARY_HEADER.size
+        peaks = []
+        rms = []
+        for _ in range(channels):
+            (peak, channel_rms) = _SUMMARY_LEVELS.unpack_from(data, pos)
+            peaks.append(peak)
+            rms.append(channel_rms)
+            pos += _SUMMARY_LEVELS.size
+        minmax = array('b')
+        if _PY3:
+            minmax.frombytes(data[pos:pos + bins * channels * 2])
+        else:
+            minmax.fromstring(data[pos:pos + bins * channels * 2])
+        if len(minmax) != bins * channels * 2:
+            raise ReaderError("Truncated summary: {}".format(filename))
+        mins = [minmax[channel * 2::channels * 2] for channel in range(channels)]
+        maxs = [minmax[channel * 2 + 1::channels * 2] for channel in range(channels)]
+        return cls(channels, sample_rate, frames, peaks, rms, mins, maxs)
+
+
+def to_db(value):
+    if value <= 0:
+        return float('-inf')
+    return 20.0 * math.log10(value)
+
+
+def _array_bytes(values):
+    if _PY3:
+        return values.tobytes()
+    return values.tostring()
+
+
+def _bin_starts(frames, bins):
+    return [(column * frames) // bins for column in range(bins)]
+
+
+def _empty_summary(channels, sample_rate):
+    return AudioSummary(channels, sample_rate, 0, [0.0] * channels, [0.0] * channels, [array('b')] * channels,
+                        [array('b')] * channels)
+
+
+def summarize_pcm_python(data, channels, sample_rate, bits_per_sample, big_endian=False, bins=DEFAULT_BINS):
+    """
+    pure Python summary, min and max of each column are taken over array slices
+    """
+    if isinstance(data, Blob):
+        data = data.view()
+    frame_size = channels * bits_per_sample // 8
+    frames = len(data) // frame_size
+    if not frames:
+        return _empty_summary(channels, sample_rate)
+    data = buffer_bytes(data[:frames * frame_size])
+    if bits_per_sample == 16:
+        samples = array('h')
+        if _PY3:
+            samples.frombytes(data)
+        else:
+            samples.fromstring(data)
+        if big_endian != (sys.byteorder == 'big'):
+            samples.byteswap()
+        shift = 8
+        full_scale = 32768.0
+    else:
+        # unsigned 8 bit, centered on 128
+        samples = array('h', [value - 128 for value in bytearray(data)])
+        shift = 0
+        full_scale = 128.0
+    bins = min(bins, frames)
+    starts = _bin_starts(frames, bins) + [frames]
+    peaks = []
+    rms = []
+    mins = []
+    maxs = []
+    for channel in range(channels):
+        channel_samples = samples[channel::channels]
+        channel_mins = array('b')
+        channel_maxs = array('b')
+        for column in range(bins):
+            column_samples = channel_samples[starts[column]:starts[column + 1]]
+            channel_mins.append(min(column_samples) >> shift)
+            channel_maxs.append(max(column_samples) >> shift)
+        peaks.append(max(-min(channel_samples), max(channel_samples)) / full_scale)
+        rms.append(math.sqrt(sum(value * value for value in channel_samples) / float(frames)) / full_scale)
+        mins.append(channel_mins)
+        maxs.append(channel_maxs)
+    return AudioSummary(channels, sample_rate, frames, peaks, rms, mins, maxs)
+
+
+try:
+    import numpy as np
+
+    def summarize_pcm_numpy(data, channels, sample_rate, bits_per_sample, big_endian=False, bins=DEFAULT_BINS):
+        """
+        vectorized summary, columns are reduced with reduceat over the interleaved samples
+        """
+        if isinstance(data, Blob):
+            data = data.view()
+        frame_size = channels * bits_per_sample // 8
+        frames = len(data) // frame_size
+        if not frames:
+            return _empty_summary(channels, sample_rate)
+        if bits_per_sample == 16:
+            samples = np.frombuffer(data, dtype='>i2' if big_endian else '<i2', count=frames * channels)
+            shift = 8
+            full_scale = 32768.0
+        else:
+            samples = np.frombuffer(data, dtype=np.uint8, count=frames * channels).astype(np.int16) - 128
+            shift = 0
+            full_scale = 128.0
+        samples = samples.reshape(frames, channels)
+        bins = min(bins, frames)
+        starts = np.array(_bin_starts(frames, bins), dtype=np.intp)
+        # widened so the peak of a full scale negative sample can be negated
+        column_mins = np.minimum.reduceat(samples, starts, axis=0).astype(np.int32)
+        column_maxs = np.maximum.reduceat(samples, starts, axis=0).astype(np.int32)
+        peaks = np.maximum(-column_mins.min(axis=0), column_maxs.max(axis=0)) / full_scale
+        squares = np.zeros(channels, dtype=np.float64)
+        for pos in range(0, frames, _RMS_CHUNK):
+            chunk = samples[pos:pos + _RMS_CHUNK].astype(np.float64)
+            squares += np.einsum('ij,ij->j', chunk, chunk)
+        rms = np.sqrt(squares / frames) / full_scale
+        mins = [array('b', (column_mins[:, channel] >> shift).astype(np.int8).tobytes()) for channel in range(channels)]
+        maxs = [array('b', (column_maxs[:, channel] >> shift).astype(np.int8).tobytes()) for channel in range(channels)]
+        return AudioSummary(channels, sample_rate, frames, peaks.tolist(), rms.tolist(), mins, maxs)
+
+    _summarize_pcm = summarize_pcm_numpy
+except ImportError:
+    summarize_pcm_numpy = None
+    _summarize_pcm = summarize_pcm_python
+
+
+def summarize_pcm(data, channels, sample_rate, bits_per_sample, big_endian=False, bins=DEFAULT_BINS):
+    """
+    summary of 8 bit unsigned or 16 bit signed interleaved PCM, data is bytes, a memoryview or a Blob
+    """
+    if bits_per_sample not in (8, 16):
+        raise ReaderError("Unhandled PCM bits per sample: {}".format(bits_per_sample))
+    if not channels:
+        raise ReaderError("No channels in PCM sound")
+    return _summarize_pcm(data, channels, sample_rate, bits_per_sample, big_endian, bins)
@@ -8,6 +8,7 @@ import struct
 import zlib
 
 from xnb_parse.binstream import BinaryStream
+from xnb_parse.pipeline_metrics import stage, timed_rows
 
 
 class PyPngWriter(object):
@@ -28,6 +29,12 @@ class PyPngWriter(object):
         self.chunk_limit = 2 ** 20
 
     def write_bytearray(self, filename, rows):
+        with stage('encode'):
+            stream = self._encode(timed_rows('decode', rows))
+        with stage('write'):
+            stream.write_file(filename)
+
+    def _encode(self, rows):
         stream = BinaryStream(big_endian=True)
         # http://www.w3.org/TR/PNG/#5PNG-file-signature
         stream.write(PyPngWriter._SIGNATURE)
@@ -57,7 +64,7 @@ class PyPngWriter(object):
 
         # http://www.w3.org/TR/PNG/#11IEND
         PyPngWriter._write_chunk(stream, b'IEND')
-        stream.write_file(filename)
+        return stream
 
     @staticmethod
     def _write_chunk(stream, tag, data=b''):
@@ -75,3 +82,4 @@ def write_png(filename, width, height, rows):
     full_filename = filename + '.png'
     out_png = PyPngWriter(width=width, height=height)
     out_png.write_bytearray(full_filename, rows)
+    return full_filename
@@ -1,13 +1,18 @@
 """
-WAV file writer
+WAV file writer and reader
 """
 
 from __future__ import print_function
 
+import sys
+from array import array
 from uuid import UUID
 
 from xnb_parse.type_reader import ReaderError
-from xnb_parse.binstream import BinaryStream
+from xnb_parse.binstream import BinaryStream, Blob, FileRegion, buffer_bytes
+from xnb_parse.file_formats.adpcm import decode_adpcm, decoded_size
+from xnb_parse.file_formats.audio_summary import SUMMARY_EXTENSION, DEFAULT_BINS, summarize_pcm
+from xnb_parse.pipeline_metrics import stage, timed_rows
 
 
 WAVE_FORMAT_PCM = 0x0001
@@ -27,16 +32,102 @@ WAVE_FORMAT = {
     0xFFFE: 'WAVE_FORMAT_EXTENSIBLE',
     0xFFFF: 'WAVE_FORMAT_DEVELOPMENT',
 }
+# payloads are copied to the output this much at a time, must be even for swapping 16 bit samples
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+_PY3 = sys.version_info >= (3,)
+
+
+def swap_samples16(data):
+    """
+    data, bytes or a memoryview, as 16 bit samples with their bytes swapped
+    """
+    samples = array('H')
+    if _PY3:
+        samples.frombytes(data)
+        samples.byteswap()
+        return samples.tobytes()
+    samples.fromstring(buffer_bytes(data))
+    samples.byteswap()
+    return samples.tostring()
+
+
+class DecodedADPCM(object):
+    """
+    MS-ADPCM data as 16 bit PCM, decoded a run of whole blocks at a time when written rather than all at once
+    """
+
+    def __init__(self, data, channels, block_align, coefs):
+        if isinstance(data, Blob):
+            data = data.view()
+        self.source = data
+        self.channels = channels
+        self.block_align = block_align
+        self.coefs = coefs
+
+    def __len__(self):
+        return decoded_size(len(self.source), self.channels, self.block_align)
+
+    @property
+    def data(self):
+        return decode_adpcm(self.source, self.channels, self.block_align, self.coefs)
+
+    def chunks(self):
+        """
+        yields the decoded data in order, each chunk from about _COPY_CHUNK_SIZE bytes of blocks
+        """
+        step = max(_COPY_CHUNK_SIZE // self.block_align, 1) * self.block_align
+        view = memoryview(self.source)
+        for pos in range(0, len(view), step):
+            yield decode_adpcm(view[pos:pos + step], self.channels, self.block_align, self.coefs)
+
+
+def write_data(out_file, data, swap_samples=False):
+    """
+    copy data, bytes, a Blob, a FileRegion or DecodedADPCM, to out_file in chunks without making a full copy, byte
+    swapping 16 bit samples if asked
+    """
+    if isinstance(data, FileRegion):
+        chunks = data.chunks()
+    elif isinstance(data, DecodedADPCM):
+        chunks = timed_rows('decode', data.chunks())
+    else:
+        if isinstance(data, Blob):
+            data = data.view()
+        view = memoryview(data)
+        chunks = (view[pos:pos + _COPY_CHUNK_SIZE] for pos in range(0, len(view), _COPY_CHUNK_SIZE))
+    carry = b''
+    for chunk in chunks:
+        if swap_samples:
+            if carry or len(chunk) % 2:
+                # keep an odd trailing byte for the next chunk so samples are swapped whole
+                chunk = carry + buffer_bytes(chunk)
+                split = len(chunk) - len(chunk) % 2
+                carry = chunk[split:]
+                chunk = chunk[:split]
+            chunk = swap_samples16(chunk)
+        out_file.write(chunk)
+    if carry:
+        out_file.write(carry)
 
 
 class PyWavWriter(object):
     _waveformatex = 'H H I I H H'
     _waveformat_xma2 = 'H I I I I I I I B B H'
     _waveformat_extensible = 'H I 16s'
+    _adpcmwaveformat = 'H H'
+    _adpcmcoefset = 'h h'
 
-    def __init__(self, header, data, dpds=None, seek=None, needs_swap=False):
+    def __init__(self, header, data, dpds=None, seek=None, needs_swap=False, swap_samples=False, decode_adpcm=False,
+                 summary=False):
         self.header_raw = header
+        # bytes or a Blob, only read while writing
         self.data_raw = data
+        self.swap_samples = swap_samples
+        self.decode_adpcm = decode_adpcm
+        # write a peaks sidecar next to the sound
+        self.summary = summary
         self.dpds_raw = dpds
         self.seek_raw = seek
         self.needs_swap = needs_swap
@@ -103,7 +194,58 @@ class PyWavWriter(object):
                 self.he_valid_bits_per_sample, self.he_channel_mask)
         print(out_str)
 
+    def pcm_writer(self):
+        """
+        writer for the same sound decoded from MS-ADPCM to 16 bit PCM
+        """
+        if self.h_format_tag != WAVE_FORMAT_ADPCM:
+            raise ReaderError("Not MS-ADPCM: {:#04x}".format(self.h_format_tag))
+        h_s = BinaryStream(data=self.h_remainder, big_endian=self.needs_swap)
+        (_, num_coef) = h_s.unpack(self._adpcmwaveformat)
+        coefs = [h_s.unpack(self._adpcmcoefset) for _ in range(num_coef)]
+        pcm_data = DecodedADPCM(self.data_raw, self.h_channels, self.h_block_align, coefs)
+        block_align = self.h_channels * 2
+        pcm_header = BinaryStream()
+        pcm_header.pack(self._waveformatex, WAVE_FORMAT_PCM, self.h_channels, self.h_samples_per_sec,
+                        self.h_samples_per_sec * block_align, block_align, 16)
+        return PyWavWriter(pcm_header.getvalue(), pcm_data, summary=self.summary)
+
+    def summarize(self, bins=DEFAULT_BINS):
+        """
+        AudioSummary of PCM and MS-ADPCM sounds, None for formats that can not be decoded here
+        """
+        return self._summarize(self.data_raw, bins)
+
+    def _summarize(self, data, bins=DEFAULT_BINS):
+        if self.h_format_tag == WAVE_FORMAT_ADPCM:
+            return self.pcm_writer().summarize(bins)
+        if self.h_format_tag != WAVE_FORMAT_PCM:
+            return None
+        if isinstance(data, DecodedADPCM):
+            with stage('decode'):
+                data = data.data
+        return summarize_pcm(data, self.h_channels, self.h_samples_per_sec, self.h_bits_per_sample,
+                             self.swap_samples, bins)
+
     def write(self, filename):
+        """
+        write the sound to filename with the extension for its format added, returns the files written
+        """
+        if self.decode_adpcm and self.h_format_tag == WAVE_FORMAT_ADPCM:
+            return self.pcm_writer().write(filename)
+        data = self.data_raw
+        outputs = []
+        if self.summary:
+            if isinstance(data, DecodedADPCM):
+                # the summary needs every sample at once, decode them once for it and the output
+                with stage('decode'):
+                    data = data.data
+            with stage('encode'):
+                audio_summary = self._summarize(data)
+            if audio_summary is not None:
+                with stage('write'):
+                    audio_summary.write(filename + SUMMARY_EXTENSION)
+                outputs.append(filename + SUMMARY_EXTENSION)
         h_s = BinaryStream()
         h_s.pack(self._waveformatex, self.h_format_tag, self.h_channels, self.h_samples_per_sec,
                  self.h_avg_bytes_per_sec, self.h_block_align, self.h_bits_per_sample)
@@ -139,20 +281,26 @@ class PyWavWriter(object):
             riff_type = b'XWMA'
         else:
             riff_type = b'WAVE'
-        self.write_header(o_s, riff_type, len(header_raw), len(self.data_raw), dpds_size, seek_size)
+        self.write_header(o_s, riff_type, len(header_raw), len(data), dpds_size, seek_size)
         self.write_chunk(o_s, b'fmt ', header_raw)
         if self.dpds_raw:
             self.write_chunk(o_s, b'dpds', self.dpds_raw)
         if self.seek_raw:
             self.write_chunk(o_s, b'seek', self.seek_raw)
-        self.write_chunk(o_s, b'data', self.data_raw)
+        # headers up front with the sizes known, then the payload straight from its source
+        self.write_chunk_header(o_s, b'data', len(data))
         if self.h_format_tag == WAVE_FORMAT_XMA2:
             full_filename = filename + '.xma'
         elif self.h_format_tag == WAVE_FORMAT_WMAUDIO2 or self.h_format_tag == WAVE_FORMAT_WMAUDIO2:
             full_filename = filename + '.xwma'
         else:
             full_filename = filename + '.wav'
-        o_s.write_file(full_filename)
+        with stage('write'):
+            with open(full_filename, 'wb') as out_file:
+                out_file.write(o_s.getvalue())
+                write_data(out_file, data, self.swap_samples)
+        outputs.append(full_filename)
+        return outputs
 
     @staticmethod
     def write_header(o_s, riff_type, header_size, data_size, dpds_size=None, seek_size=None):
@@ -167,10 +315,39 @@ class PyWavWriter(object):
 
     @staticmethod
     def write_chunk(o_s, name, data):
-        o_s.write(name)
-        o_s.write_uint32(len(data))
+        PyWavWriter.write_chunk_header(o_s, name, len(data))
         o_s.write(data)
 
+    @staticmethod
+    def write_chunk_header(o_s, name, size):
+        o_s.write(name)
+        o_s.write_uint32(size)
+
+
+def write_wav(filename, header, data, needs_swap, decode_adpcm=False, summary=False):
+    return PyWavWriter(header, data, needs_swap=needs_swap, decode_adpcm=decode_adpcm,
+                       summary=summary).write(filename)
+
 
-def write_wav(filename, header, data, needs_swap):
-    PyWavWriter(header, data, needs_swap=needs_swap).write(filename)
+def read_wav(filename):
+    """
+    PyWavWriter for a RIFF WAVE or XWMA file, the payload is a Blob over the file data
+    """
+    with open(filename, 'rb') as in_file:
+        data = in_file.read()
+    stream = BinaryStream(data=data)
+    (riff, _, riff_type) = stream.unpack('4s I 4s')
+    if riff != b'RIFF' or riff_type not in (b'WAVE', b'XWMA'):
+        raise ReaderError("Not a RIFF WAVE file: {}".format(filename))
+    chunks = {}
+    while stream.tell() + 8 <= len(data):
+        (name, size) = stream.unpack('4s I')
+        chunks.setdefault(name, stream.read_blob(size))
+        # chunks are word aligned
+        stream.seek(stream.tell() + (size & 1))
+    if b'fmt ' not in chunks or b'data' not in chunks:
+        raise ReaderError("Missing fmt or data chunk: {}".format(filename))
+    dpds = chunks.get(b'dpds')
+    seek = chunks.get(b'seek')
+    return PyWavWriter(chunks[b'fmt '].data, chunks[b'data'], dpds=dpds.data if dpds else None,
+                       seek=seek.data if seek else None)
@@ -4,6 +4,8 @@ XML utils
 
 from __future__ import print_function
 
+import sys
+
 try:
     import lxml.etree as ET
 
@@ -11,6 +13,53 @@ try:
         ET.ElementTree(xml).write(filename, encoding='utf-8', xml_declaration=True, pretty_print=True)
 except ImportError:
     import xml.etree.cElementTree as ET
+    # only for its escaping helpers, which cElementTree does not export
+    import xml.etree.ElementTree as _ElementTree
+
+    # attributes were written sorted before Python 3.8 and in insertion order since
+    _SORT_ATTRIBUTES = sys.version_info < (3, 8)
+
+    if sys.version_info < (3,):
+        def _escape(escape, text):
+            return escape(text, 'utf-8')
+    else:
+        def _escape(escape, text):
+            return escape(text).encode('utf-8', 'xmlcharrefreplace')
 
     def output_xml(xml, filename):
-        ET.ElementTree(xml).write(filename, encoding='utf-8')
+        # ElementTree.write takes a stack frame per level of elements and fails on deep trees, such as long chains
+        # of map nodes, so the same output is written off a stack here
+        with open(filename, 'wb') as out_file:
+            _write_xml(xml, out_file)
+
+    def _write_xml(root, out_file):
+        """
+        write plain elements the same as ElementTree does with utf-8 encoding
+        """
+        # elements still to write, and the closing tags and tails of those already opened
+        stack = [root]
+        while stack:
+            elem = stack.pop()
+            if isinstance(elem, bytes):
+                out_file.write(elem)
+                continue
+            tag = elem.tag.encode('utf-8')
+            parts = [b'<', tag]
+            items = list(elem.items())
+            if _SORT_ATTRIBUTES:
+                items.sort()
+            for (key, value) in items:
+                parts.extend((b' ', key.encode('utf-8'), b'="', _escape(_ElementTree._escape_attrib, value),
+                              b'"'))
+            tail = b''
+            if elem.tail:
+                tail = _escape(_ElementTree._escape_cdata, elem.tail)
+            if elem.text or len(elem):
+                parts.append(b'>')
+                if elem.text:
+                    parts.append(_escape(_ElementTree._escape_cdata, elem.text))
+                stack.append(b'</' + tag + b'>' + tail)
+                stack.extend(reversed(list(elem)))
+            else:
+                parts.extend((b' />', tail))
+            out_file.write(b''.join(parts))
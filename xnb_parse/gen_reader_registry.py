@@ -0,0 +1,62 @@
+"""
+Generate the static type reader registry used for loading type reader modules on demand
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import time
+
+from xnb_parse.type_reader import TypeReaderPlugin, GenericTypeReader
+from xnb_parse.type_readers import load_all
+
+
+REGISTRY_FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'type_reader_registry.py')
+_REGISTRY_HEADER = '''"""
+type reader registry, maps reader and target type names to the module defining the reader
+
+generated by gen_reader_registry.py, do not edit
+"""
+
+from __future__ import print_function
+'''
+
+
+def build_registry():
+    load_all()
+    registry = {'READERS': {}, 'READER_TYPES': {}, 'GENERIC_READERS': {}, 'GENERIC_READER_TYPES': {}}
+    for class_ in TypeReaderPlugin.__subclasses__():
+        if issubclass(class_, GenericTypeReader):
+            registry['GENERIC_READERS'][class_.generic_reader_name] = class_.__module__
+            registry['GENERIC_READER_TYPES'][class_.generic_target_type] = class_.__module__
+        else:
+            registry['READERS'][class_.reader_name] = class_.__module__
+            registry['READER_TYPES'][class_.target_type] = class_.__module__
+    return registry
+
+
+def write_registry(registry, filename=REGISTRY_FILENAME):
+    lines = [_REGISTRY_HEADER]
+    for table_name in ['READERS', 'READER_TYPES', 'GENERIC_READERS', 'GENERIC_READER_TYPES']:
+        lines.append('')
+        lines.append('{} = {{'.format(table_name))
+        for key, module_name in sorted(registry[table_name].items()):
+            line = '    {!r}: {!r},'.format(str(key), str(module_name))
+            if len(line) > 120:
+                line = '    {!r}:\n        {!r},'.format(str(key), str(module_name))
+            lines.append(line)
+        lines.append('}')
+    with open(filename, 'w') as out_file:
+        out_file.write('\n'.join(lines) + '\n')
+
+
+def main():
+    if len(sys.argv) == 1:
+        totaltime = time.time()
+        registry = build_registry()
+        write_registry(registry)
+        print('{} readers, {} generic readers'.format(len(registry['READERS']), len(registry['GENERIC_READERS'])))
+        print('> Done in {:.2f} seconds'.format(time.time() - totaltime))
+    else:
+        print('gen_reader_registry.py', file=sys.stderr)
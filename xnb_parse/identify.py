@@ -7,6 +7,11 @@ from __future__ import print_function
 import os
 import time
 import sys
+from collections import defaultdict
+
+
+# longest magic checked by identify_buffer
+IDENTIFY_PREFIX = 4
 
 
 def identify_buffer(data):
@@ -27,15 +32,114 @@ def identify_buffer(data):
 
 def identify_file(filename):
     with open(filename, 'rb') as file_handle:
-        data = file_handle.read()
+        data = file_handle.read(IDENTIFY_PREFIX)
     return identify_buffer(data)
 
 
+def _identify_file_size(filename):
+    try:
+        with open(filename, 'rb') as file_handle:
+            data = file_handle.read(IDENTIFY_PREFIX)
+            size = os.fstat(file_handle.fileno()).st_size
+    except (IOError, OSError) as ex:
+        _report_error(filename, ex)
+        return None, 0
+    return identify_buffer(data), size
+
+
+def _report_error(path, ex):
+    print("FAILED: '{}' {}: {}".format(path, type(ex).__name__, ex), file=sys.stderr)
+
+
+def walk_files(root_dir, onerror=_report_error):
+    """
+    yield the path of every file under root_dir, using os.scandir where available. Directory symlinks are followed
+    but each directory is only visited once, so link loops end. Paths that can not be read are passed to
+    onerror(path, error) and skipped
+    """
+    visited = set()
+
+    def first_visit(path):
+        try:
+            stat = os.stat(path)
+        except OSError as ex:
+            onerror(path, ex)
+            return False
+        if not stat.st_ino:
+            # no inode numbers, eg. os.stat on Windows under Python 2
+            return True
+        key = (stat.st_dev, stat.st_ino)
+        if key in visited:
+            return False
+        visited.add(key)
+        return True
+
+    if not first_visit(root_dir):
+        return
+    if not hasattr(os, 'scandir'):
+        for path, dirnames, filelist in os.walk(root_dir, onerror=lambda ex: onerror(ex.filename, ex),
+                                                followlinks=True):
+            dirnames[:] = [dirname for dirname in dirnames if first_visit(os.path.join(path, dirname))]
+            for filename in filelist:
+                yield os.path.join(path, filename)
+        return
+    dirs = [root_dir]
+    while dirs:
+        path = dirs.pop()
+        try:
+            entries = list(os.scandir(path))
+        except OSError as ex:
+            onerror(path, ex)
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    if first_visit(entry.path):
+                        dirs.append(entry.path)
+                elif entry.is_file():
+                    yield entry.path
+            except OSError as ex:
+                onerror(entry.path, ex)
+
+
+def identify_dir(root_dir, threads=None):
+    """
+    identify every file under root_dir on a pool of threads, returns {extension: [file count, total bytes]}.
+    files that can not be read are reported and left out
+    """
+    # imported here as it is slow to import and identify_buffer is used by every FEZ tool
+    from multiprocessing.pool import ThreadPool
+
+    summary = defaultdict(lambda: [0, 0])
+    pool = ThreadPool(threads)
+    try:
+        for ext, size in pool.imap_unordered(_identify_file_size, walk_files(root_dir), 64):
+            if ext is None:
+                continue
+            summary[ext][0] += 1
+            summary[ext][1] += size
+    finally:
+        pool.terminate()
+        pool.join()
+    return dict(summary)
+
+
 def main():
     if len(sys.argv) == 2:
         totaltime = time.time()
-        ext = identify_file(os.path.normpath(sys.argv[1]))
-        print('{} {}'.format(sys.argv[1], ext))
+        path = os.path.normpath(sys.argv[1])
+        if os.path.isdir(path):
+            summary = identify_dir(path)
+            total_files = 0
+            total_bytes = 0
+            for ext, (count, size) in sorted(summary.items(), key=lambda item: item[1][1], reverse=True):
+                print('{:<6} {:>8} files {:>16,} bytes'.format(ext, count, size))
+                total_files += count
+                total_bytes += size
+            print('{:<6} {:>8} files {:>16,} bytes'.format('total', total_files, total_bytes))
+        else:
+            ext = identify_file(path)
+            print('{} {}'.format(sys.argv[1], ext))
         print('> Done in {:.2f} seconds'.format(time.time() - totaltime))
     else:
-        print('identify.py filename', file=sys.stderr)
+        print('identify.py filename|directory', file=sys.stderr)
@@ -0,0 +1,169 @@
+"""
+In-memory LRU cache of loaded assets with a byte budget
+"""
+
+from __future__ import print_function
+
+import sys
+from collections import OrderedDict
+from threading import Event, Lock
+
+from xnb_parse.binstream import Blob
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# rough cost of an object or container slot on top of its payload, only there so payload free trees are not free
+_OBJECT_SIZE = 64
+_SLOT_SIZE = 8
+
+_PY3 = sys.version_info >= (3,)
+if _PY3:
+    _PAYLOAD_TYPES = (bytes, bytearray, memoryview, Blob, str)
+    _SCALAR_TYPES = (int, float, bool, complex, type(None))
+else:
+    _PAYLOAD_TYPES = (bytes, bytearray, memoryview, Blob, str, unicode)
+    _SCALAR_TYPES = (int, long, float, bool, complex, type(None))
+
+
+def estimate_size(value):
+    """
+    approximate memory held by value, the lengths of the byte and string payloads in it plus a fixed amount per object
+    """
+    total = 0
+    seen = set()
+    todo = [value]
+    while todo:
+        value = todo.pop()
+        if isinstance(value, _SCALAR_TYPES):
+            continue
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        total += _OBJECT_SIZE
+        if isinstance(value, _PAYLOAD_TYPES):
+            total += len(value)
+        elif isinstance(value, dict):
+            total += _SLOT_SIZE * 2 * len(value)
+            todo.extend(value.keys())
+            todo.extend(value.values())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            total += _SLOT_SIZE * len(value)
+            todo.extend(value)
+        else:
+            values = getattr(value, '__dict__', None)
+            if values is not None:
+                total += _SLOT_SIZE * 2 * len(values)
+                todo.extend(values.values())
+            for cls in type(value).__mro__:
+                for slot in cls.__dict__.get('__slots__', ()):
+                    if slot in ('__dict__', '__weakref__'):
+                        continue
+                    total += _SLOT_SIZE
+                    try:
+                        todo.append(getattr(value, slot))
+                    except AttributeError:
+                        pass
+    return total
+
+
+class _Pending(object):
+    """
+    a load in progress, other threads asking for the same key wait on it
+    """
+    __slots__ = ('event', 'value', 'error')
+
+    def __init__(self):
+        self.event = Event()
+        self.value = None
+        self.error = None
+
+
+class ObjectCache(object):
+    """
+    least recently used loaded objects kept within max_bytes, sized with estimate_size.
+
+    cached objects are shared by every caller that loads the same key, so they should be treated as read only
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key, loader):
+        """
+        cached value for key, otherwise the result of calling loader which is cached for next time.
+        concurrent requests for the same key wait for a single call to loader
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                # reinsert as the most recently used
+                self._entries[key] = entry
+                self.hits += 1
+                return entry[0]
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = _Pending()
+                self._pending[key] = pending
+                owner = True
+                self.misses += 1
+            else:
+                owner = False
+                self.hits += 1
+        if not owner:
+            pending.event.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+        try:
+            value = loader()
+        except Exception as ex:
+            pending.error = ex
+            with self._lock:
+                del self._pending[key]
+            pending.event.set()
+            raise
+        size = estimate_size(value)
+        with self._lock:
+            del self._pending[key]
+            if size <= self.max_bytes:
+                self._entries[key] = (value, size)
+                self.size += size
+                self._evict(self.max_bytes)
+        pending.value = value
+        pending.event.set()
+        return value
+
+    def discard(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.size -= entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def report(self):
+        return '{} hits, {} misses, {} evictions, {} objects, {:,} of {:,} bytes'.format(
+            self.hits, self.misses, self.evictions, len(self._entries), self.size, self.max_bytes)
+
+    def _evict(self, max_bytes):
+        while self.size > max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
@@ -0,0 +1,356 @@
+"""
+Stage timing, throughput and per asset latency of batch tool runs
+"""
+
+from __future__ import print_function
+
+import os
+import time
+from threading import Lock, local
+
+from xnb_parse.dedup import replace_file
+
+try:
+    from time import perf_counter as default_timer
+except ImportError:
+    # no perf_counter before Python 3.3
+    from timeit import default_timer
+
+
+STAGES = ('read', 'decompress', 'parse', 'decode', 'encode', 'write')
+# a .prom file, or a directory to write <tool>.prom in, for the node exporter textfile collector
+METRICS_ENV = 'XNB_PARSE_METRICS'
+METRICS_EXTENSION = '.prom'
+DEFAULT_SLOWEST = 10
+_METRIC_PREFIX = 'xnb_parse_'
+_QUANTILES = (0.5, 0.95, 1.0)
+
+# the PipelineMetrics of the run in progress, stages and assets timed outside a run are not recorded
+_active = None
+
+
+class _ThreadStages(local):
+    """
+    per thread stack of open stage timers
+    """
+
+    def __init__(self):
+        self.stages = []
+
+
+_local = _ThreadStages()
+
+
+class _NoTimer(object):
+    """
+    stands in for a timer when no run is in progress
+    """
+    __slots__ = ()
+    enabled = False
+    bytes_in = 0
+    bytes_out = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def __setattr__(self, name, value):
+        # byte counts set on a disabled timer are dropped
+        pass
+
+
+_NO_TIMER = _NoTimer()
+
+
+class _StageTimer(object):
+    """
+    stages are exclusive, entering one on a thread pauses the one already open there so time is not counted twice
+    """
+    __slots__ = ('metrics', 'stage', 'start', 'seconds')
+    enabled = True
+
+    def __init__(self, metrics, stage_name):
+        self.metrics = metrics
+        self.stage = stage_name
+        self.start = None
+        self.seconds = 0.0
+
+    def __enter__(self):
+        now = default_timer()
+        stack = _local.stages
+        if stack:
+            outer = stack[-1]
+            outer.seconds += now - outer.start
+        stack.append(self)
+        self.start = now
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        now = default_timer()
+        self.metrics.add_stage(self.stage, self.seconds + now - self.start)
+        stack = _local.stages
+        stack.pop()
+        if stack:
+            stack[-1].start = now
+        return False
+
+
+class _AssetTimer(object):
+    __slots__ = ('metrics', 'name', 'start', 'bytes_in', 'bytes_out')
+    enabled = True
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+        self.start = None
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def __enter__(self):
+        self.start = default_timer()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        seconds = default_timer() - self.start
+        if exc_type is None:
+            self.metrics.add_asset(self.name, seconds, self.bytes_in, self.bytes_out)
+        else:
+            self.metrics.failed(self.name)
+        return False
+
+
+def stage(stage_name):
+    """
+    context manager adding the time spent in it to stage_name of the run in progress, if any
+    """
+    metrics = _active
+    if metrics is None:
+        return _NO_TIMER
+    return _StageTimer(metrics, stage_name)
+
+
+def timed_rows(stage_name, rows):
+    """
+    rows, with the time spent producing each one added to stage_name. For lazily decoded rows consumed by an encoder
+    """
+    if _active is None:
+        return rows
+    return _timed_rows(stage_name, rows)
+
+
+def _timed_rows(stage_name, rows):
+    rows = iter(rows)
+    while True:
+        with stage(stage_name):
+            try:
+                row = next(rows)
+            except StopIteration:
+                return
+        yield row
+
+
+def asset(name):
+    """
+    context manager recording one asset of the run in progress, if any. Set bytes_in and bytes_out on the value it
+    gives, an exception leaving it counts the asset as failed
+    """
+    metrics = _active
+    if metrics is None:
+        return _NO_TIMER
+    return _AssetTimer(metrics, name)
+
+
+class PipelineMetrics(object):
+    """
+    totals for one run of a tool. Stage times are summed over threads so can add up to more than the run took,
+    time outside any stage is not counted
+    """
+
+    def __init__(self, tool, slowest=DEFAULT_SLOWEST):
+        self.tool = tool
+        self.slowest = slowest
+        self.stages = dict((stage_name, 0.0) for stage_name in STAGES)
+        self.latencies = []
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.failures = 0
+        self.skipped = 0
+        self.start_time = None
+        self.elapsed = 0.0
+        self._start = None
+        self._lock = Lock()
+
+    def start(self):
+        """
+        make this the run in progress, returns self
+        """
+        global _active
+        self.start_time = time.time()
+        self._start = default_timer()
+        _active = self
+        return self
+
+    def stop(self):
+        global _active
+        self.elapsed = default_timer() - self._start
+        if _active is self:
+            _active = None
+
+    def asset(self, name):
+        return _AssetTimer(self, name)
+
+    def add_stage(self, stage_name, seconds):
+        with self._lock:
+            self.stages[stage_name] = self.stages.get(stage_name, 0.0) + seconds
+
+    def add_asset(self, name, seconds, bytes_in=0, bytes_out=0):
+        with self._lock:
+            self.latencies.append((seconds, name))
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+
+    def failed(self, name):
+        with self._lock:
+            self.failures += 1
+
+    def skip(self, name):
+        """
+        asset left as it was, eg. unchanged since the last export
+        """
+        with self._lock:
+            self.skipped += 1
+
+    @property
+    def assets(self):
+        return len(self.latencies)
+
+    def percentile(self, fraction):
+        """
+        nearest rank per asset latency in seconds
+        """
+        if not self.latencies:
+            return 0.0
+        latencies = sorted(seconds for (seconds, _) in self.latencies)
+        rank = max(int(-(-fraction * len(latencies) // 1)), 1)
+        return latencies[min(rank, len(latencies)) - 1]
+
+    def slowest_assets(self):
+        """
+        (seconds, name) of the slowest assets, slowest first
+        """
+        return sorted(self.latencies, key=lambda latency: (-latency[0], latency[1]))[:self.slowest]
+
+    def rate(self, value):
+        if not self.elapsed:
+            return 0.0
+        return value / self.elapsed
+
+    def report(self):
+        megabyte = 1024.0 * 1024.0
+        lines = ['{}: {} assets, {} failed, {} unchanged in {:.2f} seconds'.format(
+            self.tool, self.assets, self.failures, self.skipped, self.elapsed)]
+        lines.append('throughput: {:.1f} assets/s, in {:.2f} MB/s ({:.1f} MB), out {:.2f} MB/s ({:.1f} MB)'.format(
+            self.rate(self.assets), self.rate(self.bytes_in) / megabyte, self.bytes_in / megabyte,
+            self.rate(self.bytes_out) / megabyte, self.bytes_out / megabyte))
+        stages = ['{} {:.3f}s'.format(stage_name, seconds) for stage_name, seconds in self._stage_items() if seconds]
+        if stages:
+            lines.append('stages: {}'.format(', '.join(stages)))
+        if self.latencies:
+            lines.append('latency: p50 {:.1f} ms, p95 {:.1f} ms, max {:.1f} ms'.format(
+                self.percentile(0.5) * 1000, self.percentile(0.95) * 1000, self.percentile(1.0) * 1000))
+            lines.append('slowest:')
+            for (seconds, name) in self.slowest_assets():
+                lines.append('{:>10.1f} ms  {}'.format(seconds * 1000, name))
+        return '\n'.join(lines)
+
+    def prometheus(self):
+        """
+        the run in Prometheus text exposition format
+        """
+        tool = {'tool': self.tool}
+        lines = []
+
+        def metric(name, metric_type, help_text, samples):
+            lines.append('# HELP {}{} {}'.format(_METRIC_PREFIX, name, help_text))
+            lines.append('# TYPE {}{} {}'.format(_METRIC_PREFIX, name, metric_type))
+            for (suffix, labels, value) in samples:
+                lines.append('{}{}{}{} {}'.format(_METRIC_PREFIX, name, suffix, _labels(labels), _value(value)))
+
+        metric('run_timestamp_seconds', 'gauge', 'Start time of the last run.', [('', tool, self.start_time)])
+        metric('run_duration_seconds', 'gauge', 'Wall time of the last run.', [('', tool, self.elapsed)])
+        metric('assets', 'gauge', 'Assets handled by the last run by result.',
+               [('', dict(tool, result='ok'), self.assets), ('', dict(tool, result='failed'), self.failures),
+                ('', dict(tool, result='unchanged'), self.skipped)])
+        metric('bytes', 'gauge', 'Bytes read and written by the last run.',
+               [('', dict(tool, direction='in'), self.bytes_in), ('', dict(tool, direction='out'), self.bytes_out)])
+        metric('assets_per_second', 'gauge', 'Assets handled per second in the last run.',
+               [('', tool, self.rate(self.assets))])
+        metric('bytes_per_second', 'gauge', 'Bytes read and written per second in the last run.',
+               [('', dict(tool, direction='in'), self.rate(self.bytes_in)),
+                ('', dict(tool, direction='out'), self.rate(self.bytes_out))])
+        metric('stage_seconds', 'gauge', 'Time spent in each stage in the last run, summed over threads.',
+               [('', dict(tool, stage=stage_name), seconds) for stage_name, seconds in self._stage_items()])
+        samples = [('', dict(tool, quantile='{:g}'.format(quantile)), self.percentile(quantile))
+                   for quantile in _QUANTILES]
+        samples.append(('_sum', tool, sum(seconds for (seconds, _) in self.latencies)))
+        samples.append(('_count', tool, len(self.latencies)))
+        metric('asset_latency_seconds', 'summary', 'Per asset latency in the last run.', samples)
+        # asset names would make a series per asset, they are only in the report
+        metric('slowest_asset_seconds', 'gauge', 'Latency of the slowest assets in the last run by rank.',
+               [('', dict(tool, rank=str(rank)), seconds)
+                for rank, (seconds, _) in enumerate(self.slowest_assets(), 1)])
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, filename):
+        # written aside and renamed so the collector never reads a partial file
+        temp_filename = filename + '.tmp'
+        with open(temp_filename, 'w') as out_file:
+            out_file.write(self.prometheus())
+        replace_file(temp_filename, filename)
+
+    def _stage_items(self):
+        items = [(stage_name, self.stages[stage_name]) for stage_name in STAGES]
+        items.extend(sorted((stage_name, seconds) for stage_name, seconds in self.stages.items()
+                            if stage_name not in STAGES))
+        return items
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join('{}="{}"'.format(key, _escape(value)) for key, value in sorted(labels.items())) + '}'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _value(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def metrics_filename(tool):
+    """
+    where to write the Prometheus file for tool, None if not asked for
+    """
+    target = os.environ.get(METRICS_ENV)
+    if not target:
+        return None
+    if os.path.isdir(target):
+        return os.path.join(target, _METRIC_PREFIX + tool + METRICS_EXTENSION)
+    return target
+
+
+def dump_metrics(metrics):
+    """
+    print the summary of a stopped run and write the Prometheus file if asked for by the environment
+    """
+    print(metrics.report())
+    filename = metrics_filename(metrics.tool)
+    if filename is not None:
+        metrics.write_prometheus(filename)
+        print('metrics written to {}'.format(filename))
@@ -8,37 +8,91 @@ import sys
 import os
 import time
 
+from xnb_parse.dedup import content_hash
+from xnb_parse.export_manifest import ExportManifest, file_hash, file_stat
+from xnb_parse.pipeline_metrics import PipelineMetrics, dump_metrics, stage
+from xnb_parse.xact.cue_index import load_cue_index
 from xnb_parse.xact.xgs import XGS
 from xnb_parse.xact.xsb import XSB
 from xnb_parse.xact.xwb import XWB
 
 
-def read_xact(in_xgs_file, in_xsb_file, in_xwb_file, out_dir=None):
-    in_xgs_file = os.path.normpath(in_xgs_file)
-    print(in_xgs_file)
-    xgs = XGS(filename=in_xgs_file)
-    in_xsb_file = os.path.normpath(in_xsb_file)
-    print(in_xsb_file)
-    xsb = XSB(filename=in_xsb_file, audio_engine=xgs)
-    in_xwb_file = os.path.normpath(in_xwb_file)
-    print(in_xwb_file)
-    xwb = XWB(filename=in_xwb_file, audio_engine=xgs)
-    if out_dir is not None:
-        xgs.export(out_dir)
-        xsb.export(out_dir)
-        xwb.export(out_dir)
+def read_xact(in_xgs_file, in_xsb_file, in_xwb_file, out_dir=None, incremental=True, decode_adpcm=False,
+              cue_names=True, summary=False):
+    """
+    cue_names exports wave bank entries played by a cue under the cue name instead of the entry name,
+    summary writes a peaks sidecar next to each sound
+    """
+    in_files = [os.path.normpath(in_file) for in_file in (in_xgs_file, in_xsb_file, in_xwb_file)]
+    in_xgs_file, in_xsb_file, in_xwb_file = in_files
+    manifest = None
+    if out_dir is not None and incremental:
+        # the sound bank and wave bank are only meaningful together, so the three files are one asset
+        manifest = ExportManifest(out_dir, 'read_xact')
+        key = '|'.join(os.path.basename(in_file) for in_file in in_files)
+        # options change the outputs but not their files, so they go in the digest rather than the key and another
+        # set of options re-exports over the same entry. They are stored with the stat so the digest of the same
+        # files is only reused for the same options
+        options = []
+        if decode_adpcm:
+            options.append('decode_adpcm')
+        if not cue_names:
+            options.append('entry_names')
+        if summary:
+            options.append('summary')
+        stat = sum((list(file_stat(in_file)) for in_file in in_files), []) + options
+        digest = manifest.stat_digest(key, stat)
+        if digest is None:
+            digest = content_hash('|'.join([file_hash(in_file) for in_file in in_files] + options).encode('ascii'))
+        if manifest.is_current(key, digest):
+            manifest.keep(key, stat)
+            manifest.finish()
+            print(manifest.report())
+            return
+    # each wave bank entry exported is an asset
+    metrics = PipelineMetrics('read_xact').start()
+    xwb = None
+    try:
+        with stage('parse'):
+            print(in_xgs_file)
+            xgs = XGS(filename=in_xgs_file)
+            print(in_xsb_file)
+            xsb = XSB(filename=in_xsb_file, audio_engine=xgs)
+            print(in_xwb_file)
+            xwb = XWB(filename=in_xwb_file, audio_engine=xgs)
+            cue_index = load_cue_index(xsb, in_xsb_file, xwb, in_xwb_file)
+        print(cue_index.report())
+        outputs = []
+        if out_dir is not None:
+            outputs.extend(xgs.export(out_dir))
+            outputs.extend(xsb.export(out_dir))
+            names = None
+            if cue_names:
+                names = cue_index.export_names(xwb.bank_name, len(xwb.entries))
+            outputs.extend(xwb.export(out_dir, decode_adpcm=decode_adpcm, names=names, summary=summary))
+    finally:
+        if xwb is not None:
+            xwb.close()
+        metrics.stop()
+    dump_metrics(metrics)
+    if manifest is not None:
+        manifest.record(key, digest, outputs, stat)
+        manifest.finish()
+        print(manifest.report())
 
 
 def main():
-    if 3 < len(sys.argv) <= 5:
+    args = [arg for arg in sys.argv[1:] if arg not in ('--decode-adpcm', '--summary')]
+    if 2 < len(args) <= 4:
         totaltime = time.time()
-        in_xgs_file = sys.argv[1]
-        in_xsb_file = sys.argv[2]
-        in_xwb_file = sys.argv[3]
+        in_xgs_file = args[0]
+        in_xsb_file = args[1]
+        in_xwb_file = args[2]
         out_dir = None
-        if len(sys.argv) > 4:
-            out_dir = sys.argv[4]
-        read_xact(in_xgs_file, in_xsb_file, in_xwb_file, out_dir)
+        if len(args) > 3:
+            out_dir = args[3]
+        read_xact(in_xgs_file, in_xsb_file, in_xwb_file, out_dir, decode_adpcm='--decode-adpcm' in sys.argv,
+                  summary='--summary' in sys.argv)
         print('> Done in {:.2f} seconds'.format(time.time() - totaltime))
     else:
-        print('read_xact.py file.xgs file.xsb file.xwb [export_dir]', file=sys.stderr)
+        print('read_xact.py [--decode-adpcm] [--summary] file.xgs file.xsb file.xwb [export_dir]', file=sys.stderr)
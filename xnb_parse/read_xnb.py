@@ -8,6 +8,7 @@ import sys
 import os
 import time
 
+from xnb_parse.reader_profile import dump_profile
 from xnb_parse.xnb_reader import XNBReader
 
 
@@ -25,6 +26,7 @@ def main():
         totaltime = time.time()
         for filename in sys.argv[1:]:
             read_xnb(filename)
+        dump_profile(XNBReader.reader_profile)
         print('> Done in {:.2f} seconds'.format(time.time() - totaltime))
     else:
         print('read_xnb.py file1.xnb ...', file=sys.stderr)
@@ -4,33 +4,84 @@ Dump info from directory of XNBs
 
 from __future__ import print_function
 
+import os
 import sys
 import time
 
+from xnb_parse.dedup import content_hash
+from xnb_parse.export_manifest import ExportManifest, file_hash, file_stat
+from xnb_parse.pipeline_metrics import PipelineMetrics, dump_metrics
+from xnb_parse.reader_profile import dump_profile
 from xnb_parse.type_reader import ReaderError
 from xnb_parse.xna_content_manager import ContentManager
+from xnb_parse.xnb_reader import XNBReader
 
 
-def read_xnb_dir(content_dir, export_dir=None):
+def read_xnb_dir(content_dir, export_dir=None, incremental=True, decode_adpcm=False, summary=False):
+    """
+    decode_adpcm writes MS-ADPCM sounds as 16 bit PCM, summary writes a peaks sidecar next to each sound
+    """
     content_manager = ContentManager(content_dir)
-    for asset_name in content_manager.assets:
-        print(asset_name)
-        try:
-            asset = content_manager.load(asset_name)
-            if export_dir is not None:
-                content_manager.export(asset, asset_name, export_dir)
-        except (ReaderError, KeyError) as ex:
-            print("FAILED: '{}' {}: {}".format(asset_name, type(ex).__name__, ex), file=sys.stderr)
+    manifest = None
+    if export_dir is not None and incremental:
+        manifest = ExportManifest(export_dir, 'read_xnb_dir')
+        # options change the outputs, they are kept with the stat and hashed into the digest so assets exported
+        # with other options are exported again
+        options = []
+        if decode_adpcm:
+            options.append('decode_adpcm')
+        if summary:
+            options.append('summary')
+    metrics = PipelineMetrics('read_xnb_dir').start()
+    try:
+        for asset_name in content_manager.assets:
+            try:
+                if manifest is not None:
+                    asset_filename = content_manager.asset_filename(asset_name)
+                    stat = list(file_stat(asset_filename)) + options
+                    digest = manifest.stat_digest(asset_name, stat)
+                    if digest is None:
+                        digest = file_hash(asset_filename)
+                        if options:
+                            digest = content_hash('|'.join([digest] + options).encode('ascii'))
+                    if manifest.is_current(asset_name, digest):
+                        manifest.keep(asset_name, stat)
+                        metrics.skip(asset_name)
+                        continue
+                print(asset_name)
+                with metrics.asset(asset_name) as timer:
+                    timer.bytes_in = os.path.getsize(content_manager.asset_filename(asset_name))
+                    asset = content_manager.load(asset_name)
+                    outputs = []
+                    if export_dir is not None:
+                        outputs = content_manager.export(asset, asset_name, export_dir, decode_adpcm=decode_adpcm,
+                                                         summary=summary)
+                        timer.bytes_out = sum(os.path.getsize(output) for output in outputs)
+                if manifest is not None:
+                    manifest.record(asset_name, digest, outputs, stat)
+            except (ReaderError, KeyError) as ex:
+                print("FAILED: '{}' {}: {}".format(asset_name, type(ex).__name__, ex), file=sys.stderr)
+                if manifest is not None:
+                    manifest.failed(asset_name)
+    finally:
+        metrics.stop()
+    if manifest is not None:
+        manifest.finish()
+        print(manifest.report())
+    dump_metrics(metrics)
 
 
 def main():
-    if 1 < len(sys.argv) <= 3:
+    args = [arg for arg in sys.argv[1:] if arg not in ('--decode-adpcm', '--summary')]
+    if 0 < len(args) <= 2:
         totaltime = time.time()
-        content_dir = sys.argv[1]
+        content_dir = args[0]
         export_dir = None
-        if len(sys.argv) > 2:
-            export_dir = sys.argv[2]
-        read_xnb_dir(content_dir, export_dir)
+        if len(args) > 1:
+            export_dir = args[1]
+        read_xnb_dir(content_dir, export_dir, decode_adpcm='--decode-adpcm' in sys.argv,
+                     summary='--summary' in sys.argv)
+        dump_profile(XNBReader.reader_profile)
         print('> Done in {:.2f} seconds'.format(time.time() - totaltime))
     else:
-        print('read_xnb_dir.py content_dir [export_dir]', file=sys.stderr)
+        print('read_xnb_dir.py [--decode-adpcm] [--summary] content_dir [export_dir]', file=sys.stderr)
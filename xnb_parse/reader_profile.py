@@ -0,0 +1,107 @@
+"""
+Per type reader call counts, wall time and bytes read
+"""
+
+from __future__ import print_function
+
+import json
+import os
+from threading import Lock
+
+from xnb_parse.dedup import replace_file
+
+
+# opt in to profiling for all tools, a filename ending in .json writes the profile there, anything else prints a report
+PROFILE_ENV = 'XNB_PARSE_PROFILE'
+PROFILE_FIELDS = ('calls', 'total_time', 'self_time', 'bytes', 'self_bytes')
+
+
+class ReaderProfile(object):
+    """
+    totals per type reader class. total_time and bytes include nested reads through read_object,
+    read_value_or_object and iterative readers, self_time and self_bytes exclude them.
+
+    each XNBReader keeps its own counts while it parses and merges them in when done, so one profile can be shared by
+    reader threads
+    """
+
+    def __init__(self):
+        self.stats = {}
+        self.files = 0
+        self._lock = Lock()
+
+    def merge(self, stats):
+        """
+        add stats, {reader name: [calls, total_time, self_time, bytes, self_bytes]}, from one parse
+        """
+        with self._lock:
+            self.files += 1
+            for name, values in stats.items():
+                totals = self.stats.get(name)
+                if totals is None:
+                    self.stats[name] = list(values)
+                else:
+                    for i, value in enumerate(values):
+                        totals[i] += value
+
+    def clear(self):
+        with self._lock:
+            self.stats = {}
+            self.files = 0
+
+    def rows(self, sort='self_time'):
+        """
+        (reader name, calls, total_time, self_time, bytes, self_bytes) largest first
+        """
+        index = PROFILE_FIELDS.index(sort) + 1
+        with self._lock:
+            rows = [(name,) + tuple(values) for name, values in self.stats.items()]
+        return sorted(rows, key=lambda row: (-row[index], row[0]))
+
+    def report(self, sort='self_time', limit=None):
+        lines = ['{:<64} {:>10} {:>10} {:>10} {:>14} {:>14}'.format('reader', 'calls', 'total s', 'self s', 'bytes',
+                                                                     'self bytes')]
+        rows = self.rows(sort)
+        if limit is not None:
+            rows = rows[:limit]
+        for (name, calls, total_time, self_time, total_bytes, self_bytes) in rows:
+            lines.append('{:<64} {:>10} {:>10.3f} {:>10.3f} {:>14,} {:>14,}'.format(
+                _short_name(name), calls, total_time, self_time, total_bytes, self_bytes))
+        lines.append('{} files'.format(self.files))
+        return '\n'.join(lines)
+
+    def to_json(self):
+        return {'files': self.files,
+                'readers': [dict(zip(('reader',) + PROFILE_FIELDS, row)) for row in self.rows()]}
+
+    def write_json(self, filename):
+        temp_filename = filename + '.tmp'
+        with open(temp_filename, 'w') as out_file:
+            json.dump(self.to_json(), out_file, indent=1)
+        replace_file(temp_filename, filename)
+
+
+def _short_name(name, width=64):
+    if len(name) <= width:
+        return name
+    return '...' + name[-(width - 3):]
+
+
+def profile_from_environment():
+    if not os.environ.get(PROFILE_ENV):
+        return None
+    return ReaderProfile()
+
+
+def dump_profile(profile):
+    """
+    print or save profile as asked for by the environment, for the end of a tool run
+    """
+    if profile is None:
+        return
+    target = os.environ.get(PROFILE_ENV, '')
+    if target.lower().endswith('.json'):
+        profile.write_json(target)
+        print('reader profile written to {}'.format(target))
+    else:
+        print(profile.report())
@@ -0,0 +1,156 @@
+"""
+Declarative field schemas for type readers, compiled to one read function per reader
+"""
+
+from __future__ import print_function
+
+import re
+import struct
+from collections import namedtuple
+
+from xnb_parse.type_reader import ReaderError
+from xnb_parse.xna_types.xna_math import Color, Vector2, Vector3, Vector4, Quaternion
+
+
+Field = namedtuple('Field', ['name', 'kind', 'reader', 'type_params'])
+Field.__new__.__defaults__ = (None, None)
+
+# fixed size kinds, struct format and the type built from the unpacked values
+FIXED_KINDS = {
+    'boolean': ('?', None),
+    'byte': ('B', None),
+    'sbyte': ('b', None),
+    'int16': ('h', None),
+    'uint16': ('H', None),
+    'int32': ('i', None),
+    'uint32': ('I', None),
+    'int64': ('q', None),
+    'uint64': ('Q', None),
+    'single': ('f', None),
+    'double': ('d', None),
+    'color': ('4B', Color),
+    'vector2': ('2f', Vector2),
+    'vector3': ('3f', Vector3),
+    'vector4': ('4f', Vector4),
+    'quaternion': ('4f', Quaternion),
+}
+VARIABLE_KINDS = ['string', 'object']
+
+_NAME_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def _value_count(fmt):
+    return len(struct.unpack('<' + fmt, b'\x00' * struct.calcsize('<' + fmt)))
+
+
+def _field_runs(fields):
+    """
+    group fields into runs of consecutive fixed size fields and single variable size fields
+    """
+    runs = []
+    fixed = []
+    for field in fields:
+        if field.kind in FIXED_KINDS:
+            fixed.append(field)
+        elif field.kind in VARIABLE_KINDS:
+            if fixed:
+                runs.append(fixed)
+                fixed = []
+            runs.append(field)
+        else:
+            raise ReaderError("Unknown field kind: '{}' for '{}'".format(field.kind, field.name))
+    if fixed:
+        runs.append(fixed)
+    return runs
+
+
+def schema_source(fields, func_name='read'):
+    """
+    generate the source of a read function for fields, and the globals it needs
+    """
+    names = set()
+    for field in fields:
+        if not _NAME_RE.match(field.name) or field.name.startswith('_') or field.name in ('self', 'stream'):
+            raise ReaderError("Bad field name: '{}'".format(field.name))
+        if field.name in names:
+            raise ReaderError("Duplicate field name: '{}'".format(field.name))
+        names.add(field.name)
+    namespace = {}
+    lines = ['def {}(self):'.format(func_name), '    stream = self.stream']
+    for run_index, run in enumerate(_field_runs(fields)):
+        if isinstance(run, Field):
+            if run.kind == 'string':
+                lines.append('    {} = stream.read_string()'.format(run.name))
+            else:
+                if run.reader is None:
+                    raise ReaderError("No reader for object field: '{}'".format(run.name))
+                reader_name = '_reader_{}'.format(run.name)
+                namespace[reader_name] = run.reader
+                if run.type_params is not None:
+                    params_name = '_params_{}'.format(run.name)
+                    namespace[params_name] = list(run.type_params)
+                    lines.append('    {} = stream.read_object({}, {})'.format(run.name, reader_name, params_name))
+                else:
+                    lines.append('    {} = stream.read_object({})'.format(run.name, reader_name))
+            continue
+        struct_name = '_struct_{}'.format(run_index)
+        fmt = ''.join(FIXED_KINDS[field.kind][0] for field in run)
+        namespace[struct_name] = struct.Struct('<' + fmt)
+        values = []
+        built = []
+        for field in run:
+            value_fmt, value_type = FIXED_KINDS[field.kind]
+            if value_type is None:
+                values.append(field.name)
+            else:
+                parts = ['_{}_{}'.format(field.name, i) for i in range(_value_count(value_fmt))]
+                values.extend(parts)
+                type_name = '_{}'.format(value_type.__name__)
+                namespace[type_name] = value_type
+                built.append('    {} = {}({})'.format(field.name, type_name, ', '.join(parts)))
+        if len(values) == 1:
+            target = values[0] + ','
+        else:
+            target = ', '.join(values)
+        lines.append('    {} = {}.unpack(stream.read({}))'.format(target, struct_name,
+                                                                  namespace[struct_name].size))
+        lines.extend(built)
+    namespace['_result_type'] = None
+    lines.append('    return _result_type({})'.format(', '.join(field.name for field in fields)))
+    return '\n'.join(lines) + '\n', namespace
+
+
+def compile_schema(result_type, fields, func_name='read'):
+    """
+    compile fields into a read method returning result_type built from the field values in order
+    """
+    source, namespace = schema_source(fields, func_name)
+    namespace['_result_type'] = result_type
+    code = compile(source, '<schema {}>'.format(result_type.__name__), 'exec')
+    exec(code, namespace)
+    func = namespace[func_name]
+    func.result_type = result_type
+    func.fields = tuple(fields)
+    func.source = source
+    return func
+
+
+def read_schema(stream, result_type, fields):
+    """
+    reference reader reading one field at a time through the stream methods, slow but simple
+    """
+    values = []
+    for field in fields:
+        if field.kind == 'string':
+            values.append(stream.read_string())
+        elif field.kind == 'object':
+            values.append(stream.read_object(field.reader, field.type_params))
+        elif field.kind in FIXED_KINDS:
+            value_fmt, value_type = FIXED_KINDS[field.kind]
+            if value_type is None:
+                values.append(stream.unpack(value_fmt)[0])
+            else:
+                values.append(value_type._make(stream.unpack(value_fmt)))
+        else:
+            raise ReaderError("Unknown field kind: '{}' for '{}'".format(field.kind, field.name))
+    return result_type(*values)
@@ -9,6 +9,7 @@ import pyglet
 from pyglet.gl import *
 
 from xnb_parse.fez_content_manager import FezContentManager
+from xnb_parse.object_cache import ObjectCache
 from xnb_parse.trackball_camera import TrackballCamera, norm1, vec_args
 from xnb_parse.type_reader import ReaderError
 from xnb_parse.xna_content_manager import ContentManager
@@ -180,10 +181,11 @@ def main():
             template = pyglet.gl.Config()
             config = screen.get_best_config(template)
         # try and use FezContentManager if it works, failing back to directory reader
+        object_cache = ObjectCache()
         try:
-            content_manager = FezContentManager(sys.argv[1])
+            content_manager = FezContentManager(sys.argv[1], object_cache=object_cache)
         except ReaderError:
-            content_manager = ContentManager(sys.argv[1])
+            content_manager = ContentManager(sys.argv[1], object_cache=object_cache)
         AOWindow(content_manager=content_manager, asset_name=sys.argv[2], config=config)
         pyglet.app.run()
     else:
@@ -0,0 +1,228 @@
+"""
+On-disk cache of parsed assets as pickled snapshots
+"""
+
+from __future__ import print_function
+
+import gc
+import os
+import pickle
+import re
+import shutil
+import struct
+import tempfile
+
+from xnb_parse.binstream import Blob
+from xnb_parse.dedup import content_hash, replace_file
+from xnb_parse.export_manifest import code_version
+
+
+SNAPSHOT_EXTENSION = '.snapshot'
+STAT_KEY_EXTENSION = '.key'
+# opt in to the snapshot cache for all tools
+CACHE_DIR_ENV = 'XNB_PARSE_SNAPSHOT_CACHE'
+
+_SNAPSHOT_MAGIC = b'XNBS'
+_SNAPSHOT_HEADER = struct.Struct('<4s I I')
+_BUFFER_SIZE = struct.Struct('<Q')
+# protocol 5 can hand Blob payloads over out of band instead of copying them into the pickle
+_PROTOCOL = min(5, pickle.HIGHEST_PROTOCOL)
+# RuntimeError covers running out of recursion depth on deeply nested content
+_PICKLE_ERRORS = (pickle.PicklingError, TypeError, AttributeError, ValueError, RuntimeError)
+# names of version directories, code_version hashes. Nothing else in the cache directory is pruned
+_VERSION_DIR_RE = re.compile(r'^[0-9a-f]{40}$')
+
+
+def dump_snapshot(content):
+    """
+    pickle content, returns the pickle and a list of out of band buffers
+    """
+    buffers = []
+    if _PROTOCOL >= 5:
+        data = pickle.dumps(content, protocol=_PROTOCOL, buffer_callback=buffers.append)
+    else:
+        data = pickle.dumps(content, protocol=_PROTOCOL)
+    return data, [buffer.raw() for buffer in buffers]
+
+
+def load_snapshot(data, buffers):
+    # unpickling allocates many objects and none of them garbage, collections while it runs are wasted time
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        if buffers:
+            return pickle.loads(data, buffers=buffers)
+        return pickle.loads(data)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+class SnapshotCache(object):
+    """
+    parsed assets stored under cache_dir by hash of the XNB data, in a directory per code version so any change to the
+    readers invalidates everything cached before it. Snapshots from other code versions are removed on first store.
+    Storing is best effort, a cache that can not be written to is counted in write_errors and otherwise ignored
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = os.path.normpath(cache_dir)
+        self.version_dir = os.path.join(self.cache_dir, code_version())
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.write_errors = 0
+        self._pruned = False
+
+    @staticmethod
+    def key(asset_data, expected_type=None):
+        if isinstance(asset_data, Blob):
+            asset_data = asset_data.view()
+        digest = content_hash(asset_data)
+        if expected_type is not None:
+            # the expected type is checked while parsing, so a snapshot is only good for the same expectation
+            digest += '_' + content_hash(expected_type.encode('utf-8'))[:8]
+        return digest
+
+    @staticmethod
+    def stat_key(filename, stat, expected_type=None):
+        """
+        key for a source file by its path, size and mtime, for finding its snapshot without reading and hashing it
+        """
+        parts = [os.path.abspath(filename), ' '.join(str(value) for value in stat), expected_type or '']
+        return content_hash('\n'.join(parts).encode('utf-8'))
+
+    def filename(self, key):
+        return os.path.join(self.version_dir, key[:2], key + SNAPSHOT_EXTENSION)
+
+    def stat_filename(self, stat_key):
+        return os.path.join(self.version_dir, 'stat', stat_key[:2], stat_key + STAT_KEY_EXTENSION)
+
+    def lookup(self, stat_key):
+        """
+        key last stored for stat_key, or None
+        """
+        try:
+            with open(self.stat_filename(stat_key), 'r') as in_file:
+                key = in_file.read().strip()
+        except (IOError, OSError):
+            return None
+        return key or None
+
+    def link(self, stat_key, key):
+        """
+        remember key as the content of the file stat_key was made from, returns False if it could not be written
+        """
+        return self._write(self.stat_filename(stat_key), [key.encode('ascii')])
+
+    def get(self, key):
+        """
+        cached asset for key, or None
+        """
+        try:
+            with open(self.filename(key), 'rb') as in_file:
+                data = in_file.read()
+        except (IOError, OSError):
+            self.misses += 1
+            return None
+        try:
+            content = self._decode(data)
+        except (struct.error, pickle.UnpicklingError, EOFError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return content
+
+    def put(self, key, content):
+        """
+        store content for key, returns False if it can not be pickled or written
+        """
+        try:
+            data, buffers = dump_snapshot(content)
+        except _PICKLE_ERRORS:
+            self.failures += 1
+            return False
+        parts = [_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, len(data), len(buffers))]
+        parts.extend(_BUFFER_SIZE.pack(len(buffer)) for buffer in buffers)
+        parts.append(data)
+        parts.extend(buffers)
+        return self._write(self.filename(key), parts)
+
+    def _write(self, filename, parts):
+        if not self._pruned:
+            self.prune()
+        try:
+            self._write_file(filename, parts)
+        except (IOError, OSError):
+            # read only or full, the asset was parsed all the same
+            self.write_errors += 1
+            return False
+        return True
+
+    @staticmethod
+    def _write_file(filename, parts):
+        dirname = os.path.dirname(filename)
+        if not os.path.isdir(dirname):
+            try:
+                os.makedirs(dirname)
+            except OSError:
+                # created by another worker
+                if not os.path.isdir(dirname):
+                    raise
+        temp_handle, temp_filename = tempfile.mkstemp(suffix='.tmp', prefix=os.path.basename(filename), dir=dirname)
+        try:
+            with os.fdopen(temp_handle, 'wb') as out_file:
+                for part in parts:
+                    out_file.write(part)
+            replace_file(temp_filename, filename)
+        except (IOError, OSError):
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+            raise
+
+    def prune(self):
+        """
+        remove snapshots made by other code versions, leaving anything else in cache_dir alone
+        """
+        self._pruned = True
+        try:
+            dirnames = os.listdir(self.cache_dir)
+        except (IOError, OSError):
+            return
+        for dirname in dirnames:
+            path = os.path.join(self.cache_dir, dirname)
+            if path != self.version_dir and _VERSION_DIR_RE.match(dirname) and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def report(self):
+        return '{} hits, {} misses, {} not cacheable, {} not written'.format(self.hits, self.misses, self.failures,
+                                                                           self.write_errors)
+
+    @staticmethod
+    def _decode(data):
+        magic, data_size, buffer_count = _SNAPSHOT_HEADER.unpack_from(data, 0)
+        if magic != _SNAPSHOT_MAGIC:
+            raise ValueError("bad snapshot magic: '{!r}'".format(magic))
+        pos = _SNAPSHOT_HEADER.size
+        buffer_sizes = []
+        for _ in range(buffer_count):
+            buffer_sizes.append(_BUFFER_SIZE.unpack_from(data, pos)[0])
+            pos += _BUFFER_SIZE.size
+        # buffers are views into the snapshot data, Blobs in the asset share it without copying
+        view = memoryview(data)
+        pickle_data = view[pos:pos + data_size]
+        pos += data_size
+        buffers = []
+        for buffer_size in buffer_sizes:
+            buffers.append(view[pos:pos + buffer_size])
+            pos += buffer_size
+        if pos != len(data):
+            raise ValueError("bad snapshot size: {} != {}".format(pos, len(data)))
+        return load_snapshot(pickle_data, buffers)
+
+
+def snapshot_cache_from_environment():
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if not cache_dir:
+        return None
+    return SnapshotCache(cache_dir)
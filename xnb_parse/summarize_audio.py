@@ -0,0 +1,68 @@
+"""
+Write peaks and levels sidecars for exported sounds
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import time
+from multiprocessing.pool import ThreadPool
+
+from xnb_parse.type_reader import ReaderError
+from xnb_parse.identify import walk_files
+from xnb_parse.file_formats.audio_summary import SUMMARY_EXTENSION
+from xnb_parse.file_formats.wav import read_wav
+
+
+def summarize_file(filename):
+    """
+    write the sidecar for one WAV file, returns its AudioSummary or None for formats that can not be decoded
+    """
+    audio_summary = read_wav(filename).summarize()
+    if audio_summary is not None:
+        audio_summary.write(os.path.splitext(filename)[0] + SUMMARY_EXTENSION)
+    return audio_summary
+
+
+def _summarize_file(filename):
+    try:
+        return filename, summarize_file(filename), None
+    except (ReaderError, IOError, OSError, ValueError) as ex:
+        return filename, None, ex
+
+
+def summarize_dir(root_dir, threads=None):
+    """
+    write sidecars for every WAV file under root_dir on a pool of threads, yields (filename, AudioSummary or None,
+    exception or None) as each finishes
+    """
+    filenames = (filename for filename in walk_files(root_dir) if filename.lower().endswith('.wav'))
+    pool = ThreadPool(threads)
+    try:
+        for result in pool.imap_unordered(_summarize_file, filenames, 4):
+            yield result
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def main():
+    if len(sys.argv) == 2:
+        totaltime = time.time()
+        path = os.path.normpath(sys.argv[1])
+        if os.path.isdir(path):
+            results = summarize_dir(path)
+        else:
+            results = [_summarize_file(path)]
+        done = 0
+        for filename, audio_summary, ex in results:
+            if ex is not None:
+                print("FAILED: '{}' {}: {}".format(filename, type(ex).__name__, ex), file=sys.stderr)
+            elif audio_summary is not None:
+                print('{} {}'.format(filename, audio_summary))
+                done += 1
+        print('{} summaries written'.format(done))
+        print('> Done in {:.2f} seconds'.format(time.time() - totaltime))
+    else:
+        print('summarize_audio.py file.wav|directory', file=sys.stderr)
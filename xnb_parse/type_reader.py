@@ -4,6 +4,8 @@ Base type readers
 
 from __future__ import print_function
 
+from collections import namedtuple
+
 # avoid circular import
 VERSION_40 = 5
 
@@ -32,12 +34,17 @@ class TypeReaderPlugin(Plugin):
     """
 
 
+ReadObject = namedtuple('ReadObject', ['expected_type_reader', 'type_params'])
+ReadObject.__new__.__defaults__ = (None, None)
+
+
 class BaseTypeReader(object):
     target_type = None
     reader_name = None
     is_value_type = False
     is_generic_type = False
     is_enum_type = False
+    is_iterative = False
     file_platform = None
     file_version = None
 
@@ -51,6 +58,14 @@ class BaseTypeReader(object):
     def read(self):
         raise ReaderError("Unimplemented type reader: '{}'".format(self.reader_name))
 
+    def read_iter(self):
+        """
+        generator form of read used when is_iterative is set. Yields ReadObject for each nested object, which is
+        sent back once read, and yields the finished value last. XNBReader.read_iterative drives these off an
+        explicit stack so deeply nested content doesn't recurse through Python frames.
+        """
+        yield self.read()
+
     def init_reader(self, file_platform=None, file_version=None):
         self.file_platform = file_platform
         self.file_version = file_version
@@ -60,6 +75,16 @@ class ValueTypeReader(BaseTypeReader):
     is_value_type = True
 
 
+class IterativeTypeReader(BaseTypeReader):
+    is_iterative = True
+
+    def read(self):
+        return self.stream.read_iterative(self)
+
+    def read_iter(self):
+        raise ReaderError("Unimplemented iterative type reader: '{}'".format(self.reader_name))
+
+
 class GenericTypeReader(BaseTypeReader):
     generic_target_type = None
     generic_reader_name = None
@@ -78,12 +103,14 @@ class GenericTypeReader(BaseTypeReader):
 
     @classmethod
     def create_from_type(cls, type_spec):
-        # really need to figure out how to do this more cleanly
-        body = dict(cls.__dict__)
-        body['target_type'] = cls.generic_target_type + type_spec.suffix
-        body['reader_name'] = cls.generic_reader_name + type_spec.suffix
-        body['generic_params'] = [arg.full_name for arg in type_spec.generic_params]
-        class_ = type(cls.__name__, cls.__bases__, body)
+        # derive from the generic reader rather than copying its body, the new class only differs in these attributes
+        body = {
+            '__module__': cls.__module__,
+            'target_type': cls.generic_target_type + type_spec.suffix,
+            'reader_name': cls.generic_reader_name + type_spec.suffix,
+            'generic_params': [arg.full_name for arg in type_spec.generic_params],
+        }
+        class_ = type(cls.__name__, (cls,), body)
         return class_
 
 
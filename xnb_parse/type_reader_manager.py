@@ -4,20 +4,57 @@ load and manage type readers
 
 from __future__ import print_function
 
+from importlib import import_module
+from threading import RLock
+
+from xnb_parse import type_reader_registry
 from xnb_parse.type_spec import TypeSpec
 from xnb_parse.type_reader import TypeReaderPlugin, ReaderError, GenericTypeReader, BaseTypeReader
+from xnb_parse.type_readers import load_all
+
+
+class ReaderTable(object):
+    """
+    fully initialised set of type readers for one XNB type reader header
+    """
+
+    def __init__(self, key, readers, file_platform=None, file_version=None):
+        self.key = key
+        self.readers = readers
+        for reader in self.readers:
+            reader.init_reader(file_platform, file_version)
+        # collect generic argument readers as well so the whole table can be rebound to another stream
+        self._all_readers = []
+        pending = list(self.readers)
+        while pending:
+            reader = pending.pop()
+            self._all_readers.append(reader)
+            if reader.is_generic_type and reader.readers:
+                pending.extend(reader.readers)
 
-# pull in all typereaders
-import xnb_parse.type_readers
+    def bind(self, stream):
+        for reader in self._all_readers:
+            reader.stream = stream
 
 
 class TypeReaderManager(object):
     def __init__(self):
+        # lookups that hit the dicts below are lock free, anything that adds to them holds the lock
+        self._lock = RLock()
+        self._reader_tables = {}
+        self._registered = set()
+        self._loaded_modules = set()
+        self._all_loaded = False
         self.type_readers = {}
         self.type_readers_type = {}
         self.generic_type_readers = {}
         self.generic_type_readers_type = {}
+        self._register_plugins()
+
+    def _register_plugins(self):
         for class_ in TypeReaderPlugin.__subclasses__():
+            if class_ in self._registered:
+                continue
             if issubclass(class_, GenericTypeReader):
                 if class_.generic_reader_name in self.generic_type_readers:
                     raise ReaderError("Duplicate generic type reader name: '{}'".format(class_.generic_reader_name))
@@ -34,6 +71,45 @@ class TypeReaderManager(object):
                 self.type_readers_type[class_.target_type] = class_
             else:
                 raise ReaderError("Unknown base class for reader: '{!s}'".format(class_))
+            self._registered.add(class_)
+
+    def _load_module(self, module_name):
+        if module_name is None or module_name in self._loaded_modules:
+            return False
+        import_module(module_name)
+        self._loaded_modules.add(module_name)
+        self._register_plugins()
+        return True
+
+    def _load_all(self):
+        # fallback for readers missing from the registry
+        if self._all_loaded:
+            return False
+        load_all()
+        self._all_loaded = True
+        self._register_plugins()
+        return True
+
+    def get_reader_table(self, stream, reader_specs, file_platform=None, file_version=None):
+        """
+        reader_specs is a tuple of (reader name, reader version) pairs as read from the XNB header.
+        Tables are reused between files with identical headers, callers must hand them back with release_reader_table.
+        """
+        key = (reader_specs, file_platform, file_version)
+        try:
+            # list.pop is atomic so two threads can never be handed the same table
+            table = self._reader_tables[key].pop()
+        except (KeyError, IndexError):
+            readers = [stream.get_type_reader(reader_name, reader_version)
+                       for reader_name, reader_version in reader_specs]
+            return ReaderTable(key, readers, file_platform, file_version)
+        table.bind(stream)
+        return table
+
+    def release_reader_table(self, table):
+        # drop the stream so idle tables don't keep file data alive
+        table.bind(None)
+        self._reader_tables.setdefault(table.key, []).append(table)
 
     def get_type_reader(self, type_reader):
         try:
@@ -43,24 +119,24 @@ class TypeReaderManager(object):
 
         type_spec = TypeSpec.parse(name)
 
-        if type_spec.full_name in self.type_readers:
+        try:
             return self.type_readers[type_spec.full_name]
+        except KeyError:
+            pass
 
-        if type_spec.generic_params:
-            if type_spec.name in self.generic_type_readers:
-                generic_type_class = self.generic_type_readers[type_spec.name]
-                generic_type_reader_class = generic_type_class.create_from_type(type_spec)
-                if generic_type_reader_class.reader_name in self.type_readers:
-                    raise ReaderError("Duplicate type reader name from generic: '{}' '{}'".format(
-                        generic_type_reader_class.reader_name, generic_type_class.generic_reader_name))
-                self.type_readers[generic_type_reader_class.reader_name] = generic_type_reader_class
-                if generic_type_reader_class.target_type in self.type_readers_type:
-                    raise ReaderError("Duplicate type reader type from generic: '{}' '{}'".format(
-                        generic_type_reader_class.target_type, generic_type_class.generic_target_type))
-                self.type_readers_type[generic_type_reader_class.target_type] = generic_type_reader_class
-                return generic_type_reader_class
-
-        raise ReaderError("Type reader not found: '{}'".format(type_spec.full_name))
+        with self._lock:
+            while True:
+                if type_spec.full_name in self.type_readers:
+                    return self.type_readers[type_spec.full_name]
+                if self._load_module(type_reader_registry.READERS.get(type_spec.full_name)):
+                    continue
+                if type_spec.generic_params:
+                    if type_spec.name in self.generic_type_readers:
+                        return self._add_generic(self.generic_type_readers[type_spec.name], type_spec)
+                    if self._load_module(type_reader_registry.GENERIC_READERS.get(type_spec.name)):
+                        continue
+                if not self._load_all():
+                    raise ReaderError("Type reader not found: '{}'".format(type_spec.full_name))
 
     def get_type_reader_by_type(self, type_reader):
         try:
@@ -70,21 +146,33 @@ class TypeReaderManager(object):
 
         type_spec = TypeSpec.parse(reader_type)
 
-        if type_spec.full_name in self.type_readers_type:
+        try:
             return self.type_readers_type[type_spec.full_name]
+        except KeyError:
+            pass
+
+        with self._lock:
+            while True:
+                if type_spec.full_name in self.type_readers_type:
+                    return self.type_readers_type[type_spec.full_name]
+                if self._load_module(type_reader_registry.READER_TYPES.get(type_spec.full_name)):
+                    continue
+                if type_spec.generic_params:
+                    if type_spec.name in self.generic_type_readers_type:
+                        return self._add_generic(self.generic_type_readers_type[type_spec.name], type_spec)
+                    if self._load_module(type_reader_registry.GENERIC_READER_TYPES.get(type_spec.name)):
+                        continue
+                if not self._load_all():
+                    raise ReaderError("Type reader not found: '{}'".format(type_spec.full_name))
 
-        if type_spec.generic_params:
-            if type_spec.name in self.generic_type_readers_type:
-                generic_type_class = self.generic_type_readers_type[type_spec.name]
-                generic_type_reader_class = generic_type_class.create_from_type(type_spec)
-                if generic_type_reader_class.reader_name in self.type_readers:
-                    raise ReaderError("Duplicate type reader name from generic: '{}' '{}'".format(
-                        generic_type_reader_class.reader_name, generic_type_class.generic_reader_name))
-                self.type_readers[generic_type_reader_class.reader_name] = generic_type_reader_class
-                if generic_type_reader_class.target_type in self.type_readers_type:
-                    raise ReaderError("Duplicate type reader type from generic: '{}' '{}'".format(
-                        generic_type_reader_class.target_type, generic_type_class.generic_target_type))
-                self.type_readers_type[generic_type_reader_class.target_type] = generic_type_reader_class
-                return generic_type_reader_class
-
-        raise ReaderError("Type reader not found: '{}'".format(type_spec.full_name))
+    def _add_generic(self, generic_type_class, type_spec):
+        generic_type_reader_class = generic_type_class.create_from_type(type_spec)
+        if generic_type_reader_class.reader_name in self.type_readers:
+            raise ReaderError("Duplicate type reader name from generic: '{}' '{}'".format(
+                generic_type_reader_class.reader_name, generic_type_class.generic_reader_name))
+        self.type_readers[generic_type_reader_class.reader_name] = generic_type_reader_class
+        if generic_type_reader_class.target_type in self.type_readers_type:
+            raise ReaderError("Duplicate type reader type from generic: '{}' '{}'".format(
+                generic_type_reader_class.target_type, generic_type_class.generic_target_type))
+        self.type_readers_type[generic_type_reader_class.target_type] = generic_type_reader_class
+        return generic_type_reader_class
@@ -0,0 +1,338 @@
+"""
+type reader registry, maps reader and target type names to the module defining the reader
+
+generated by gen_reader_registry.py, do not edit
+"""
+
+from __future__ import print_function
+
+
+READERS = {
+    'FezEngine.FaceOrientationReader': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.LevelNodeTypeReader': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Readers.ActorTypeReader': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Readers.AmbienceTrackReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.AnimatedTextureReader': 'xnb_parse.type_readers.fez.fez_graphics',
+    'FezEngine.Readers.ArtObjectActorSettingsReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.ArtObjectInstanceReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.ArtObjectReader': 'xnb_parse.type_readers.fez.fez_graphics',
+    'FezEngine.Readers.AssembleChordsReader': 'xnb_parse.type_readers.fez.fez_music',
+    'FezEngine.Readers.BackgroundPlaneReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.CameraNodeDataReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.CodeInputReader': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Readers.CollisionTypeReader': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Readers.ComparisonOperatorReader': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Readers.DotDialogueLineReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.EntityReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.FrameReader': 'xnb_parse.type_readers.fez.fez_graphics',
+    'FezEngine.Readers.InstanceActorSettingsReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.LevelReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.LiquidTypeReader': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Readers.LoopReader': 'xnb_parse.type_readers.fez.fez_music',
+    'FezEngine.Readers.MapNodeConnectionReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.MapNodeReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.MapTreeReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.MovementPathReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.NpcActionContentReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.NpcActionReader': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Readers.NpcInstanceReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.NpcMetadataReader': 'xnb_parse.type_readers.fez.fez_graphics',
+    'FezEngine.Readers.PathEndBehaviorReader': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Readers.PathSegmentReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.ScriptActionReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.ScriptConditionReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.ScriptReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.ScriptTriggerReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.ShardNotesReader': 'xnb_parse.type_readers.fez.fez_music',
+    'FezEngine.Readers.SkyLayerReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.SkyReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.SpeechLineReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.SurfaceTypeReader': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Readers.TrackedSongReader': 'xnb_parse.type_readers.fez.fez_music',
+    'FezEngine.Readers.TrileEmplacementReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.TrileFaceReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.TrileGroupReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.TrileInstanceReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.TrileReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.TrileSetReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.VertexPositionNormalTextureInstanceReader': 'xnb_parse.type_readers.fez.fez_graphics',
+    'FezEngine.Readers.VibrationMotorReader': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Readers.ViewpointReader': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Readers.VolumeActorSettingsReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.VolumeReader': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Readers.WinConditionsReader': 'xnb_parse.type_readers.fez.fez_level',
+    'Microsoft.Xna.Framework.Content.BasicEffectReader': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Content.BooleanReader': 'xnb_parse.type_readers.xna_primitive',
+    'Microsoft.Xna.Framework.Content.BoundingBoxReader': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Content.BoundingFrustumReader': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Content.BoundingSphereReader': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Content.ByteReader': 'xnb_parse.type_readers.xna_primitive',
+    'Microsoft.Xna.Framework.Content.CharReader': 'xnb_parse.type_readers.xna_primitive',
+    'Microsoft.Xna.Framework.Content.ColorReader': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Content.CurveReader': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Content.DateTimeReader': 'xnb_parse.type_readers.xna_system',
+    'Microsoft.Xna.Framework.Content.DecimalReader': 'xnb_parse.type_readers.xna_system',
+    'Microsoft.Xna.Framework.Content.DoubleReader': 'xnb_parse.type_readers.xna_primitive',
+    'Microsoft.Xna.Framework.Content.EffectMaterialReader': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Content.EffectReader': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Content.ExternalReferenceReader': 'xnb_parse.type_readers.xna_system',
+    'Microsoft.Xna.Framework.Content.IndexBufferReader': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Content.Int16Reader': 'xnb_parse.type_readers.xna_primitive',
+    'Microsoft.Xna.Framework.Content.Int32Reader': 'xnb_parse.type_readers.xna_primitive',
+    'Microsoft.Xna.Framework.Content.Int64Reader': 'xnb_parse.type_readers.xna_primitive',
+    'Microsoft.Xna.Framework.Content.MatrixReader': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Content.ModelReader': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Content.ObjectReader': 'xnb_parse.type_readers.xna_primitive',
+    'Microsoft.Xna.Framework.Content.PlaneReader': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Content.PointReader': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Content.PrimitiveTypeReader': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Content.QuaternionReader': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Content.RayReader': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Content.RectangleReader': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Emitters.CircleEmitter]':
+        'xnb_parse.type_readers.mercury.emitters',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Emitters.ConeEmitter]':
+        'xnb_parse.type_readers.mercury.emitters',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Emitters.EmitterCollection]':
+        'xnb_parse.type_readers.mercury.emitters',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Emitters.Emitter]':
+        'xnb_parse.type_readers.mercury.emitters',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Emitters.LineEmitter]':
+        'xnb_parse.type_readers.mercury.emitters',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ColourInterpolatorModifier]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ColourMergeModifier]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ColourModifier]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.DampingModifier]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.HueShiftModifier]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.LinearGravityModifier]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ModifierCollection]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.Modifier]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.OpacityInterpolatorModifier]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.OpacityModifier]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.OpacityOscillator]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.RadialForceModifier]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.RadialGravityModifier]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.RectangleConstraintDeflector]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.RectangleForceModifier]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.RotationModifier]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.RotationRateModifier]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ScaleInterpolatorModifier]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ScaleMergeModifier]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ScaleModifier]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.ScaleOscillator]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.SineForceModifier]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.TrajectoryRotationModifier]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.Modifiers.VelocityClampModifier]':
+        'xnb_parse.type_readers.mercury.modifiers',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.ParticleEffect]':
+        'xnb_parse.type_readers.mercury.particle',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.VariableFloat3]':
+        'xnb_parse.type_readers.mercury.basic',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1[ProjectMercury.VariableFloat]':
+        'xnb_parse.type_readers.mercury.basic',
+    'Microsoft.Xna.Framework.Content.SByteReader': 'xnb_parse.type_readers.xna_primitive',
+    'Microsoft.Xna.Framework.Content.SingleReader': 'xnb_parse.type_readers.xna_primitive',
+    'Microsoft.Xna.Framework.Content.SongReader': 'xnb_parse.type_readers.xna_media',
+    'Microsoft.Xna.Framework.Content.SoundEffectReader': 'xnb_parse.type_readers.xna_media',
+    'Microsoft.Xna.Framework.Content.SpriteFontReader': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Content.StringReader': 'xnb_parse.type_readers.xna_primitive',
+    'Microsoft.Xna.Framework.Content.Texture2DReader': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Content.Texture3DReader': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Content.TextureCubeReader': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Content.TextureReader': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Content.TimeSpanReader': 'xnb_parse.type_readers.xna_system',
+    'Microsoft.Xna.Framework.Content.UInt16Reader': 'xnb_parse.type_readers.xna_primitive',
+    'Microsoft.Xna.Framework.Content.UInt32Reader': 'xnb_parse.type_readers.xna_primitive',
+    'Microsoft.Xna.Framework.Content.UInt64Reader': 'xnb_parse.type_readers.xna_primitive',
+    'Microsoft.Xna.Framework.Content.Vector2Reader': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Content.Vector3Reader': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Content.Vector4Reader': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Content.VertexBufferReader': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Content.VertexDeclarationReader': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Content.VideoReader': 'xnb_parse.type_readers.xna_media',
+    'ProjectMercury.BlendMode': 'xnb_parse.type_readers.mercury.basic',
+}
+
+READER_TYPES = {
+    'ExternalReference': 'xnb_parse.type_readers.xna_system',
+    'FezEngine.CollisionType': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Content.FrameContent': 'xnb_parse.type_readers.fez.fez_graphics',
+    'FezEngine.FaceOrientation': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.LevelNodeType': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Structure.ActorType': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Structure.AmbienceTrack': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.AnimatedTexture': 'xnb_parse.type_readers.fez.fez_graphics',
+    'FezEngine.Structure.ArtObject': 'xnb_parse.type_readers.fez.fez_graphics',
+    'FezEngine.Structure.ArtObjectActorSettings': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.ArtObjectInstance': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.AssembleChords': 'xnb_parse.type_readers.fez.fez_music',
+    'FezEngine.Structure.BackgroundPlane': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.CameraNodeData': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.DotDialogueLine': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.Geometry.VertexPositionNormalTextureInstance': 'xnb_parse.type_readers.fez.fez_graphics',
+    'FezEngine.Structure.Input.CodeInput': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Structure.Input.VibrationMotor': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Structure.InstanceActorSettings': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.Level': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.LiquidType': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Structure.Loop': 'xnb_parse.type_readers.fez.fez_music',
+    'FezEngine.Structure.MapNode': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.MapNode+Connection': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.MapTree': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.MovementPath': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.NpcAction': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Structure.NpcActionContent': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.NpcInstance': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.NpcMetadata': 'xnb_parse.type_readers.fez.fez_graphics',
+    'FezEngine.Structure.PathEndBehavior': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Structure.PathSegment': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.Scripting.ComparisonOperator': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Structure.Scripting.Entity': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.Scripting.Script': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.Scripting.ScriptAction': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.Scripting.ScriptCondition': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.Scripting.ScriptTrigger': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.ShardNotes': 'xnb_parse.type_readers.fez.fez_music',
+    'FezEngine.Structure.Sky': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.SkyLayer': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.SpeechLine': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.SurfaceType': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Structure.TrackedSong': 'xnb_parse.type_readers.fez.fez_music',
+    'FezEngine.Structure.Trile': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.TrileEmplacement': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.TrileFace': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.TrileGroup': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.TrileInstance': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.TrileSet': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.Volume': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.VolumeActorSettings': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Structure.WinConditions': 'xnb_parse.type_readers.fez.fez_level',
+    'FezEngine.Viewpoint': 'xnb_parse.type_readers.fez.fez_basic',
+    'Microsoft.Xna.Framework.Audio.SoundEffect': 'xnb_parse.type_readers.xna_media',
+    'Microsoft.Xna.Framework.BoundingBox': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.BoundingFrustum': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.BoundingSphere': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Curve': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Graphics.BasicEffect': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.Color': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Graphics.Effect': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.EffectMaterial': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.IndexBuffer': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.Model': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.PrimitiveType': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.SpriteFont': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.Texture': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.Texture2D': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.Texture3D': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.TextureCube': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.VertexBuffer': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Graphics.VertexDeclaration': 'xnb_parse.type_readers.xna_graphics',
+    'Microsoft.Xna.Framework.Matrix': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Media.Song': 'xnb_parse.type_readers.xna_media',
+    'Microsoft.Xna.Framework.Media.Video': 'xnb_parse.type_readers.xna_media',
+    'Microsoft.Xna.Framework.Plane': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Point': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Quaternion': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Ray': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Rectangle': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Vector2': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Vector3': 'xnb_parse.type_readers.xna_math',
+    'Microsoft.Xna.Framework.Vector4': 'xnb_parse.type_readers.xna_math',
+    'ProjectMercury.BlendMode': 'xnb_parse.type_readers.mercury.basic',
+    'ProjectMercury.Emitters.CircleEmitter': 'xnb_parse.type_readers.mercury.emitters',
+    'ProjectMercury.Emitters.ConeEmitter': 'xnb_parse.type_readers.mercury.emitters',
+    'ProjectMercury.Emitters.Emitter': 'xnb_parse.type_readers.mercury.emitters',
+    'ProjectMercury.Emitters.EmitterCollection': 'xnb_parse.type_readers.mercury.emitters',
+    'ProjectMercury.Emitters.LineEmitter': 'xnb_parse.type_readers.mercury.emitters',
+    'ProjectMercury.Modifiers.ColourInterpolatorModifier': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.ColourMergeModifier': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.ColourModifier': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.DampingModifier': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.HueShiftModifier': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.LinearGravityModifier': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.Modifier': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.ModifierCollection': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.OpacityInterpolatorModifier': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.OpacityModifier': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.OpacityOscillator': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.RadialForceModifier': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.RadialGravityModifier': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.RectangleConstraintDeflector': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.RectangleForceModifier': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.RotationModifier': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.RotationRateModifier': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.ScaleInterpolatorModifier': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.ScaleMergeModifier': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.ScaleModifier': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.ScaleOscillator': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.SineForceModifier': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.TrajectoryRotationModifier': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.Modifiers.VelocityClampModifier': 'xnb_parse.type_readers.mercury.modifiers',
+    'ProjectMercury.ParticleEffect': 'xnb_parse.type_readers.mercury.particle',
+    'ProjectMercury.VariableFloat': 'xnb_parse.type_readers.mercury.basic',
+    'ProjectMercury.VariableFloat3': 'xnb_parse.type_readers.mercury.basic',
+    'System.Boolean': 'xnb_parse.type_readers.xna_primitive',
+    'System.Byte': 'xnb_parse.type_readers.xna_primitive',
+    'System.Char': 'xnb_parse.type_readers.xna_primitive',
+    'System.DateTime': 'xnb_parse.type_readers.xna_system',
+    'System.Decimal': 'xnb_parse.type_readers.xna_system',
+    'System.Double': 'xnb_parse.type_readers.xna_primitive',
+    'System.Int16': 'xnb_parse.type_readers.xna_primitive',
+    'System.Int32': 'xnb_parse.type_readers.xna_primitive',
+    'System.Int64': 'xnb_parse.type_readers.xna_primitive',
+    'System.Object': 'xnb_parse.type_readers.xna_primitive',
+    'System.SByte': 'xnb_parse.type_readers.xna_primitive',
+    'System.Single': 'xnb_parse.type_readers.xna_primitive',
+    'System.String': 'xnb_parse.type_readers.xna_primitive',
+    'System.TimeSpan': 'xnb_parse.type_readers.xna_system',
+    'System.UInt16': 'xnb_parse.type_readers.xna_primitive',
+    'System.UInt32': 'xnb_parse.type_readers.xna_primitive',
+    'System.UInt64': 'xnb_parse.type_readers.xna_primitive',
+}
+
+GENERIC_READERS = {
+    'FezEngine.IEqualityComparerReader`1': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Readers.ShaderInstancedIndexedPrimitivesReader`2': 'xnb_parse.type_readers.fez.fez_graphics',
+    'FezEngine.SetReader`1': 'xnb_parse.type_readers.fez.fez_basic',
+    'Microsoft.Xna.Framework.Content.ArrayReader`1': 'xnb_parse.type_readers.xna_system',
+    'Microsoft.Xna.Framework.Content.DictionaryReader`2': 'xnb_parse.type_readers.xna_system',
+    'Microsoft.Xna.Framework.Content.EnumReader`1': 'xnb_parse.type_readers.xna_system',
+    'Microsoft.Xna.Framework.Content.ListReader`1': 'xnb_parse.type_readers.xna_system',
+    'Microsoft.Xna.Framework.Content.NullableReader`1': 'xnb_parse.type_readers.xna_system',
+    'Microsoft.Xna.Framework.Content.ReflectiveReader`1': 'xnb_parse.type_readers.xna_system',
+}
+
+GENERIC_READER_TYPES = {
+    'Common.Set`1': 'xnb_parse.type_readers.fez.fez_basic',
+    'FezEngine.Structure.Geometry.ShaderInstancedIndexedPrimitives`2': 'xnb_parse.type_readers.fez.fez_graphics',
+    'Reflective': 'xnb_parse.type_readers.xna_system',
+    'System.Array`1': 'xnb_parse.type_readers.xna_system',
+    'System.Collections.Generic.Dictionary`2': 'xnb_parse.type_readers.xna_system',
+    'System.Collections.Generic.IEqualityComparer`1': 'xnb_parse.type_readers.fez.fez_basic',
+    'System.Collections.Generic.List`1': 'xnb_parse.type_readers.xna_system',
+    'System.Enum`1': 'xnb_parse.type_readers.xna_system',
+    'System.Nullable`1': 'xnb_parse.type_readers.xna_system',
+}
@@ -1,13 +1,34 @@
 """
 all type readers
+
+reader modules are imported on demand by TypeReaderManager, use load_all to pull them all in
 """
 
 from __future__ import print_function
 
-from xnb_parse.type_readers import xna_graphics, xna_math, xna_media, xna_primitive, xna_system
+from importlib import import_module
+
+
+READER_MODULES = [
+    'xnb_parse.type_readers.xna_graphics',
+    'xnb_parse.type_readers.xna_math',
+    'xnb_parse.type_readers.xna_media',
+    'xnb_parse.type_readers.xna_primitive',
+    'xnb_parse.type_readers.xna_system',
+    'xnb_parse.type_readers.fez.fez_basic',
+    'xnb_parse.type_readers.fez.fez_graphics',
+    'xnb_parse.type_readers.fez.fez_level',
+    'xnb_parse.type_readers.fez.fez_music',
+    'xnb_parse.type_readers.mercury.basic',
+    'xnb_parse.type_readers.mercury.emitters',
+    'xnb_parse.type_readers.mercury.modifiers',
+    'xnb_parse.type_readers.mercury.particle',
+]
+
 
-from xnb_parse.type_readers.fez import *
-from xnb_parse.type_readers.mercury import *
+def load_all():
+    for module_name in READER_MODULES:
+        import_module(module_name)
 
 
-__all__ = ['xna_graphics', 'xna_math', 'xna_media', 'xna_primitive', 'xna_system']
+__all__ = ['xna_graphics', 'xna_math', 'xna_media', 'xna_primitive', 'xna_system', 'fez', 'mercury']
@@ -4,7 +4,8 @@ FEZ level type readers
 
 from __future__ import print_function
 
-from xnb_parse.type_reader import TypeReaderPlugin, BaseTypeReader, ValueTypeReader
+from xnb_parse.type_reader import TypeReaderPlugin, BaseTypeReader, ValueTypeReader, IterativeTypeReader, ReadObject
+from xnb_parse.reader_schema import Field, compile_schema
 from xnb_parse.type_readers.xna_graphics import Texture2DReader
 from xnb_parse.type_readers.xna_math import Vector4Reader
 from xnb_parse.type_readers.xna_primitive import Int32Reader, StringReader, BooleanReader
@@ -15,7 +16,7 @@ from xnb_parse.type_readers.fez.fez_basic import (LevelNodeTypeReader, FaceOrien
                                                   NpcActionReader, ComparisonOperatorReader, VibrationMotorReader)
 from xnb_parse.type_readers.fez.fez_graphics import (ShaderInstancedIndexedPrimitivesReader,
                                                      VertexPositionNormalTextureInstanceReader)
-from xnb_parse.xna_types.xna_math import Vector3, Quaternion
+from xnb_parse.xna_types.xna_math import Vector3
 from xnb_parse.xna_types.fez.fez_level import (MapTree, MapNode, MapNodeConnection, WinConditions, Sky, SkyLayer, Trile,
                                                TrileSet, Level, TrileFace, TrileEmplacement, Volume,
                                                VolumeActorSettings, DotDialogueLine, Script, ScriptTrigger, Entity,
@@ -25,104 +26,99 @@ from xnb_parse.xna_types.fez.fez_level import (MapTree, MapNode, MapNodeConnecti
                                                MovementPath, AmbienceTrack)
 
 
-class MapTreeReader(BaseTypeReader, TypeReaderPlugin):
+class MapTreeReader(IterativeTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.MapTree'
     reader_name = 'FezEngine.Readers.MapTreeReader'
 
-    def read(self):
-        root = self.stream.read_object(MapNodeReader)
-        return MapTree(root)
+    def read_iter(self):
+        root = yield ReadObject(MapNodeReader)
+        yield MapTree(root)
 
 
-class MapNodeReader(BaseTypeReader, TypeReaderPlugin):
+class MapNodeReader(IterativeTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.MapNode'
     reader_name = 'FezEngine.Readers.MapNodeReader'
 
-    def read(self):
+    def read_iter(self):
         level_name = self.stream.read_string()
-        connections = self.stream.read_object(ListReader, [MapNodeConnectionReader])
+        connections = yield ReadObject(ListReader, [MapNodeConnectionReader])
         node_type = self.stream.read_object(LevelNodeTypeReader)
         conditions = self.stream.read_object(WinConditionsReader)
         has_lesser_gate = self.stream.read_boolean()
         has_warp_gate = self.stream.read_boolean()
-        return MapNode(level_name, connections, node_type, conditions, has_lesser_gate, has_warp_gate)
+        yield MapNode(level_name, connections, node_type, conditions, has_lesser_gate, has_warp_gate)
 
 
-class MapNodeConnectionReader(BaseTypeReader, TypeReaderPlugin):
+class MapNodeConnectionReader(IterativeTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.MapNode+Connection'
     reader_name = 'FezEngine.Readers.MapNodeConnectionReader'
 
-    def read(self):
+    def read_iter(self):
         face = self.stream.read_object(FaceOrientationReader)
-        node = self.stream.read_object(MapNodeReader)
+        node = yield ReadObject(MapNodeReader)
         branch_oversize = self.stream.read_single()
-        return MapNodeConnection(face, node, branch_oversize)
+        yield MapNodeConnection(face, node, branch_oversize)
 
 
 class WinConditionsReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.WinConditions'
     reader_name = 'FezEngine.Readers.WinConditionsReader'
 
-    def read(self):
-        chest_count = self.stream.read_int32()
-        locked_door_count = self.stream.read_int32()
-        unlocked_door_count = self.stream.read_int32()
-        script_ids = self.stream.read_object(ListReader, [Int32Reader])
-        cube_shard_count = self.stream.read_int32()
-        other_collectible_count = self.stream.read_int32()
-        split_up_count = self.stream.read_int32()
-        secret_count = self.stream.read_int32()
-        return WinConditions(chest_count, locked_door_count, unlocked_door_count, script_ids, cube_shard_count,
-                             other_collectible_count, split_up_count, secret_count)
-
-
-class SkyReader(BaseTypeReader, TypeReaderPlugin):
-    target_type = 'FezEngine.Structure.Sky'
-    reader_name = 'FezEngine.Readers.SkyReader'
-
-    def read(self):
-        name = self.stream.read_string()
-        background = self.stream.read_string()
-        wind_speed = self.stream.read_single()
-        density = self.stream.read_single()
-        fog_density = self.stream.read_single()
-        layers = self.stream.read_object(ListReader, [SkyLayerReader])
-        clouds = self.stream.read_object(ListReader, [StringReader])
-        shadows = self.stream.read_object(StringReader)
-        stars = self.stream.read_object(StringReader)
-        cloud_tint = self.stream.read_object(StringReader)
-        vertical_tiling = self.stream.read_boolean()
-        horizontal_scrolling = self.stream.read_boolean()
-        layer_base_height = self.stream.read_single()
-        inter_layer_vertical_distance = self.stream.read_single()
-        inter_layer_horizontal_distance = self.stream.read_single()
-        horizontal_distance = self.stream.read_single()
-        vertical_distance = self.stream.read_single()
-        layer_base_spacing = self.stream.read_single()
-        wind_parallax = self.stream.read_single()
-        wind_distance = self.stream.read_single()
-        clouds_parallax = self.stream.read_single()
-        shadow_opacity = self.stream.read_single()
-        foliage_shadows = self.stream.read_boolean()
-        no_per_face_layer_x_offset = self.stream.read_boolean()
-        layer_base_x_offset = self.stream.read_single()
-        return Sky(name, background, wind_speed, density, fog_density, layers, clouds, shadows, stars, cloud_tint,
-                   vertical_tiling, horizontal_scrolling, layer_base_height, inter_layer_vertical_distance,
-                   inter_layer_horizontal_distance, horizontal_distance, vertical_distance, layer_base_spacing,
-                   wind_parallax, wind_distance, clouds_parallax, shadow_opacity, foliage_shadows,
-                   no_per_face_layer_x_offset, layer_base_x_offset)
+    read = compile_schema(WinConditions, [
+        Field('chest_count', 'int32'),
+        Field('locked_door_count', 'int32'),
+        Field('unlocked_door_count', 'int32'),
+        Field('script_ids', 'object', ListReader, [Int32Reader]),
+        Field('cube_shard_count', 'int32'),
+        Field('other_collectible_count', 'int32'),
+        Field('split_up_count', 'int32'),
+        Field('secret_count', 'int32'),
+    ])
 
 
 class SkyLayerReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.SkyLayer'
     reader_name = 'FezEngine.Readers.SkyLayerReader'
 
-    def read(self):
-        name = self.stream.read_string()
-        in_front = self.stream.read_boolean()
-        opacity = self.stream.read_single()
-        fog_tint = self.stream.read_single()
-        return SkyLayer(name, in_front, opacity, fog_tint)
+    read = compile_schema(SkyLayer, [
+        Field('name', 'string'),
+        Field('in_front', 'boolean'),
+        Field('opacity', 'single'),
+        Field('fog_tint', 'single'),
+    ])
+
+
+class SkyReader(BaseTypeReader, TypeReaderPlugin):
+    target_type = 'FezEngine.Structure.Sky'
+    reader_name = 'FezEngine.Readers.SkyReader'
+
+    read = compile_schema(Sky, [
+        Field('name', 'string'),
+        Field('background', 'string'),
+        Field('wind_speed', 'single'),
+        Field('density', 'single'),
+        Field('fog_density', 'single'),
+        Field('layers', 'object', ListReader, [SkyLayerReader]),
+        Field('clouds', 'object', ListReader, [StringReader]),
+        Field('shadows', 'object', StringReader),
+        Field('stars', 'object', StringReader),
+        Field('cloud_tint', 'object', StringReader),
+        Field('vertical_tiling', 'boolean'),
+        Field('horizontal_scrolling', 'boolean'),
+        Field('layer_base_height', 'single'),
+        Field('inter_layer_vertical_distance', 'single'),
+        Field('inter_layer_horizontal_distance', 'single'),
+        Field('horizontal_distance', 'single'),
+        Field('vertical_distance', 'single'),
+        Field('layer_base_spacing', 'single'),
+        Field('wind_parallax', 'single'),
+        Field('wind_distance', 'single'),
+        Field('clouds_parallax', 'single'),
+        Field('shadow_opacity', 'single'),
+        Field('foliage_shadows', 'boolean'),
+        Field('no_per_face_layer_x_offset', 'boolean'),
+        Field('layer_base_x_offset', 'single'),
+    ])
 
 
 class TrileSetReader(BaseTypeReader, TypeReaderPlugin):
@@ -140,24 +136,23 @@ class TrileReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.Trile'
     reader_name = 'FezEngine.Readers.TrileReader'
 
-    def read(self):
-        name = self.stream.read_string()
-        cubemap_path = self.stream.read_string()
-        size = self.stream.read_vector3()
-        offset = self.stream.read_vector3()
-        immaterial = self.stream.read_boolean()
-        see_through = self.stream.read_boolean()
-        thin = self.stream.read_boolean()
-        force_hugging = self.stream.read_boolean()
-        faces = self.stream.read_object(DictionaryReader, [FaceOrientationReader, CollisionTypeReader])
-        geometry = self.stream.read_object(ShaderInstancedIndexedPrimitivesReader,
-                                           [VertexPositionNormalTextureInstanceReader, Vector4Reader])
-        actor_settings_type = self.stream.read_object(ActorTypeReader)
-        actor_settings_face = self.stream.read_object(FaceOrientationReader)
-        surface_type = self.stream.read_object(SurfaceTypeReader)
-        atlas_offset = self.stream.read_vector2()
-        return Trile(name, cubemap_path, size, offset, immaterial, see_through, thin, force_hugging, faces, geometry,
-                     actor_settings_type, actor_settings_face, surface_type, atlas_offset)
+    read = compile_schema(Trile, [
+        Field('name', 'string'),
+        Field('cubemap_path', 'string'),
+        Field('size', 'vector3'),
+        Field('offset', 'vector3'),
+        Field('immaterial', 'boolean'),
+        Field('see_through', 'boolean'),
+        Field('thin', 'boolean'),
+        Field('force_hugging', 'boolean'),
+        Field('faces', 'object', DictionaryReader, [FaceOrientationReader, CollisionTypeReader]),
+        Field('geometry', 'object', ShaderInstancedIndexedPrimitivesReader,
+              [VertexPositionNormalTextureInstanceReader, Vector4Reader]),
+        Field('actor_settings_type', 'object', ActorTypeReader),
+        Field('actor_settings_face', 'object', FaceOrientationReader),
+        Field('surface_type', 'object', SurfaceTypeReader),
+        Field('atlas_offset', 'vector2'),
+    ])
 
 
 class LevelReader(BaseTypeReader, TypeReaderPlugin):
@@ -206,16 +201,33 @@ class LevelReader(BaseTypeReader, TypeReaderPlugin):
                      low_pass, muted_loops, ambience_tracks, node_type, quantum)
 
 
+class VolumeActorSettingsReader(BaseTypeReader, TypeReaderPlugin):
+    target_type = 'FezEngine.Structure.VolumeActorSettings'
+    reader_name = 'FezEngine.Readers.VolumeActorSettingsReader'
+
+    def read(self):
+        faraway_plane_offset = self.stream.read_vector2()
+        is_point_of_interest = self.stream.read_boolean()
+        dot_dialogue = self.stream.read_object(ListReader, [DotDialogueLineReader])
+        water_locked = self.stream.read_boolean()
+        code_pattern = self.stream.read_object(ArrayReader, [CodeInputReader])
+        is_blackhole = self.stream.read_boolean()
+        needs_trigger = self.stream.read_boolean()
+        is_secret_passage = self.stream.read_boolean()
+        return VolumeActorSettings(faraway_plane_offset, is_point_of_interest, dot_dialogue, water_locked, code_pattern,
+                                   is_blackhole, needs_trigger, is_secret_passage)
+
+
 class VolumeReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.Volume'
     reader_name = 'FezEngine.Readers.VolumeReader'
 
-    def read(self):
-        orientations = self.stream.read_object(ArrayReader, [FaceOrientationReader])
-        v_from = self.stream.read_vector3()
-        v_to = self.stream.read_vector3()
-        actor_settings = self.stream.read_object(VolumeActorSettingsReader)
-        return Volume(orientations, v_from, v_to, actor_settings)
+    read = compile_schema(Volume, [
+        Field('orientations', 'object', ArrayReader, [FaceOrientationReader]),
+        Field('v_from', 'vector3'),
+        Field('v_to', 'vector3'),
+        Field('actor_settings', 'object', VolumeActorSettingsReader),
+    ])
 
 
 class TrileEmplacementReader(ValueTypeReader, TypeReaderPlugin):
@@ -226,11 +238,11 @@ class TrileEmplacementReader(ValueTypeReader, TypeReaderPlugin):
         return TrileEmplacement._make(self.stream.unpack('3i'))
 
 
-class TrileInstanceReader(BaseTypeReader, TypeReaderPlugin):
+class TrileInstanceReader(IterativeTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.TrileInstance'
     reader_name = 'FezEngine.Readers.TrileInstanceReader'
 
-    def read(self):
+    def read_iter(self):
         values = self.stream.unpack('3f i B ?')
         position = Vector3._make(values[0:3])
         trile_id = values[3]
@@ -239,58 +251,80 @@ class TrileInstanceReader(BaseTypeReader, TypeReaderPlugin):
         has_actor_settings = values[5]
         if has_actor_settings:
             actor_settings = self.stream.read_object(InstanceActorSettingsReader)
-        overlapped_triles = self.stream.read_object(ListReader, [TrileInstanceReader])
-        return TrileInstance(position, trile_id, orientation, actor_settings, overlapped_triles)
+        overlapped_triles = yield ReadObject(ListReader, [TrileInstanceReader])
+        yield TrileInstance(position, trile_id, orientation, actor_settings, overlapped_triles)
+
+
+class ArtObjectActorSettingsReader(BaseTypeReader, TypeReaderPlugin):
+    target_type = 'FezEngine.Structure.ArtObjectActorSettings'
+    reader_name = 'FezEngine.Readers.ArtObjectActorSettingsReader'
+
+    def read(self):
+        inactive = self.stream.read_boolean()
+        contained_trile = self.stream.read_object(ActorTypeReader)
+        attached_group = self.stream.read_object(Int32Reader)
+        spin_view = self.stream.read_object(ViewpointReader)
+        spin_every = self.stream.read_single()
+        spin_offset = self.stream.read_single()
+        off_center = self.stream.read_boolean()
+        rotation_center = self.stream.read_vector3()
+        vibration_pattern = self.stream.read_object(ArrayReader, [VibrationMotorReader])
+        code_pattern = self.stream.read_object(ArrayReader, [CodeInputReader])
+        segment = self.stream.read_object(PathSegmentReader)
+        next_node = self.stream.read_object(Int32Reader)
+        destination_level = self.stream.read_object(StringReader)
+        treasure_map_name = self.stream.read_object(StringReader)
+        invisible_sides = self.stream.read_object(ArrayReader, [FaceOrientationReader])
+        timeswitch_wind_back_speed = self.stream.read_single()
+        return ArtObjectActorSettings(inactive, contained_trile, attached_group, spin_view, spin_every, spin_offset,
+                                      off_center, rotation_center, vibration_pattern, code_pattern, segment, next_node,
+                                      destination_level, treasure_map_name, invisible_sides, timeswitch_wind_back_speed)
 
 
 class ArtObjectInstanceReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.ArtObjectInstance'
     reader_name = 'FezEngine.Readers.ArtObjectInstanceReader'
 
-    def read(self):
-        name = self.stream.read_string()
-        values = self.stream.unpack('3f 4f 3f')
-        position = Vector3._make(values[0:3])
-        rotation = Quaternion._make(values[3:7])
-        scale = Vector3._make(values[7:10])
-        actor_settings = self.stream.read_object(ArtObjectActorSettingsReader)
-        return ArtObjectInstance(name, position, rotation, scale, actor_settings)
+    read = compile_schema(ArtObjectInstance, [
+        Field('name', 'string'),
+        Field('position', 'vector3'),
+        Field('rotation', 'quaternion'),
+        Field('scale', 'vector3'),
+        Field('actor_settings', 'object', ArtObjectActorSettingsReader),
+    ])
 
 
 class BackgroundPlaneReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.BackgroundPlane'
     reader_name = 'FezEngine.Readers.BackgroundPlaneReader'
 
-    def read(self):
-        position = self.stream.read_vector3()
-        rotation = self.stream.read_quaternion()
-        scale = self.stream.read_vector3()
-        size = self.stream.read_vector3()
-        texture_name = self.stream.read_string()
-        light_map = self.stream.read_boolean()
-        allow_overbrightness = self.stream.read_boolean()
-        filter_ = self.stream.read_color()
-        animated = self.stream.read_boolean()
-        doublesided = self.stream.read_boolean()
-        opacity = self.stream.read_single()
-        attached_group = self.stream.read_object(Int32Reader)
-        billboard = self.stream.read_boolean()
-        sync_with_samples = self.stream.read_boolean()
-        crosshatch = self.stream.read_boolean()
-        unknown = self.stream.read_boolean()
-        always_on_top = self.stream.read_boolean()
-        fullbright = self.stream.read_boolean()
-        pixelated_lightmap = self.stream.read_boolean()
-        x_texture_repeat = self.stream.read_boolean()
-        y_texture_repeat = self.stream.read_boolean()
-        clamp_texture = self.stream.read_boolean()
-        actor_type = self.stream.read_object(ActorTypeReader)
-        attached_plane = self.stream.read_object(Int32Reader)
-        parallax_factor = self.stream.read_single()
-        return BackgroundPlane(position, rotation, scale, size, texture_name, light_map, allow_overbrightness, filter_,
-                               animated, doublesided, opacity, attached_group, billboard, sync_with_samples, crosshatch,
-                               unknown, always_on_top, fullbright, pixelated_lightmap, x_texture_repeat,
-                               y_texture_repeat, clamp_texture, actor_type, attached_plane, parallax_factor)
+    read = compile_schema(BackgroundPlane, [
+        Field('position', 'vector3'),
+        Field('rotation', 'quaternion'),
+        Field('scale', 'vector3'),
+        Field('size', 'vector3'),
+        Field('texture_name', 'string'),
+        Field('light_map', 'boolean'),
+        Field('allow_overbrightness', 'boolean'),
+        Field('filter_', 'color'),
+        Field('animated', 'boolean'),
+        Field('doublesided', 'boolean'),
+        Field('opacity', 'single'),
+        Field('attached_group', 'object', Int32Reader),
+        Field('billboard', 'boolean'),
+        Field('sync_with_samples', 'boolean'),
+        Field('crosshatch', 'boolean'),
+        Field('unknown', 'boolean'),
+        Field('always_on_top', 'boolean'),
+        Field('fullbright', 'boolean'),
+        Field('pixelated_lightmap', 'boolean'),
+        Field('x_texture_repeat', 'boolean'),
+        Field('y_texture_repeat', 'boolean'),
+        Field('clamp_texture', 'boolean'),
+        Field('actor_type', 'object', ActorTypeReader),
+        Field('attached_plane', 'object', Int32Reader),
+        Field('parallax_factor', 'single'),
+    ])
 
 
 class TrileGroupReader(BaseTypeReader, TypeReaderPlugin):
@@ -323,10 +357,10 @@ class TrileFaceReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.TrileFace'
     reader_name = 'FezEngine.Readers.TrileFaceReader'
 
-    def read(self):
-        trile_id = self.stream.read_object(TrileEmplacementReader)
-        face = self.stream.read_object(FaceOrientationReader)
-        return TrileFace(trile_id, face)
+    read = compile_schema(TrileFace, [
+        Field('trile_id', 'object', TrileEmplacementReader),
+        Field('face', 'object', FaceOrientationReader),
+    ])
 
 
 class NpcInstanceReader(BaseTypeReader, TypeReaderPlugin):
@@ -367,30 +401,13 @@ class AmbienceTrackReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.AmbienceTrack'
     reader_name = 'FezEngine.Readers.AmbienceTrackReader'
 
-    def read(self):
-        name = self.stream.read_object(StringReader)
-        dawn = self.stream.read_boolean()
-        day = self.stream.read_boolean()
-        dusk = self.stream.read_boolean()
-        night = self.stream.read_boolean()
-        return AmbienceTrack(name, dawn, day, dusk, night)
-
-
-class VolumeActorSettingsReader(BaseTypeReader, TypeReaderPlugin):
-    target_type = 'FezEngine.Structure.VolumeActorSettings'
-    reader_name = 'FezEngine.Readers.VolumeActorSettingsReader'
-
-    def read(self):
-        faraway_plane_offset = self.stream.read_vector2()
-        is_point_of_interest = self.stream.read_boolean()
-        dot_dialogue = self.stream.read_object(ListReader, [DotDialogueLineReader])
-        water_locked = self.stream.read_boolean()
-        code_pattern = self.stream.read_object(ArrayReader, [CodeInputReader])
-        is_blackhole = self.stream.read_boolean()
-        needs_trigger = self.stream.read_boolean()
-        is_secret_passage = self.stream.read_boolean()
-        return VolumeActorSettings(faraway_plane_offset, is_point_of_interest, dot_dialogue, water_locked, code_pattern,
-                                   is_blackhole, needs_trigger, is_secret_passage)
+    read = compile_schema(AmbienceTrack, [
+        Field('name', 'object', StringReader),
+        Field('dawn', 'boolean'),
+        Field('day', 'boolean'),
+        Field('dusk', 'boolean'),
+        Field('night', 'boolean'),
+    ])
 
 
 class DotDialogueLineReader(BaseTypeReader, TypeReaderPlugin):
@@ -423,14 +440,24 @@ class ScriptReader(BaseTypeReader, TypeReaderPlugin):
                       level_wide_one_time, disabled, is_win_condition)
 
 
+class EntityReader(BaseTypeReader, TypeReaderPlugin):
+    target_type = 'FezEngine.Structure.Scripting.Entity'
+    reader_name = 'FezEngine.Readers.EntityReader'
+
+    def read(self):
+        entity_type = self.stream.read_string()
+        identifier = self.stream.read_object(Int32Reader)
+        return Entity(entity_type, identifier)
+
+
 class ScriptTriggerReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.Scripting.ScriptTrigger'
     reader_name = 'FezEngine.Readers.ScriptTriggerReader'
 
-    def read(self):
-        entity = self.stream.read_object(EntityReader)
-        event = self.stream.read_string()
-        return ScriptTrigger(entity, event)
+    read = compile_schema(ScriptTrigger, [
+        Field('entity', 'object', EntityReader),
+        Field('event', 'string'),
+    ])
 
 
 class ScriptActionReader(BaseTypeReader, TypeReaderPlugin):
@@ -458,16 +485,6 @@ class ScriptConditionReader(BaseTypeReader, TypeReaderPlugin):
         return ScriptCondition(entity, operator, property_, value)
 
 
-class EntityReader(BaseTypeReader, TypeReaderPlugin):
-    target_type = 'FezEngine.Structure.Scripting.Entity'
-    reader_name = 'FezEngine.Readers.EntityReader'
-
-    def read(self):
-        entity_type = self.stream.read_string()
-        identifier = self.stream.read_object(Int32Reader)
-        return Entity(entity_type, identifier)
-
-
 class InstanceActorSettingsReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.InstanceActorSettings'
     reader_name = 'FezEngine.Readers.InstanceActorSettingsReader'
@@ -483,32 +500,6 @@ class InstanceActorSettingsReader(BaseTypeReader, TypeReaderPlugin):
                                      sequence_alternate_sample_name, host_volume)
 
 
-class ArtObjectActorSettingsReader(BaseTypeReader, TypeReaderPlugin):
-    target_type = 'FezEngine.Structure.ArtObjectActorSettings'
-    reader_name = 'FezEngine.Readers.ArtObjectActorSettingsReader'
-
-    def read(self):
-        inactive = self.stream.read_boolean()
-        contained_trile = self.stream.read_object(ActorTypeReader)
-        attached_group = self.stream.read_object(Int32Reader)
-        spin_view = self.stream.read_object(ViewpointReader)
-        spin_every = self.stream.read_single()
-        spin_offset = self.stream.read_single()
-        off_center = self.stream.read_boolean()
-        rotation_center = self.stream.read_vector3()
-        vibration_pattern = self.stream.read_object(ArrayReader, [VibrationMotorReader])
-        code_pattern = self.stream.read_object(ArrayReader, [CodeInputReader])
-        segment = self.stream.read_object(PathSegmentReader)
-        next_node = self.stream.read_object(Int32Reader)
-        destination_level = self.stream.read_object(StringReader)
-        treasure_map_name = self.stream.read_object(StringReader)
-        invisible_sides = self.stream.read_object(ArrayReader, [FaceOrientationReader])
-        timeswitch_wind_back_speed = self.stream.read_single()
-        return ArtObjectActorSettings(inactive, contained_trile, attached_group, spin_view, spin_every, spin_offset,
-                                      off_center, rotation_center, vibration_pattern, code_pattern, segment, next_node,
-                                      destination_level, treasure_map_name, invisible_sides, timeswitch_wind_back_speed)
-
-
 class PathSegmentReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.PathSegment'
     reader_name = 'FezEngine.Readers.PathSegmentReader'
@@ -554,8 +545,8 @@ class CameraNodeDataReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.CameraNodeData'
     reader_name = 'FezEngine.Readers.CameraNodeDataReader'
 
-    def read(self):
-        perspective = self.stream.read_boolean()
-        pixels_per_trixel = self.stream.read_int32()
-        sound_name = self.stream.read_object(StringReader)
-        return CameraNodeData(perspective, pixels_per_trixel, sound_name)
+    read = compile_schema(CameraNodeData, [
+        Field('perspective', 'boolean'),
+        Field('pixels_per_trixel', 'int32'),
+        Field('sound_name', 'object', StringReader),
+    ])
@@ -5,6 +5,7 @@ FEZ music type readers
 from __future__ import print_function
 
 from xnb_parse.type_reader import TypeReaderPlugin, BaseTypeReader, EnumTypeReader
+from xnb_parse.reader_schema import Field, compile_schema
 from xnb_parse.type_readers.xna_primitive import Int32Reader
 from xnb_parse.type_readers.xna_system import ListReader, ArrayReader
 from xnb_parse.xna_types.fez.fez_music import ShardNotes, AssembleChords, TrackedSong, Loop
@@ -30,23 +31,22 @@ class LoopReader(BaseTypeReader, TypeReaderPlugin):
     target_type = 'FezEngine.Structure.Loop'
     reader_name = 'FezEngine.Readers.LoopReader'
 
-    def read(self):
-        duration = self.stream.read_int32()
-        loop_times_from = self.stream.read_int32()
-        loop_times_to = self.stream.read_int32()
-        name = self.stream.read_string()
-        trigger_from = self.stream.read_int32()
-        trigger_to = self.stream.read_int32()
-        delay = self.stream.read_int32()
-        night = self.stream.read_boolean()
-        day = self.stream.read_boolean()
-        dusk = self.stream.read_boolean()
-        dawn = self.stream.read_boolean()
-        fractional_time = self.stream.read_boolean()
-        one_at_a_time = self.stream.read_boolean()
-        cut_off_tail = self.stream.read_boolean()
-        return Loop(duration, loop_times_from, loop_times_to, name, trigger_from, trigger_to, delay, night, day, dusk,
-                    dawn, fractional_time, one_at_a_time, cut_off_tail)
+    read = compile_schema(Loop, [
+        Field('duration', 'int32'),
+        Field('loop_times_from', 'int32'),
+        Field('loop_times_to', 'int32'),
+        Field('name', 'string'),
+        Field('trigger_from', 'int32'),
+        Field('trigger_to', 'int32'),
+        Field('delay', 'int32'),
+        Field('night', 'boolean'),
+        Field('day', 'boolean'),
+        Field('dusk', 'boolean'),
+        Field('dawn', 'boolean'),
+        Field('fractional_time', 'boolean'),
+        Field('one_at_a_time', 'boolean'),
+        Field('cut_off_tail', 'boolean'),
+    ])
 
 
 class ShardNotesReader(EnumTypeReader, TypeReaderPlugin):
@@ -17,7 +17,7 @@ class SoundEffectReader(BaseTypeReader, TypeReaderPlugin):
         format_size = self.stream.read_int32()
         wave_format = self.stream.read(format_size)
         data_size = self.stream.read_int32()
-        wave_data = self.stream.read(data_size)
+        wave_data = self.stream.read_blob(data_size)
         loop_start = self.stream.read_int32()
         loop_length = self.stream.read_int32()
         duration = self.stream.read_int32()
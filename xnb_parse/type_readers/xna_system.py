@@ -5,7 +5,7 @@ system type readers
 from __future__ import print_function
 
 from xnb_parse.type_reader import (TypeReaderPlugin, ValueTypeReader, GenericTypeReader, GenericValueTypeReader,
-                                   ReaderError)
+                                   ReaderError, ReadObject)
 from xnb_parse.xna_types.xna_system import XNAList, XNADict
 
 
@@ -34,10 +34,22 @@ class NullableReader(GenericValueTypeReader, TypeReaderPlugin):
             return None
 
 
+def _reads_nested(reader):
+    """
+    collections only need to be iterative when their elements can nest further objects, flat lists of strings and
+    the like are quicker read directly
+    """
+    return not reader.is_value_type and (reader.is_iterative or reader.is_generic_type)
+
+
 class ArrayReader(GenericTypeReader, TypeReaderPlugin):
     generic_target_type = 'System.Array`1'
     generic_reader_name = 'Microsoft.Xna.Framework.Content.ArrayReader`1'
 
+    def init_reader(self, file_platform=None, file_version=None):
+        GenericTypeReader.init_reader(self, file_platform, file_version)
+        self.is_iterative = _reads_nested(self.readers[0])
+
     def read(self):
         elements = self.stream.read_int32()
         if self.readers[0].is_value_type:
@@ -45,11 +57,26 @@ class ArrayReader(GenericTypeReader, TypeReaderPlugin):
         else:
             return XNAList([self.stream.read_object(self.readers[0]) for _ in range(elements)])
 
+    def read_iter(self):
+        if not self.is_iterative:
+            yield self.read()
+            return
+        elements = self.stream.read_int32()
+        request = ReadObject(self.readers[0])
+        values = XNAList()
+        for _ in range(elements):
+            values.append((yield request))
+        yield values
+
 
 class ListReader(GenericTypeReader, TypeReaderPlugin):
     generic_target_type = 'System.Collections.Generic.List`1'
     generic_reader_name = 'Microsoft.Xna.Framework.Content.ListReader`1'
 
+    def init_reader(self, file_platform=None, file_version=None):
+        GenericTypeReader.init_reader(self, file_platform, file_version)
+        self.is_iterative = _reads_nested(self.readers[0])
+
     def read(self):
         elements = self.stream.read_int32()
         if self.readers[0].is_value_type:
@@ -57,11 +84,26 @@ class ListReader(GenericTypeReader, TypeReaderPlugin):
         else:
             return XNAList([self.stream.read_object(self.readers[0]) for _ in range(elements)])
 
+    def read_iter(self):
+        if not self.is_iterative:
+            yield self.read()
+            return
+        elements = self.stream.read_int32()
+        request = ReadObject(self.readers[0])
+        values = XNAList()
+        for _ in range(elements):
+            values.append((yield request))
+        yield values
+
 
 class DictionaryReader(GenericTypeReader, TypeReaderPlugin):
     generic_target_type = 'System.Collections.Generic.Dictionary`2'
     generic_reader_name = 'Microsoft.Xna.Framework.Content.DictionaryReader`2'
 
+    def init_reader(self, file_platform=None, file_version=None):
+        GenericTypeReader.init_reader(self, file_platform, file_version)
+        self.is_iterative = _reads_nested(self.readers[0]) or _reads_nested(self.readers[1])
+
     def read(self):
         elements = self.stream.read_int32()
         if self.readers[0].is_value_type:
@@ -79,6 +121,24 @@ class DictionaryReader(GenericTypeReader, TypeReaderPlugin):
                 return XNADict([(self.stream.read_object(self.readers[0]), self.stream.read_object(self.readers[1]))
                                 for _ in range(elements)])
 
+    def read_iter(self):
+        if not self.is_iterative:
+            yield self.read()
+            return
+        key_reader, value_reader = self.readers
+        elements = self.stream.read_int32()
+        values = XNADict()
+        for _ in range(elements):
+            if key_reader.is_value_type:
+                key = key_reader.read()
+            else:
+                key = yield ReadObject(key_reader)
+            if value_reader.is_value_type:
+                values[key] = value_reader.read()
+            else:
+                values[key] = yield ReadObject(value_reader)
+        yield values
+
 
 class TimeSpanReader(ValueTypeReader, TypeReaderPlugin):
     target_type = 'System.TimeSpan'
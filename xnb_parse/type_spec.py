@@ -5,7 +5,8 @@
 from __future__ import print_function
 
 import re
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
+from threading import Lock
 
 
 class Error(Exception):
@@ -16,11 +17,13 @@ class TypeSpecError(Error):
     pass
 
 
+_SPACE_RE = re.compile(r'\s*')
+# a single name part, everything up to the next unescaped special character
+_NAME_PART_RE = re.compile(r'(?:[^\\+,&*\[\]]|\\.)*', re.DOTALL)
+
+
 def _skip_space(name, start_pos):
-    cur_pos = start_pos
-    while cur_pos < len(name) and name[cur_pos].isspace():
-        cur_pos += 1
-    return cur_pos
+    return _SPACE_RE.match(name, start_pos).end()
 
 
 _ESCAPE_RE = re.compile(r'([,+&*\[\]\\])')
@@ -37,7 +40,38 @@ def _name_unescape(name):
 
 ArraySpec = namedtuple('ArraySpec', ['dimensions', 'bound'])
 
-_CACHED_TYPES = {}
+
+class _LRUCache(object):
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                return None
+            self._data[key] = value
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_CACHE_SIZE = 1024
+_CACHED_TYPES = _LRUCache(_CACHE_SIZE)
 
 
 class TypeSpec(object):
@@ -50,16 +84,14 @@ class TypeSpec(object):
         self.array_spec = None
         self.pointer_level = 0
         self.is_byref = False
+        # filled in once parsing of this spec is complete
+        self.full_name = None
+        self.suffix = None
 
     def __str__(self):
         return self.full_name
 
-    @property
-    def full_name(self):
-        return self.name + self.suffix
-
-    @property
-    def suffix(self):
+    def _build_names(self):
         name = ''
         if self.nested:
             name += '+' + '+'.join(self.nested)
@@ -76,7 +108,8 @@ class TypeSpec(object):
             name += '*' * self.pointer_level
         if self.is_byref:
             name += '&'
-        return name
+        self.suffix = name
+        self.full_name = self.name + name
 
     @property
     def is_generic(self):
@@ -90,12 +123,17 @@ class TypeSpec(object):
     def parse(type_name):
         if not type_name:
             raise TypeSpecError("type_name empty")
-        if type_name in _CACHED_TYPES:
-            return _CACHED_TYPES[type_name]
-        res, pos = TypeSpec._parse(type_name)
+        res = _CACHED_TYPES.get(type_name)
+        if res is not None:
+            return res
+        try:
+            res, pos = TypeSpec._parse(type_name)
+        except TypeSpecError as ex:
+            raise TypeSpecError("{}: '{}'".format(ex, type_name))
         if pos < len(type_name):
-            raise TypeSpecError("Could not parse the whole type name: {} < {}".format(pos, len(type_name)))
-        _CACHED_TYPES[type_name] = res
+            raise TypeSpecError("Could not parse the whole type name: {} < {}: '{}'".format(pos, len(type_name),
+                                                                                           type_name))
+        _CACHED_TYPES.put(type_name, res)
         return res
 
     def add_name(self, type_name):
@@ -113,117 +151,117 @@ class TypeSpec(object):
 
     @staticmethod
     def _parse(name, pos=0, is_recurse=False, allow_aqn=False):
-        in_modifiers = False
+        data, pos = TypeSpec._parse_spec(name, pos, is_recurse, allow_aqn)
+        data._build_names()
+        return data, pos
+
+    @staticmethod
+    def _parse_spec(name, pos, is_recurse, allow_aqn):
+        name_len = len(name)
         data = TypeSpec(name)
         pos = _skip_space(name, pos)
-        name_start = pos
-        while pos < len(name):
-            if name[pos] == '\\':
-                # skip escaped char
-                pos += 1
-                if pos >= len(name):
-                    raise TypeSpecError("Fell off end of name after backslash")
-            elif name[pos] == '+':
-                data.add_name(name[name_start:pos])
-                name_start = pos + 1
-            elif name[pos] == ',' or name[pos] == ']':
-                data.add_name(name[name_start:pos])
-                name_start = pos + 1
-                in_modifiers = True
-                if is_recurse and not allow_aqn:
-                    return data, pos
-            elif name[pos] == '&' or name[pos] == '*' or name[pos] == '[':
-                if name[pos] != '[' and is_recurse:
-                    raise TypeSpecError("Generic argument can't be byref or pointer type")
-                data.add_name(name[name_start:pos])
-                name_start = pos + 1
-                in_modifiers = True
-            if in_modifiers:
+
+        # name parts separated by '+'
+        while True:
+            part_end = _NAME_PART_RE.match(name, pos).end()
+            if part_end >= name_len:
+                if pos < part_end:
+                    data.add_name(name[pos:part_end])
+                elif data.name is None:
+                    raise TypeSpecError("Missing name at {}".format(pos))
+                return data, part_end
+            if part_end == pos:
+                raise TypeSpecError("Missing name at {}".format(pos))
+            if name[part_end] == '\\':
+                raise TypeSpecError("Fell off end of name after backslash")
+            data.add_name(name[pos:part_end])
+            pos = part_end
+            if name[pos] != '+':
                 break
             pos += 1
-        if name_start < pos:
-            data.add_name(name[name_start:pos])
-        if in_modifiers:
-            while pos < len(name):
-                if name[pos] == '&':
-                    if data.is_byref:
-                        raise TypeSpecError("Can't have a byref of a byref")
-                    data.is_byref = True
-                elif name[pos] == '*':
-                    if data.is_byref:
-                        raise TypeSpecError("Can't have a pointer to a byref type")
-                    data.pointer_level += 1
-                elif name[pos] == ',':
-                    if is_recurse:
-                        end = pos
-                        while end < len(name) and name[end] != ']':
-                            end += 1
-                        if end >= len(name):
-                            raise TypeSpecError("Unmatched ']' while parsing generic argument assembly name")
-                        data.assembly_name = name[pos + 1:end].strip()
-                        pos = end + 1
-                        return data, pos
-                    data.assembly_name = name[pos + 1:].strip()
-                    pos = len(name)
-                    break
-                elif name[pos] == '[':
-                    if data.is_byref:
-                        raise TypeSpecError("Byref qualifier must be the last one of a type")
-                    pos += 1
-                    if pos >= len(name):
-                        raise TypeSpecError("Invalid array/generic spec")
-                    pos = _skip_space(name, pos)
-                    if name[pos] != ',' and name[pos] != '*' and name[pos] != ']':
-                        # generic args
-                        if data.is_array:
-                            raise TypeSpecError("generic args after array spec")
-                        args = []
-                        while pos < len(name):
-                            pos = _skip_space(name, pos)
-                            aqn = name[pos] == '['
-                            if aqn:
-                                pos += 1
-                            new_type, pos = TypeSpec._parse(name, pos, True, aqn)
-                            args.append(new_type)
-                            if pos >= len(name):
-                                raise TypeSpecError("Invalid generic arguments spec")
-                            if name[pos] == ']':
-                                break
-                            if name[pos] == ',':
-                                pos += 1
-                            else:
-                                raise TypeSpecError("Invalid generic arguments separator: '{}'".format(name[pos]))
-                        if pos >= len(name) or name[pos] != ']':
-                            raise TypeSpecError("Error parsing generic params spec")
-                        data.generic_params = args
-                    else:
-                        # array spec
-                        dimensions = 1
-                        bound = False
-                        while pos < len(name) and name[pos] != ']':
-                            if name[pos] == '*':
-                                if bound:
-                                    raise TypeSpecError("Array spec cannot have 2 bound dimensions")
-                                bound = True
-                            elif name[pos] != ',':
-                                raise TypeSpecError("Invalid character in array spec: '{}'".format(name[pos]))
-                            else:
-                                dimensions += 1
+
+        if is_recurse:
+            if name[pos] == ',' or name[pos] == ']':
+                if not allow_aqn:
+                    return data, pos
+            elif name[pos] != '[':
+                raise TypeSpecError("Generic argument can't be byref or pointer type")
+
+        # modifiers and assembly name
+        while pos < name_len:
+            cur_char = name[pos]
+            if cur_char == '&':
+                if data.is_byref:
+                    raise TypeSpecError("Can't have a byref of a byref")
+                data.is_byref = True
+            elif cur_char == '*':
+                if data.is_byref:
+                    raise TypeSpecError("Can't have a pointer to a byref type")
+                data.pointer_level += 1
+            elif cur_char == ',':
+                if is_recurse:
+                    end = name.find(']', pos)
+                    if end < 0:
+                        raise TypeSpecError("Unmatched ']' while parsing generic argument assembly name")
+                    data.assembly_name = name[pos + 1:end].strip()
+                    return data, end + 1
+                data.assembly_name = name[pos + 1:].strip()
+                return data, name_len
+            elif cur_char == '[':
+                if data.is_byref:
+                    raise TypeSpecError("Byref qualifier must be the last one of a type")
+                pos = _skip_space(name, pos + 1)
+                if pos >= name_len:
+                    raise TypeSpecError("Invalid array/generic spec")
+                if name[pos] != ',' and name[pos] != '*' and name[pos] != ']':
+                    # generic args
+                    if data.is_array:
+                        raise TypeSpecError("generic args after array spec")
+                    args = []
+                    while pos < name_len:
+                        pos = _skip_space(name, pos)
+                        if pos >= name_len:
+                            break
+                        aqn = name[pos] == '['
+                        if aqn:
                             pos += 1
-                            pos = _skip_space(name, pos)
-                        if name[pos] != ']':
-                            raise TypeSpecError("Error parsing array spec")
-                        if dimensions > 1 and bound:
-                            raise TypeSpecError("Invalid array spec, multi-dimensional array cannot be bound")
-                        data.add_array(dimensions, bound)
-                elif name[pos] == ']':
-                    if is_recurse:
-                        pos += 1
-                        return data, pos
-                    raise TypeSpecError("Unmatched ]")
+                        new_type, pos = TypeSpec._parse(name, pos, True, aqn)
+                        args.append(new_type)
+                        if pos >= name_len:
+                            raise TypeSpecError("Invalid generic arguments spec")
+                        if name[pos] == ']':
+                            break
+                        if name[pos] == ',':
+                            pos += 1
+                        else:
+                            raise TypeSpecError("Invalid generic arguments separator: '{}'".format(name[pos]))
+                    if pos >= name_len or name[pos] != ']':
+                        raise TypeSpecError("Error parsing generic params spec")
+                    data.generic_params = args
                 else:
-                    raise TypeSpecError("Bad type def, can't handle '{}' at {}".format(name[pos], pos))
-                pos += 1
-        if pos > len(name):
-            raise TypeSpecError("Fell off end of name")
+                    # array spec
+                    dimensions = 1
+                    bound = False
+                    while pos < name_len and name[pos] != ']':
+                        if name[pos] == '*':
+                            if bound:
+                                raise TypeSpecError("Array spec cannot have 2 bound dimensions")
+                            bound = True
+                        elif name[pos] != ',':
+                            raise TypeSpecError("Invalid character in array spec: '{}'".format(name[pos]))
+                        else:
+                            dimensions += 1
+                        pos = _skip_space(name, pos + 1)
+                    if pos >= name_len:
+                        raise TypeSpecError("Error parsing array spec")
+                    if dimensions > 1 and bound:
+                        raise TypeSpecError("Invalid array spec, multi-dimensional array cannot be bound")
+                    data.add_array(dimensions, bound)
+            elif cur_char == ']':
+                if is_recurse:
+                    return data, pos + 1
+                raise TypeSpecError("Unmatched ]")
+            else:
+                raise TypeSpecError("Bad type def, can't handle '{}' at {}".format(cur_char, pos))
+            pos += 1
         return data, pos
@@ -0,0 +1,128 @@
+"""
+index of the wave bank entries played by each XSB cue
+"""
+
+from __future__ import print_function
+
+import json
+import os
+import tempfile
+
+from xnb_parse.dedup import replace_file
+from xnb_parse.export_manifest import code_version, file_stat
+
+
+CUE_INDEX_SUFFIX = '.cues.json'
+_CUE_INDEX_VERSION = 1
+
+
+class CueIndex(object):
+    """
+    cues as a list of (cue name, waves), each wave a (wave bank name, entry index, entry name) tuple.
+    entry names are only known for the wave bank the index was built with, they are None for other banks
+    """
+
+    def __init__(self, cues):
+        self.cues = cues
+
+    @classmethod
+    def build(cls, xsb, xwb=None):
+        cues = []
+        for i in range(xsb.cue_count):
+            waves = []
+            for (wave_bank, track) in xsb.cue_waves(i):
+                entry_name = None
+                if xwb is not None and wave_bank == xwb.bank_name and 0 <= track < len(xwb.entries):
+                    entry_name = xwb.entries[track].name
+                waves.append((wave_bank, track, entry_name))
+            cues.append((xsb.cue_name(i), waves))
+        return cls(cues)
+
+    def cue_waves(self, name):
+        """
+        waves played by the first cue called name, raises KeyError if there is none
+        """
+        for (cue_name, waves) in self.cues:
+            if cue_name == name:
+                return waves
+        raise KeyError(name)
+
+    def export_names(self, wave_bank, entry_count=None):
+        """
+        entry index -> cue based file name for the entries of wave_bank played by a named cue.
+        an entry played by several cues is named after the first, a cue playing several entries numbers the rest
+        """
+        names = {}
+        used = set()
+        for (cue_name, waves) in self.cues:
+            if not cue_name:
+                continue
+            count = 0
+            for (bank_name, index, _) in waves:
+                if bank_name != wave_bank or index in names:
+                    continue
+                if entry_count is not None and not 0 <= index < entry_count:
+                    continue
+                name = cue_name if not count else '{}_{}'.format(cue_name, count)
+                count += 1
+                if name in used:
+                    continue
+                used.add(name)
+                names[index] = name
+        return names
+
+    def report(self):
+        return '{} cues, {} waves'.format(len(self.cues), sum(len(waves) for (_, waves) in self.cues))
+
+    def save(self, filename, sources):
+        dirname = os.path.dirname(os.path.abspath(filename))
+        temp_handle, temp_filename = tempfile.mkstemp(suffix='.tmp', prefix=os.path.basename(filename), dir=dirname)
+        try:
+            with os.fdopen(temp_handle, 'w') as out_file:
+                json.dump({'cue_index_version': _CUE_INDEX_VERSION, 'code_version': code_version(),
+                           'sources': _source_stats(sources), 'cues': self.cues}, out_file, indent=1)
+            replace_file(temp_filename, filename)
+        except (IOError, OSError):
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+            raise
+
+    @classmethod
+    def load(cls, filename, sources):
+        """
+        index saved in filename, or None if it is missing or any of the sources or the code has changed since
+        """
+        try:
+            with open(filename, 'r') as in_file:
+                saved = json.load(in_file)
+        except (IOError, OSError, ValueError):
+            return None
+        if (saved.get('cue_index_version') != _CUE_INDEX_VERSION or saved.get('code_version') != code_version() or
+                saved.get('sources') != _source_stats(sources)):
+            return None
+        return cls([(cue_name, [tuple(wave) for wave in waves]) for (cue_name, waves) in saved['cues']])
+
+
+def _source_stats(sources):
+    return [list(file_stat(source)) for source in sources]
+
+
+def cue_index_filename(xsb_filename):
+    return xsb_filename + CUE_INDEX_SUFFIX
+
+
+def load_cue_index(xsb, xsb_filename, xwb=None, xwb_filename=None):
+    """
+    cue index cached next to the sound bank, built and saved if it is missing or stale
+    """
+    sources = [source for source in (xsb_filename, xwb_filename) if source is not None]
+    filename = cue_index_filename(xsb_filename)
+    cue_index = CueIndex.load(filename, sources)
+    if cue_index is None:
+        cue_index = CueIndex.build(xsb, xwb)
+        try:
+            cue_index.save(filename, sources)
+        except (IOError, OSError):
+            # read only source directory, the index is rebuilt next time
+            pass
+    return cue_index
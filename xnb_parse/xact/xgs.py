@@ -37,3 +37,4 @@ class XGS(object):
         if not os.path.isdir(out_dir):
             os.makedirs(out_dir)
         # TODO: actually export something
+        return []
@@ -6,6 +6,8 @@ from __future__ import print_function
 
 import os
 from collections import OrderedDict
+from struct import calcsize
+from threading import Lock
 
 from xnb_parse.type_reader import ReaderError
 from xnb_parse.xact.xwb import filetime_to_datetime
@@ -40,6 +42,9 @@ _SB_LIMIT = 'B H H B'
 _SB_SOUND = 'B H B h B H'
 _SB_CLIP = 'B i HH'
 _SB_EVENT = 'I H B'
+_SB_EVENT_PLAY_WAVE = 'B H B B H H'
+_SB_SIMPLE_CUE_SIZE = calcsize('<B i')
+_SB_COMPLEX_CUE_SIZE = calcsize('<B i i') + calcsize('<' + _SB_LIMIT)
 
 
 class XSB(object):
@@ -73,7 +78,6 @@ class XSB(object):
         h_variation_offset = fix_offset(variation_offset_raw)
         h_transition_offset = fix_offset(transition_offset_raw)
         h_wave_bank_offset = fix_offset(wave_bank_offset_raw)
-        h_cue_name_hash_offset = fix_offset(cue_name_hash_offset_raw)
         h_cue_name_table_offset = fix_offset(cue_name_table_offset_raw)
         h_sound_offset = fix_offset(sound_offset_raw)
         self.name = h_name_raw.rstrip(b'\x00').decode('iso8859-1')
@@ -87,48 +91,110 @@ class XSB(object):
         else:
             raise ReaderError("No wave banks found in sound bank")
 
-        cue_name_hash = []
-        if h_cue_name_hash_count and h_cue_name_hash_offset:
-            stream.seek(h_cue_name_hash_offset)
-            cue_name_hash = [stream.read_int16() for _ in range(h_cue_name_hash_count)]
-        cue_name_hash_entry = []
+        # the name table is in cue order, each entry has the offset of the name and the next entry in its name hash
+        # bucket. Cues are fixed size records so any cue can be parsed on its own when first asked for
+        self._cue_name_hash_entry = []
         if h_cue_names_length and h_cue_name_table_offset:
             stream.seek(h_cue_name_table_offset)
-            cue_name_hash_entry = [(stream.read_int32(), stream.read_int16())
-                                   for _ in range(h_simple_cue_count + h_complex_cue_count)]
-        cue_names = []
-        for (name_offset, _) in cue_name_hash_entry:
-            stream.seek(name_offset)
-            cue_names.append(stream.read_cstring())
-
-        self.cues = []
-        self.cues_name = OrderedDict()
+            self._cue_name_hash_entry = [(stream.read_int32(), stream.read_int16())
+                                         for _ in range(h_simple_cue_count + h_complex_cue_count)]
+
+        self._cue_tables = []
         if h_simple_cue_count and h_simple_cue_offset:
-            stream.seek(h_simple_cue_offset)
-            for i in range(h_simple_cue_count):
-                cue_name = None
-                if cue_names:
-                    cue_name = cue_names[i]
-                cue = Cue(cue_name, stream)
-                self.cues.append(cue)
-                if cue_name:
-                    self.cues_name[cue_name] = cue
+            self._cue_tables.append((h_simple_cue_offset, h_simple_cue_count, _SB_SIMPLE_CUE_SIZE, False))
         if h_complex_cue_count and h_complex_cue_offset:
-            stream.seek(h_complex_cue_offset)
-            for i in range(h_complex_cue_count):
-                cue_name = None
-                if cue_names:
-                    cue_name = cue_names[h_simple_cue_count + i]
-                cue = Cue(cue_name, stream, is_complex=True)
-                self.cues.append(cue)
-                if cue_name:
-                    self.cues_name[cue_name] = cue
+            self._cue_tables.append((h_complex_cue_offset, h_complex_cue_count, _SB_COMPLEX_CUE_SIZE, True))
+        self.cue_count = sum(count for (_, count, _, _) in self._cue_tables)
+        self._stream = stream
+        self._lock = Lock()
+        self._cue_cache = {}
+        self._cue_name_cache = {}
+        self._cue_index = None
+
+    @property
+    def cues(self):
+        """
+        every cue, parsing any not parsed yet
+        """
+        return [self.cue(i) for i in range(self.cue_count)]
+
+    @property
+    def cues_name(self):
+        cues_name = OrderedDict()
+        for i in range(self.cue_count):
+            cue = self.cue(i)
+            if cue.name:
+                cues_name[cue.name] = cue
+        return cues_name
+
+    def cue(self, index):
+        """
+        cue by index, simple cues first then complex cues, parsed with its sound graph on first use
+        """
+        cue = self._cue_cache.get(index)
+        if cue is not None:
+            return cue
+        table_index = index
+        for (table_offset, count, size, is_complex) in self._cue_tables:
+            if 0 <= table_index < count:
+                break
+            table_index -= count
+        else:
+            raise IndexError("cue index out of range: {}".format(index))
+        cue_name = self.cue_name(index)
+        with self._lock:
+            cue = self._cue_cache.get(index)
+            if cue is None:
+                self._stream.seek(table_offset + table_index * size)
+                cue = Cue(cue_name, self._stream, is_complex=is_complex)
+                self._cue_cache[index] = cue
+        return cue
+
+    def cue_name(self, index):
+        """
+        name of cue by index, or None if the bank has no cue names
+        """
+        if not self._cue_name_hash_entry:
+            return None
+        name = self._cue_name_cache.get(index)
+        if name is None:
+            with self._lock:
+                self._stream.seek(self._cue_name_hash_entry[index][0])
+                name = self._stream.read_cstring()
+            self._cue_name_cache[index] = name
+        return name
+
+    def cue_index(self, name):
+        """
+        index of the cue called name, raises KeyError if there is none. The first lookup reads every name
+        """
+        if self._cue_index is None:
+            cue_index = {}
+            for i in range(len(self._cue_name_hash_entry)):
+                cue_index.setdefault(self.cue_name(i), i)
+            self._cue_index = cue_index
+        return self._cue_index[name]
+
+    def get_cue(self, name):
+        return self.cue(self.cue_index(name))
+
+    def cue_waves(self, index):
+        """
+        (wave bank name, track) for each wave played by cue index
+        """
+        waves = []
+        for (wave_bank, track) in self.cue(index).waves():
+            if not 0 <= wave_bank < len(self.wave_banks):
+                raise ReaderError("Invalid wave bank index in cue {}: {}".format(index, wave_bank))
+            waves.append((self.wave_banks[wave_bank], track))
+        return waves
 
     def export(self, out_dir):
         if self.name:
             out_dir = os.path.join(out_dir, self.name)
         if not os.path.isdir(out_dir):
             os.makedirs(out_dir)
+        return []
 
 
 class Cue(object):
@@ -167,6 +233,7 @@ class Cue(object):
                 unknown_offset = fix_offset(stream.read_int32())
                 raise ReaderError("SB_CUE_FLAGS_SOUND not set for simple cue")
         next_cue_offset = stream.tell()
+        self.sound = None
         if sound_offset:
             stream.seek(sound_offset)
             self.sound = Sound(stream)
@@ -180,6 +247,14 @@ class Cue(object):
     def has_sound(self):
         return bool(self.flags & SB_CUE_FLAGS_SOUND)
 
+    def waves(self):
+        """
+        (wave bank index, track) for each wave played, cues using variation tables are not handled yet
+        """
+        if self.sound is None:
+            return []
+        return self.sound.waves()
+
     @property
     def has_transition(self):
         return bool(self.flags & SB_CUE_FLAGS_TRANSITION)
@@ -213,6 +288,19 @@ class Sound(object):
         if stream.tell() > entry_len + start_pos:
             raise ReaderError("SB_SOUND length mismatch")
 
+    def waves(self):
+        """
+        (wave bank index, track) for each wave played, in clip and event order
+        """
+        if not self.is_complex:
+            return [(self.wavebank, self.track)]
+        waves = []
+        for clip in self.clips:
+            for clip_event in clip.events:
+                if clip_event.event.has_sound:
+                    waves.append((clip_event.event.wavebank, clip_event.event.track))
+        return waves
+
     @property
     def is_complex(self):
         return bool(self.flags & SB_CUE_FLAGS_COMPLEX)
@@ -252,10 +340,14 @@ class Event(object):
 
 
 class Event1(Event):
+    """
+    play wave
+    """
     has_sound = True
 
     def __init__(self, stream):
-        pass
+        (self.flags, self.track, self.wavebank, self.loop_count, self.position,
+         self.angle) = stream.unpack(_SB_EVENT_PLAY_WAVE)
 
 
 _EVENTS = {
@@ -4,15 +4,20 @@ parse XWB files
 
 from __future__ import print_function
 
-import os
 import datetime
+import mmap
+import os
 from collections import namedtuple
-from struct import Struct
+from multiprocessing.pool import ThreadPool
+from numbers import Integral
+from struct import Struct, calcsize
 
+from xnb_parse.file_formats.adpcm import ADPCM_COEF, samples_per_block
 from xnb_parse.file_formats.wav import (PyWavWriter, WAVE_FORMAT_WMAUDIO2, WAVE_FORMAT_WMAUDIO3, WAVE_FORMAT_PCM,
-                                        WAVE_FORMAT_ADPCM, WAVE_FORMAT_XMA2)
+                                        WAVE_FORMAT_ADPCM, WAVE_FORMAT_XMA2, swap_samples16)
 from xnb_parse.type_reader import ReaderError
-from xnb_parse.binstream import BinaryStream
+from xnb_parse.binstream import BinaryStream, Blob, FileRegion, DEFAULT_WINDOW
+from xnb_parse.pipeline_metrics import asset
 
 
 WB_L_SIGNATURE = b'WBND'
@@ -69,20 +74,10 @@ WMA_BLOCK_ALIGN = [
     1280
 ]
 ADPCM_BLOCK_ALIGN_OFFSET = 22
-ADPCM_COEF = [
-    (256, 0),
-    (512, -256),
-    (0, 0),
-    (192, 64),
-    (240, 0),
-    (460, -208),
-    (392, -232)
-]
 
 XWBRegion = namedtuple('XWBRegion', ['offset', 'length'])
 XWBEntry = namedtuple('XWBEntry', ['flags_duration', 'format', 'play_offset', 'play_length', 'loop_start',
                                    'loop_total'])
-Entry = namedtuple('Entry', ['name', 'header', 'data', 'dpds', 'seek'])
 
 
 _FILETIME_NULL = datetime.datetime(1601, 1, 1, 0, 0, 0)
@@ -98,22 +93,56 @@ _WB_REGION = 'II'
 _WB_DATA = 'I I 64s I I I I II'
 _WB_ENTRY = 'I I II II'
 _REGIONS = ['BANKDATA', 'ENTRYMETADATA', 'SEEKTABLES', 'ENTRYNAMES', 'ENTRYWAVEDATA']
+_WB_HEADER_SIZE = calcsize('<' + _WB_HEADER) + calcsize('<' + _WB_REGION) * len(_REGIONS)
 _WAVEFORMATEX = Struct('<H H I I H H H')
 _ADPCM_WAVEFORMAT = Struct('<H H')
 _ADPCM_WAVEFORMAT_COEF = Struct('<h h')
 _XMA_WAVEFORMAT = Struct('<H I I I I I I I B B H')
 
 
+class Entry(object):
+    """
+    wave bank entry, the wave data stays in the bank until asked for
+    """
+    __slots__ = ('name', 'header', 'blob', 'dpds', 'seek', 'needs_swap')
+
+    def __init__(self, name, header, blob, dpds=None, seek=None, needs_swap=False):
+        self.name = name
+        self.header = header
+        self.blob = blob
+        self.dpds = dpds
+        self.seek = seek
+        self.needs_swap = needs_swap
+
+    def __len__(self):
+        return len(self.blob)
+
+    @property
+    def data(self):
+        entry_data = self.blob.data
+        # manually swap PCM data if needed
+        if self.needs_swap:
+            entry_data = bytearray(swap_samples16(entry_data))
+        return entry_data
+
+
 class XWB(object):
-    def __init__(self, data=None, filename=None, audio_engine=None):
+    def __init__(self, data=None, filename=None, audio_engine=None, streaming_window=DEFAULT_WINDOW):
         self.audio_engine = audio_engine
+        self.filename = filename
+        # most wave data an export thread holds at once for streaming banks read from a file
+        self.streaming_window = streaming_window
 
-        # open in little endian initially
-        stream = BinaryStream(data=data, filename=filename)
+        # map the bank and only read the metadata regions, wave data is read when an entry is used
+        self._mapping = None
+        if filename is not None:
+            with open(filename, 'rb') as file_handle:
+                data = self._mapping = mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+        source = data
         del data
 
         # check sig to find actual endianess
-        h_sig = stream.peek(len(WB_L_SIGNATURE))
+        h_sig = source[:len(WB_L_SIGNATURE)]
         if h_sig == WB_L_SIGNATURE:
             big_endian = False
         elif h_sig == WB_B_SIGNATURE:
@@ -121,8 +150,10 @@ class XWB(object):
         else:
             raise ValueError("bad sig: {!r}".format(h_sig))
 
-        # switch stream to correct endianess
-        stream.set_endian(big_endian)
+        def region_stream(region):
+            return BinaryStream(data=source[region.offset:region.offset + region.length], big_endian=big_endian)
+
+        stream = BinaryStream(data=source[:_WB_HEADER_SIZE], big_endian=big_endian)
         (h_sig, self.h_version, self.h_header_version) = stream.unpack(_WB_HEADER)
         regions = {k: XWBRegion._make(stream.unpack(_WB_REGION)) for k in _REGIONS}
 
@@ -130,7 +161,7 @@ class XWB(object):
         bankdata_size = stream.calc_size(_WB_DATA)
         if regions['BANKDATA'].length != bankdata_size:
             raise ReaderError("Invalid BANKDATA size: {} != {}".format(regions['BANKDATA'].length, bankdata_size))
-        stream.seek(regions['BANKDATA'].offset)
+        stream = region_stream(regions['BANKDATA'])
         (self.flags, h_entry_count, h_bank_name_raw, h_entry_metadata_element_size, h_entry_name_element_size,
          self.alignment, h_compact_format, buildtime_raw_low, buildtime_raw_high) = stream.unpack(_WB_DATA)
         self.bank_name = h_bank_name_raw.rstrip(b'\x00').decode('iso8859-1')
@@ -150,7 +181,7 @@ class XWB(object):
         if regions['ENTRYMETADATA'].length != bankentry_size * h_entry_count:
             raise ReaderError("Invalid ENTRYMETADATA size: {} != {}".format(regions['ENTRYMETADATA'].length,
                                                                             bankentry_size * h_entry_count))
-        stream.seek(regions['ENTRYMETADATA'].offset)
+        stream = region_stream(regions['ENTRYMETADATA'])
         entry_metadata = [XWBEntry._make(stream.unpack(_WB_ENTRY))
                           for _ in range(h_entry_count)]
 
@@ -160,14 +191,14 @@ class XWB(object):
             if regions['ENTRYNAMES'].length != h_entry_name_element_size * h_entry_count:
                 raise ReaderError("Invalid ENTRYNAMES region size: {} != {}".format(
                     regions['ENTRYNAMES'].length, h_entry_name_element_size * h_entry_count))
-            stream.seek(regions['ENTRYNAMES'].offset)
+            stream = region_stream(regions['ENTRYNAMES'])
             entry_names = [stream.read(h_entry_name_element_size).rstrip(b'\x00').decode('iso8859-1')
                            for _ in range(h_entry_count)]
 
         # read SEEKTABLES if present
         entry_seektables = []
         if self.has_seek_tables and regions['SEEKTABLES'].offset and regions['SEEKTABLES'].length:
-            stream.seek(regions['SEEKTABLES'].offset)
+            stream = region_stream(regions['SEEKTABLES'])
             seek_offsets = []
             for _ in range(h_entry_count):
                 seek_offsets.append(stream.read_int32())
@@ -210,7 +241,7 @@ class XWB(object):
                 c_format_tag = WAVE_FORMAT_ADPCM
                 c_bits_per_sample = 4
                 c_block_align = (c_block_align + ADPCM_BLOCK_ALIGN_OFFSET) * c_channels
-                cx_samples_per_block = ((c_block_align - (7 * c_channels)) * 8) // (c_bits_per_sample * c_channels) + 2
+                cx_samples_per_block = samples_per_block(c_block_align, c_channels)
                 c_avg_bytes_per_sec = (c_samples_per_sec // cx_samples_per_block) * c_block_align
                 cx_num_coef = len(ADPCM_COEF)
                 extra_header = _ADPCM_WAVEFORMAT.pack(cx_samples_per_block, cx_num_coef)
@@ -260,14 +291,21 @@ class XWB(object):
             entry_header = _WAVEFORMATEX.pack(c_format_tag, c_channels, c_samples_per_sec, c_avg_bytes_per_sec,
                                               c_block_align, c_bits_per_sample, cx_size)
             entry_header += extra_header
-            # read entry wave data
-            stream.seek(regions['ENTRYWAVEDATA'].offset + cur_meta.play_offset)
-            # manually swap PCM data if needed
-            entry_data = stream.read(cur_meta.play_length)
-            if big_endian and c_format_tag == WAVE_FORMAT_PCM and c_bits_per_sample == 16:
-                entry_data = bytearray(entry_data)
-                entry_data[1::2], entry_data[0::2] = entry_data[0::2], entry_data[1::2]
-            self.entries.append(Entry(entry_name, entry_header, entry_data, entry_dpds, entry_seek))
+            # wave data is only located here, see Entry.data
+            entry_blob = Blob(source, regions['ENTRYWAVEDATA'].offset + cur_meta.play_offset, cur_meta.play_length)
+            needs_swap = big_endian and c_format_tag == WAVE_FORMAT_PCM and c_bits_per_sample == 16
+            self.entries.append(Entry(entry_name, entry_header, entry_blob, entry_dpds, entry_seek, needs_swap))
+        self._entry_index = {}
+        for i, entry in enumerate(self.entries):
+            if entry.name and entry.name not in self._entry_index:
+                self._entry_index[entry.name] = i
+
+    def close(self):
+        """
+        unmap a bank read from a file, entry data can not be read afterwards
+        """
+        if self._mapping is not None:
+            self._mapping.close()
 
     @property
     def is_buffer(self):
@@ -293,14 +331,103 @@ class XWB(object):
     def has_seek_tables(self):
         return bool(self.flags & WB_FLAGS_SEEK_TABLES)
 
-    def export(self, out_dir):
+    def entry_index(self, name):
+        """
+        index of the first entry called name, raises KeyError if there is none
+        """
+        return self._entry_index[name]
+
+    def get_entry(self, name):
+        return self.entries[self._entry_index[name]]
+
+    def export(self, out_dir, threads=None, decode_adpcm=False, names=None, summary=False):
+        """
+        export every entry on a pool of threads, threads defaults to the number of CPUs.
+        entries are streamed out a chunk at a time so memory in use is bounded by the number of threads, streaming
+        banks are read a streaming_window at a time with aligned reads.
+        decode_adpcm writes MS-ADPCM entries as 16 bit PCM, names maps entry indexes to file names to use instead
+        of the entry names, summary writes a peaks sidecar for each PCM and MS-ADPCM entry. Returns the files written
+        """
+        self._make_export_dir(out_dir)
+        # settled up front so no two entries exported at the same time write the same file
+        out_names = self.output_names(names)
+        outputs = []
+        if threads == 1:
+            for i in range(len(self.entries)):
+                outputs.extend(self.export_entry(i, out_dir, decode_adpcm, out_names[i], summary))
+            return outputs
+        pool = ThreadPool(threads)
+        try:
+            for entry_outputs in pool.imap_unordered(
+                    lambda i: self.export_entry(i, out_dir, decode_adpcm, out_names[i], summary),
+                    range(len(self.entries))):
+                outputs.extend(entry_outputs)
+        finally:
+            pool.terminate()
+            pool.join()
+        return outputs
+
+    def export_entry(self, index, out_dir, decode_adpcm=False, name=None, summary=False):
+        """
+        export one entry, by index or name, to name if given, returns the files written
+        """
+        if not isinstance(index, Integral):
+            index = self.entry_index(index)
+        entry = self.entries[index]
+        out_dir = self._make_export_dir(out_dir)
+        out_filename = os.path.join(out_dir, self._entry_name(index, name))
+        asset_name = os.path.basename(out_filename)
+        if self.bank_name:
+            asset_name = '{}/{}'.format(self.bank_name, asset_name)
+        with asset(asset_name) as timer:
+            data = entry.blob
+            if self.is_streaming and self.filename is not None:
+                # aligned windowed reads rather than paging the mapping in, memory stays flat on multi-gigabyte banks
+                data = FileRegion(self.filename, entry.blob.offset, len(entry.blob), self.alignment,
+                                  self.streaming_window)
+            outputs = PyWavWriter(header=entry.header, data=data, dpds=entry.dpds, seek=entry.seek,
+                                  swap_samples=entry.needs_swap, decode_adpcm=decode_adpcm,
+                                  summary=summary).write(out_filename)
+            if timer.enabled:
+                timer.bytes_in = len(entry.blob)
+                timer.bytes_out = sum(os.path.getsize(output) for output in outputs)
+        return outputs
+
+    def output_names(self, names=None):
+        """
+        file name for each entry by index, names maps entry indexes to names to use instead of the entry names.
+        Repeated names, ignoring case, are numbered in entry order
+        """
+        if names is None:
+            names = {}
+        out_names = []
+        used = set()
+        for i in range(len(self.entries)):
+            name = self._entry_name(i, names.get(i))
+            out_name = name
+            count = 0
+            while out_name.lower() in used:
+                count += 1
+                out_name = '{}_{}'.format(name, count)
+            used.add(out_name.lower())
+            out_names.append(out_name)
+        return out_names
+
+    def _entry_name(self, index, name=None):
+        if name:
+            return name
+        if self.entries[index].name:
+            return self.entries[index].name
+        return str(index)
+
+    def _make_export_dir(self, out_dir):
         if self.bank_name:
             out_dir = os.path.join(out_dir, self.bank_name)
         if not os.path.isdir(out_dir):
-            os.makedirs(out_dir)
-        for i, entry in enumerate(self.entries):
-            if entry.name:
-                out_filename = os.path.join(out_dir, entry.name)
-            else:
-                out_filename = os.path.join(out_dir, str(i))
-            PyWavWriter(header=entry.header, data=entry.data, dpds=entry.dpds, seek=entry.seek).write(out_filename)
+            try:
+                os.makedirs(out_dir)
+            except OSError:
+                # created by another thread
+                if not os.path.isdir(out_dir):
+                    raise
+        return out_dir
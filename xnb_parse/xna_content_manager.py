@@ -7,16 +7,22 @@ from __future__ import print_function
 import fnmatch
 import os
 from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
 
+from xnb_parse.binstream import map_file
+from xnb_parse.export_manifest import file_stat
+from xnb_parse.pipeline_metrics import stage
+from xnb_parse.snapshot_cache import snapshot_cache_from_environment
 from xnb_parse.type_reader import ReaderError
 from xnb_parse.xnb_reader import XNBReader
+from xnb_parse.xna_types.xna_media import SoundEffect
 from xnb_parse.file_formats.xml_utils import output_xml
 
 
 class ContentManager(object):
     content_extension = '.xnb'
 
-    def __init__(self, root_dir):
+    def __init__(self, root_dir, snapshot_cache=None, object_cache=None):
         root_dir = os.path.normpath(root_dir)
         if not os.path.isdir(root_dir):
             raise ReaderError("Content root directory not found: '%s'" % root_dir)
@@ -26,15 +32,95 @@ class ContentManager(object):
             if k not in self._asset_dict:
                 self._asset_dict[k] = v
         self.assets = self._asset_dict.keys()
+        if snapshot_cache is None:
+            snapshot_cache = snapshot_cache_from_environment()
+        self.snapshot_cache = snapshot_cache
+        self.object_cache = object_cache
 
-    def xnb(self, asset_name, expected_type=None, parse=True):
+    def asset_filename(self, asset_name):
         asset_name = asset_name.replace('\\', '/')
         asset_name = asset_name.lower()
-        asset_filename = os.path.join(self.root_dir, self._asset_dict[asset_name])
+        return os.path.join(self.root_dir, self._asset_dict[asset_name])
+
+    def xnb(self, asset_name, expected_type=None, parse=True):
+        asset_filename = self.asset_filename(asset_name)
         return XNBReader.load(filename=asset_filename, expected_type=expected_type, parse=parse)
 
+    def asset_data(self, asset_name):
+        with stage('read'):
+            return map_file(self.asset_filename(asset_name))
+
     def load(self, asset_name, expected_type=None):
-        return self.xnb(asset_name, expected_type).content
+        """
+        load and parse an asset, through the object cache if there is one in which case the asset may be shared
+        """
+        if self.object_cache is None:
+            return self._load(asset_name, expected_type)
+        asset_name = asset_name.replace('\\', '/')
+        asset_name = asset_name.lower()
+        return self.object_cache.get((asset_name, expected_type), lambda: self._load(asset_name, expected_type))
+
+    def _load(self, asset_name, expected_type=None):
+        if self.snapshot_cache is None:
+            return self.xnb(asset_name, expected_type).content
+        # an unchanged file finds its snapshot by stat alone, otherwise it is read once for both the key and parsing
+        stat_key = self.snapshot_stat_key(asset_name, expected_type)
+        if stat_key is not None:
+            key = self.snapshot_cache.lookup(stat_key)
+            if key is not None:
+                content = self.snapshot_cache.get(key)
+                if content is not None:
+                    return content
+        asset_data = self.asset_data(asset_name)
+        key = self.snapshot_cache.key(asset_data, expected_type)
+        content = self.snapshot_cache.get(key)
+        if content is None:
+            content = XNBReader.load(data=asset_data, expected_type=expected_type).content
+            self.snapshot_cache.put(key, content)
+        if stat_key is not None:
+            self.snapshot_cache.link(stat_key, key)
+        return content
+
+    def snapshot_stat_key(self, asset_name, expected_type=None):
+        """
+        snapshot cache key for the asset by the stat of its file, None if it is not a file of its own
+        """
+        asset_filename = self.asset_filename(asset_name)
+        return self.snapshot_cache.stat_key(asset_filename, file_stat(asset_filename), expected_type)
+
+    def load_many(self, asset_names=None, expected_type=None, threads=None):
+        """
+        load assets on a pool of threads, yields (asset_name, asset) in the order given.
+        threads defaults to the number of CPUs
+        """
+        def load_asset(asset_name):
+            return asset_name, self.load(asset_name, expected_type)
+
+        return self._map_assets(load_asset, asset_names, threads)
+
+    def inspect(self, asset_name):
+        asset_filename = self.asset_filename(asset_name)
+        return XNBReader.inspect(filename=asset_filename)
+
+    def inspect_many(self, asset_names=None, threads=None):
+        """
+        inspect asset headers on a pool of threads, yields (asset_name, XNBInfo) in the order given
+        """
+        def inspect_asset(asset_name):
+            return asset_name, self.inspect(asset_name)
+
+        return self._map_assets(inspect_asset, asset_names, threads)
+
+    def _map_assets(self, func, asset_names=None, threads=None):
+        if asset_names is None:
+            asset_names = self.assets
+        pool = ThreadPool(threads)
+        try:
+            for result in pool.imap(func, asset_names):
+                yield result
+        finally:
+            pool.terminate()
+            pool.join()
 
     def find_assets(self):
         for path, _, filelist in os.walk(self.root_dir, followlinks=True):
@@ -47,16 +133,33 @@ class ContentManager(object):
                 asset = asset.lower()
                 yield asset, asset_filename
 
+    def close(self):
+        """
+        release anything held open for reading assets, asset data can not be read afterwards
+        """
+        pass
+
     def filter(self, search='*'):
         return fnmatch.filter(self.assets, search)
 
     @staticmethod
-    def export(asset, asset_name, export_dir, export_file=True, export_xml=True):
+    def export(asset, asset_name, export_dir, export_file=True, export_xml=True, decode_adpcm=False, summary=False):
+        """
+        export asset under export_dir, returns the files written. decode_adpcm and summary are passed on to sounds
+        """
         filename = os.path.join(export_dir, os.path.normpath(asset_name))
         dirname = os.path.dirname(filename)
         if not os.path.isdir(dirname):
             os.makedirs(dirname)
-        if export_file and hasattr(asset, 'export'):
-            asset.export(filename)
+        outputs = []
+        if export_file and isinstance(asset, SoundEffect):
+            outputs.extend(asset.export(filename, decode_adpcm=decode_adpcm, summary=summary))
+        elif export_file and hasattr(asset, 'export'):
+            outputs.extend(asset.export(filename))
         if export_xml and hasattr(asset, 'xml'):
-            output_xml(asset.xml(), filename + '.xml')
+            with stage('encode'):
+                xml = asset.xml()
+            with stage('write'):
+                output_xml(xml, filename + '.xml')
+            outputs.append(filename + '.xml')
+        return outputs
@@ -12,13 +12,54 @@ import platform
 import sys
 import ctypes
 
+from xnb_parse.decomp_cache import DecompressionCache, DEFAULT_MAX_BYTES
+
 
 _XNA_VERSIONS = ['v4.0', 'v3.1', 'v3.0']
 _DLL_NAME = 'XnaNative.dll'
+# opt in to the decompression cache for all tools, size in MiB
+CACHE_DIR_ENV = 'XNB_PARSE_DECOMP_CACHE'
+CACHE_SIZE_ENV = 'XNB_PARSE_DECOMP_CACHE_SIZE'
 
 _native_dir = None
 
 
+def set_decompression_cache(cache):
+    """
+    use cache, a DecompressionCache, for all decompress calls. None turns caching off, returns the previous cache
+    """
+    global _decompression_cache
+    previous = _decompression_cache
+    _decompression_cache = cache
+    return previous
+
+
+def get_decompression_cache():
+    return _decompression_cache
+
+
+def _cache_from_environment():
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if not cache_dir:
+        return None
+    max_bytes = DEFAULT_MAX_BYTES
+    cache_size = os.environ.get(CACHE_SIZE_ENV)
+    if cache_size:
+        try:
+            cache_mib = int(cache_size)
+        except ValueError:
+            cache_mib = 0
+        if cache_mib > 0:
+            max_bytes = cache_mib * 1024 * 1024
+        else:
+            print("{} is not a size in MiB, using the default: '{}'".format(CACHE_SIZE_ENV, cache_size),
+                  file=sys.stderr)
+    return DecompressionCache(cache_dir, max_bytes)
+
+
+_decompression_cache = _cache_from_environment()
+
+
 def _find_native():
     global _native_dir
     if _native_dir:
@@ -64,7 +105,27 @@ def decomp_context(dll):
     dll.DestroyDecompressionContext(ctx)
 
 
-def decompress(in_buf, out_size):
+def decompress(in_buf, out_size, limit=None):
+    """
+    decompress an XNB payload, if limit is given stop once at least that many bytes are out and return only those.
+    complete payloads go through the decompression cache if one is set
+    """
+    cache = _decompression_cache
+    if cache is None or limit is not None:
+        return _decompress(in_buf, out_size, limit)
+    key = cache.key(in_buf, out_size)
+    data = cache.get(key, out_size)
+    if data is None:
+        data = _decompress(in_buf, out_size)
+        try:
+            cache.put(key, data)
+        except (IOError, OSError):
+            # full, read only or lost a race renaming into place, the payload is decompressed all the same
+            cache.write_errors += 1
+    return data
+
+
+def _decompress(in_buf, out_size, limit=None):
     dll = ctypes.CDLL(_find_native())
 
     with decomp_context(dll) as ctx:
@@ -78,6 +139,8 @@ def decompress(in_buf, out_size):
         s_out_buf = ctypes.create_string_buffer(out_size)
 
         while decompressed_todo > 0 and compressed_todo > 0:
+            if limit is not None and decompressed_position >= limit:
+                break
             compressed_size = in_size - compressed_position
             decompressed_size = out_size - decompressed_position
 
@@ -97,6 +160,8 @@ def decompress(in_buf, out_size):
             decompressed_position += r_decompressed_size
             compressed_todo -= r_compressed_size
             decompressed_todo -= r_decompressed_size
+    if limit is not None:
+        return s_out_buf.raw[:decompressed_position]
     return s_out_buf.raw
 
 
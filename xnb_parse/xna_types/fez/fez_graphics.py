@@ -68,7 +68,7 @@ class ArtObjectPC(object):
         return root
 
     def export(self, filename):
-        self.cubemap.export(filename)
+        return self.cubemap.export(filename)
 
 
 class ShaderInstancedIndexedPrimitives(object):
@@ -168,20 +168,23 @@ class AnimatedTexture(object):
 
     def export(self, filename):
         if self.frames is not None:
-            self.export_single(filename)
+            return self.export_single(filename)
+        return []
 
     def export_each(self, filename):
+        outputs = []
         for i, cur_frame in enumerate(self.frames):
             texture = Texture2D(self.surface_format, self.width, self.height, [cur_frame.data])
             cur_filename = "{}_ani\\{}".format(filename, i)
-            texture.export(cur_filename)
+            outputs.extend(texture.export(cur_filename))
+        return outputs
 
     def export_single(self, filename):
         texture_data = bytearray()
         for cur_frame in self.frames:
             texture_data.extend(cur_frame.data)
         texture = Texture2D(self.surface_format, self.width, self.height * len(self.frames), [texture_data])
-        texture.export(filename + '.ani')
+        return texture.export(filename + '.ani')
 
 
 class AnimatedTexturePC(object):
@@ -215,7 +218,8 @@ class AnimatedTexturePC(object):
     def export(self, filename):
         if self.data is not None:
             texture = Texture2D(self.surface_format, self.width, self.height, [self.data])
-            texture.export(filename + '.ani')
+            return texture.export(filename + '.ani')
+        return []
 
 
 class Frame(object):
@@ -4,6 +4,7 @@ FEZ level types
 
 from __future__ import print_function
 
+import sys
 from collections import namedtuple
 
 from xnb_parse.file_formats.xml_utils import ET
@@ -39,17 +40,37 @@ class MapNode(object):
         return "MapNode '{}' t:{} c:{}".format(self.level_name, self.node_type, len(self.connections))
 
     def xml(self, parent):
-        root = ET.SubElement(parent, 'Node')
-        root.set('name', self.level_name)
-        root.set('hasLesserGate', str(self.has_lesser_gate))
-        root.set('hasWarpGate', str(self.has_warp_gate))
-        if self.node_type is not None:
-            root.set('type', str(self.node_type))
-        if self.conditions is not None:
-            self.conditions.xml(root)
-        if self.connections is not None:
-            self.connections.xml(root, 'Connections')
-        return root
+        # maps chain nodes through their connections as deep as they go, so nodes are added off a stack rather
+        # than by recursing. Each connection holds only its node, adding that later keeps the document order
+        if sys.version < '3':
+            conv = unicode
+        else:
+            conv = str
+        node_root = None
+        stack = [(self, parent)]
+        while stack:
+            node, node_parent = stack.pop()
+            root = ET.SubElement(node_parent, 'Node')
+            if node_root is None:
+                node_root = root
+            root.set('name', node.level_name)
+            root.set('hasLesserGate', str(node.has_lesser_gate))
+            root.set('hasWarpGate', str(node.has_warp_gate))
+            if node.node_type is not None:
+                root.set('type', str(node.node_type))
+            if node.conditions is not None:
+                node.conditions.xml(root)
+            if node.connections is not None:
+                connections_root = ET.SubElement(root, 'Connections')
+                for connection in node.connections:
+                    if not hasattr(connection, 'xml_connection'):
+                        # null entries are written as XNAList writes them
+                        ET.SubElement(connections_root, 'Entry').text = conv(connection)
+                        continue
+                    connection_root = connection.xml_connection(connections_root)
+                    if connection.node is not None:
+                        stack.append((connection.node, connection_root))
+        return node_root
 
 
 class MapNodeConnection(object):
@@ -62,12 +83,19 @@ class MapNodeConnection(object):
         return "MapNodeConnection f:{}".format(self.face)
 
     def xml(self, parent):
+        root = self.xml_connection(parent)
+        if self.node is not None:
+            self.node.xml(root)
+        return root
+
+    def xml_connection(self, parent):
+        """
+        the Connection element without its node
+        """
         root = ET.SubElement(parent, 'Connection')
         root.set('branchOversize', str(self.branch_oversize))
         if self.face is not None:
             root.set('face', str(self.face))
-        if self.node is not None:
-            self.node.xml(root)
         return root
 
 
@@ -213,7 +241,8 @@ class TrileSet(object):
 
     def export(self, filename):
         if self.texture_atlas is not None:
-            self.texture_atlas.export(filename)
+            return self.texture_atlas.export(filename)
+        return []
 
 
 class Trile(object):
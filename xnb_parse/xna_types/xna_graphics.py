@@ -6,6 +6,7 @@ from __future__ import print_function
 
 import os
 
+from xnb_parse.binstream import blob_data
 from xnb_parse.type_reader import ReaderError
 from xnb_parse.xna_types.xna_primitive import Enum
 from xnb_parse.file_formats.png import write_png
@@ -145,21 +146,24 @@ class Texture2D(object):
         if not os.path.isdir(dirname):
             os.makedirs(dirname)
 
+        data = blob_data(self.mip_levels[0])
+        outputs = []
         # hack for ArtObject/TrileSet alpha channel
         alpha = 'yes'
         if 'art objects' in filename or 'trile sets' in filename:
             alpha = 'no'
-            rows = self.surface_format.reader(self.mip_levels[0], self.width, self.height, self.needs_swap,
-                                              alpha='only')
-            write_png(filename + '_alpha', self.width, self.height, rows)
-        rows = self.surface_format.reader(self.mip_levels[0], self.width, self.height, self.needs_swap, alpha=alpha)
-        write_png(filename, self.width, self.height, rows)
+            rows = self.surface_format.reader(data, self.width, self.height, self.needs_swap, alpha='only')
+            outputs.append(write_png(filename + '_alpha', self.width, self.height, rows))
+        rows = self.surface_format.reader(data, self.width, self.height, self.needs_swap, alpha=alpha)
+        outputs.append(write_png(filename, self.width, self.height, rows))
+        return outputs
 
     def full_data(self, alpha='yes'):
         if not self.surface_format.reader:
             raise ReaderError("No decoder found: '{}'".format(self.surface_format))
 
-        rows = self.surface_format.reader(self.mip_levels[0], self.width, self.height, self.needs_swap, alpha=alpha)
+        rows = self.surface_format.reader(blob_data(self.mip_levels[0]), self.width, self.height, self.needs_swap,
+                                          alpha=alpha)
         data = bytearray()
         for row in rows:
             data.extend(row)
@@ -213,7 +217,8 @@ class Effect(object):
         if not os.path.isdir(out_dir):
             os.makedirs(out_dir)
         with open(filename + '.fxo', 'wb') as out_handle:
-            out_handle.write(self.effect_data)
+            out_handle.write(blob_data(self.effect_data))
+        return [filename + '.fxo']
 
 
 class BasicEffect(object):
@@ -282,7 +287,8 @@ class SpriteFont(object):
 
     def export(self, filename):
         if self.texture is not None:
-            self.texture.export(filename)
+            return self.texture.export(filename)
+        return []
 
 
 class PrimitiveType(Enum):
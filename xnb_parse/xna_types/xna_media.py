@@ -22,8 +22,8 @@ class SoundEffect(object):
         return "SoundEffect fs:{} ds:{} d:{}ms ls:{} ll:{}".format(len(self.sound_format), len(self.sound_data),
                                                                    self.duration, self.loop_start, self.loop_length)
 
-    def export(self, filename):
-        write_wav(filename, self.sound_format, self.sound_data, self.needs_swap)
+    def export(self, filename, decode_adpcm=False, summary=False):
+        return write_wav(filename, self.sound_format, self.sound_data, self.needs_swap, decode_adpcm, summary)
 
     def xml(self, parent=None):
         if parent is None:
@@ -9,17 +9,27 @@ import sys
 import time
 import os
 
+from xnb_parse.pipeline_metrics import PipelineMetrics, dump_metrics
 from xnb_parse.xna_content_manager import ContentManager
+from xnb_parse.xnb_reader import XNB_EXTENSION
 
 
 def read_xnb(in_dir, out_dir):
     content_manager = ContentManager(in_dir)
     out_dir = os.path.normpath(out_dir)
-    for asset_name in content_manager.assets:
-        print(asset_name)
-        xnb = content_manager.xnb(asset_name, parse=False)
-        out_file = os.path.join(out_dir, os.path.normpath(asset_name))
-        xnb.save(filename=out_file)
+    metrics = PipelineMetrics('xnb_decomp').start()
+    try:
+        for asset_name in content_manager.assets:
+            print(asset_name)
+            with metrics.asset(asset_name) as timer:
+                timer.bytes_in = os.path.getsize(content_manager.asset_filename(asset_name))
+                xnb = content_manager.xnb(asset_name, parse=False)
+                out_file = os.path.join(out_dir, os.path.normpath(asset_name))
+                xnb.save(filename=out_file)
+                timer.bytes_out = os.path.getsize(out_file + XNB_EXTENSION)
+    finally:
+        metrics.stop()
+    dump_metrics(metrics)
 
 
 def main():
@@ -5,17 +5,22 @@ XNB parser
 from __future__ import print_function
 
 import os
-
+import struct
 import sys
+from collections import namedtuple
+from threading import Lock
+from timeit import default_timer
 
-from xnb_parse.binstream import BinaryStream
+from xnb_parse.binstream import BinaryStream, map_file
 from xnb_parse.type_reader_manager import TypeReaderManager
 from xnb_parse.xna_native import decompress
-from xnb_parse.type_reader import ReaderError, generic_reader_type
+from xnb_parse.type_reader import BaseTypeReader, ReaderError, ReadObject, generic_reader_type
 from xnb_parse.type_readers.xna_system import EnumReader
 from xnb_parse.xna_types.xna_math import Color, Vector2, Vector3, Vector4, Quaternion, Matrix
 from xnb_parse.xna_types.xna_system import XNAList, ExternalReference
 from xnb_parse.file_formats.xml_utils import output_xml
+from xnb_parse.reader_profile import profile_from_environment
+from xnb_parse.pipeline_metrics import stage
 
 
 XNB_EXTENSION = '.xnb'
@@ -35,18 +40,36 @@ XNB_PROFILES = {PROFILE_REACH: 'r', PROFILE_HIDEF: 'h'}
 _PROFILE_MASK = 0x7f
 _COMPRESS_MASK = 0x80
 _XNB_HEADER = '3s c B B I'
+# enough for the type reader table of nearly every asset, inspect reads more if needed
+_INSPECT_PREFIX = 4096
+
+XNBInfo = namedtuple('XNBInfo', ['platform', 'version', 'profile', 'compressed', 'file_size', 'data_size',
+                                 'type_readers', 'root_reader', 'root_type'])
 
 
 class XNBReader(BinaryStream):
     _type_reader_manager = None
+    _type_reader_manager_lock = Lock()
+    # expected type names by reader class and type params, and reader/expected type pairs already verified, shared
+    # between files
+    _expected_types = {}
+    _checked_types = set()
+    # ReaderProfile every reader adds its counts to, see set_reader_profile
+    reader_profile = profile_from_environment()
 
     def __init__(self, data, file_platform=PLATFORM_WINDOWS, file_version=VERSION_40, graphics_profile=PROFILE_REACH,
                  compressed=False, parse=True, expected_type=None):
         BinaryStream.__init__(self, data=data)
         del data
-        if XNBReader._type_reader_manager is None:
-            XNBReader._type_reader_manager = TypeReaderManager()
-        self.type_reader_manager = XNBReader._type_reader_manager
+        self._reader_profile = self.reader_profile
+        if self._reader_profile is not None:
+            # instance attributes in front of the plain methods, so nothing is checked per read when not profiling
+            self._profile_stats = {}
+            self._profile_stack = []
+            self.read_object = self._profiled_read_object
+            self.read_value_or_object = self._profiled_read_value_or_object
+            self.read_iterative = self._profiled_read_iterative
+        self.type_reader_manager = self.get_type_reader_manager()
         self.file_platform = file_platform
         self.file_version = file_version
         self.graphics_profile = graphics_profile
@@ -58,6 +81,24 @@ class XNBReader(BinaryStream):
         if parse:
             self.parse(expected_type=expected_type)
 
+    @classmethod
+    def set_reader_profile(cls, reader_profile):
+        """
+        profile readers created from now on into reader_profile, a ReaderProfile. None turns profiling off, returns
+        the previous profile
+        """
+        previous = cls.reader_profile
+        XNBReader.reader_profile = reader_profile
+        return previous
+
+    @staticmethod
+    def get_type_reader_manager():
+        if XNBReader._type_reader_manager is None:
+            with XNBReader._type_reader_manager_lock:
+                if XNBReader._type_reader_manager is None:
+                    XNBReader._type_reader_manager = TypeReaderManager()
+        return XNBReader._type_reader_manager
+
     def __str__(self):
         return 'XNB {}{}{} s:{}'.format(XNB_PLATFORMS[self.file_platform], XNB_VERSIONS[self.file_version],
                                         XNB_PROFILES[self.graphics_profile], self.length())
@@ -67,32 +108,34 @@ class XNBReader(BinaryStream):
             return self.content
 
         reader_count = self.read_7bit_encoded_int()
-        for _ in range(reader_count):
-            reader_name = self.read_string()
-            reader_version = self.read_int32()
-            reader = self.get_type_reader(reader_name, reader_version)
-            self.type_readers.append(reader)
-
-        if verbose:
-            print("Type: {!s}".format(self.type_readers[0]))
-
-        for reader in self.type_readers:
-            reader.init_reader(self.file_platform, self.file_version)
+        reader_specs = tuple((self.read_string(), self.read_int32()) for _ in range(reader_count))
+        reader_table = self.type_reader_manager.get_reader_table(self, reader_specs, self.file_platform,
+                                                                 self.file_version)
+        try:
+            self.type_readers = reader_table.readers
 
-        shared_count = self.read_7bit_encoded_int()
+            if verbose:
+                print("Type: {!s}".format(self.type_readers[0]))
 
-        if shared_count:
-            raise ReaderError("Shared resources present")
+            shared_count = self.read_7bit_encoded_int()
 
-        self.content = self.read_object(expected_type=expected_type)
-        if verbose:
-            print("Asset: {!s}".format(self.content))
+            if shared_count:
+                raise ReaderError("Shared resources present")
 
-        for i in range(shared_count):
-            obj = self.read_object()
-            self.shared_objects.append(obj)
+            self.content = self.read_object(expected_type=expected_type)
             if verbose:
-                print("Shared resource {}: {!s}".format(i, obj))
+                print("Asset: {!s}".format(self.content))
+
+            for i in range(shared_count):
+                obj = self.read_object()
+                self.shared_objects.append(obj)
+                if verbose:
+                    print("Shared resource {}: {!s}".format(i, obj))
+        finally:
+            self.type_reader_manager.release_reader_table(reader_table)
+            if self._reader_profile is not None:
+                self._reader_profile.merge(self._profile_stats)
+                self._profile_stats = {}
 
         remaining = self.read()
         if len(remaining):
@@ -108,11 +151,42 @@ class XNBReader(BinaryStream):
         return reader_type_class(self, version)
 
     @classmethod
-    def load(cls, data=None, filename=None, parse=True, expected_type=None):
+    def load(cls, data=None, filename=None, parse=True, expected_type=None, offset=0, length=None):
+        """
+        load from data or the length bytes at offset in filename
+        """
+        mapping = None
         if filename is not None:
             filename = os.path.normpath(filename)
-        stream = BinaryStream(data=data, filename=filename)
+        with stage('read'):
+            if filename is not None:
+                data = mapping = map_file(filename, offset, length)
+            stream = BinaryStream(data=data)
         del data
+        try:
+            platform, version, profile, compressed, size = cls._read_header(stream, stream.length())
+            if compressed:
+                uncomp = stream.read_int32()
+                size -= 4
+                content_comp = stream.read(size)
+                # the compressed data is copied out, the file need not stay mapped
+                if mapping is not None:
+                    mapping.close()
+                with stage('decompress'):
+                    content = decompress(content_comp, uncomp)
+            else:
+                # a mapped file stays mapped, payloads read as Blobs are left in it until used and it is unmapped
+                # along with them
+                content = stream.read_blob(size)
+            with stage('parse'):
+                return cls(content, platform, version, profile, compressed, parse=parse, expected_type=expected_type)
+        except Exception:
+            if mapping is not None:
+                mapping.close()
+            raise
+
+    @staticmethod
+    def _read_header(stream, stream_length):
         (sig, platform, version, attribs, size) = stream.unpack(_XNB_HEADER)
         if sig != XNB_SIGNATURE:
             raise ReaderError("bad sig: '{!r}'".format(sig))
@@ -120,7 +194,6 @@ class XNBReader(BinaryStream):
             raise ReaderError("bad platform: '{!r}'".format(platform))
         if version not in XNB_VERSIONS:
             raise ReaderError("bad version: {}".format(version))
-        stream_length = stream.length()
         if stream_length != size:
             raise ReaderError("bad size: {} != {}".format(stream_length, size))
         compressed = False
@@ -132,14 +205,73 @@ class XNBReader(BinaryStream):
         if version >= VERSION_30:
             compressed = bool(attribs & _COMPRESS_MASK)
             size -= stream.calc_size(_XNB_HEADER)
+        return platform, version, profile, compressed, size
+
+    @classmethod
+    def inspect(cls, filename=None, data=None, prefix_size=_INSPECT_PREFIX):
+        """
+        read just the header and type reader table, decompressing only as far as needed, returns an XNBInfo.
+        data can be anything sliceable such as a Blob
+        """
+        if filename is not None:
+            filename = os.path.normpath(filename)
+            file_size = os.path.getsize(filename)
+        else:
+            file_size = len(data)
+        while True:
+            prefix_size = min(prefix_size, file_size)
+            if filename is not None:
+                with open(filename, 'rb') as file_handle:
+                    prefix = file_handle.read(prefix_size)
+            else:
+                prefix = data[:prefix_size]
+            info = cls._inspect_prefix(prefix, file_size)
+            if info is not None:
+                return info
+            prefix_size *= 4
+
+    @classmethod
+    def _inspect_prefix(cls, prefix, file_size):
+        # returns None when the prefix turns out too short
+        stream = BinaryStream(data=prefix)
+        platform, version, profile, compressed, size = cls._read_header(stream, file_size)
+        complete = len(prefix) >= file_size
         if compressed:
-            uncomp = stream.read_int32()
-            size -= 4
-            content_comp = stream.read(size)
-            content = decompress(content_comp, uncomp)
+            data_size = stream.read_int32()
+            try:
+                # LZX output outruns its input, so a prefix of the compressed data covers the reader table
+                content = decompress(stream.read(), data_size, None if complete else len(prefix) * 2)
+            except IOError:
+                if complete:
+                    raise
+                return None
         else:
-            content = stream.read(size)
-        return cls(content, platform, version, profile, compressed, parse=parse, expected_type=expected_type)
+            data_size = size
+            content = stream.read()
+        content_stream = BinaryStream(data=content)
+        try:
+            reader_count = content_stream.read_7bit_encoded_int()
+            type_readers = tuple((content_stream.read_string(), content_stream.read_int32())
+                                 for _ in range(reader_count))
+            content_stream.read_7bit_encoded_int()
+            root_id = content_stream.read_7bit_encoded_int()
+        except (struct.error, ValueError, UnicodeDecodeError):
+            if len(content) >= data_size:
+                raise
+            return None
+        if content_stream.tell() >= len(content) and len(content) < data_size:
+            # ran off the end of what was decompressed, some of the reads may have been short
+            return None
+        root_reader = None
+        root_type = None
+        if 0 < root_id <= len(type_readers):
+            root_reader = type_readers[root_id - 1][0]
+            try:
+                root_type = cls.get_type_reader_manager().get_type_reader(root_reader).target_type
+            except ReaderError:
+                pass
+        return XNBInfo(platform, version, profile, compressed, file_size, data_size, type_readers, root_reader,
+                       root_type)
 
     def save(self, filename=None, compress=False):
         if self.file_platform not in XNB_PLATFORMS:
@@ -171,11 +303,20 @@ class XNBReader(BinaryStream):
                 os.makedirs(dirname)
             if not filename.endswith(XNB_EXTENSION):
                 filename += XNB_EXTENSION
-            stream.write_file(filename)
+            with stage('write'):
+                stream.write_file(filename)
         else:
             return stream.getvalue()
 
     def read_object(self, expected_type_reader=None, type_params=None, expected_type=None):
+        type_reader = self.read_object_type(expected_type_reader, type_params, expected_type)
+        if type_reader is None:
+            return None
+        if type_reader.is_iterative:
+            return self.read_iterative(type_reader)
+        return type_reader.read()
+
+    def read_object_type(self, expected_type_reader=None, type_params=None, expected_type=None):
         type_id = self.read_7bit_encoded_int()
         if type_id == 0:
             # null object
@@ -186,17 +327,13 @@ class XNBReader(BinaryStream):
             raise ReaderError("type id out of range: {} > {}".format(type_id, len(self.type_readers)))
         if expected_type_reader is not None:
             try:
-                if expected_type_reader.is_generic_type and expected_type_reader.target_type is None:
-                    expected_type = generic_reader_type(expected_type_reader, type_params)
-                elif expected_type_reader.is_enum_type:
-                    expected_type = generic_reader_type(EnumReader, [expected_type_reader.target_type])
-                else:
-                    expected_type = expected_type_reader.target_type
-            except AttributeError:
-                raise ReaderError("bad expected_type_reader: '{}'".format(expected_type_reader))
-        if expected_type is not None:
-            if expected_type != 'System.Object':
-                if type_reader.target_type != expected_type:
+                expected_type = self._expected_types[self._expected_type_key(expected_type_reader, type_params)]
+            except (KeyError, TypeError):
+                expected_type = self._expected_type(expected_type_reader, type_params)
+        if expected_type is not None and expected_type != 'System.Object':
+            if type_reader.target_type != expected_type:
+                check_key = (type_reader.__class__, expected_type)
+                if check_key not in self._checked_types:
                     # check parent type readers
                     for cls in type_reader.__class__.__mro__:
                         if hasattr(cls, 'target_type'):
@@ -205,7 +342,62 @@ class XNBReader(BinaryStream):
                     else:
                         raise ReaderError("Unexpected type: '{}' != '{}'".format(type_reader.target_type,
                                                                                  expected_type))
-        return type_reader.read()
+                    self._checked_types.add(check_key)
+        return type_reader
+
+    @staticmethod
+    def _expected_type_key(expected_type_reader, type_params):
+        # reader instances belong to one file, their class decides the type so it keys the cache for every file
+        if isinstance(expected_type_reader, BaseTypeReader):
+            expected_type_reader = expected_type_reader.__class__
+        if type_params:
+            type_params = tuple(param.__class__ if isinstance(param, BaseTypeReader) else param
+                                for param in type_params)
+        return expected_type_reader, type_params
+
+    @classmethod
+    def _expected_type(cls, expected_type_reader, type_params):
+        try:
+            key = cls._expected_type_key(expected_type_reader, type_params)
+            hash(key)
+        except TypeError:
+            key = None
+        try:
+            if expected_type_reader.is_generic_type and expected_type_reader.target_type is None:
+                expected_type = generic_reader_type(expected_type_reader, type_params)
+            elif expected_type_reader.is_enum_type:
+                expected_type = generic_reader_type(EnumReader, [expected_type_reader.target_type])
+            else:
+                expected_type = expected_type_reader.target_type
+        except AttributeError:
+            raise ReaderError("bad expected_type_reader: '{}'".format(expected_type_reader))
+        if key is not None:
+            cls._expected_types[key] = expected_type
+        return expected_type
+
+    def read_iterative(self, type_reader):
+        """
+        run an iterative type reader, and any iterative readers it requests, off an explicit stack
+        """
+        read_object_type = self.read_object_type
+        stack = [type_reader.read_iter()]
+        push = stack.append
+        value = None
+        while stack:
+            request = stack[-1].send(value)
+            if type(request) is ReadObject:
+                nested_reader = read_object_type(request[0], request[1])
+                if nested_reader is None:
+                    value = None
+                elif nested_reader.is_iterative:
+                    push(nested_reader.read_iter())
+                    value = None
+                else:
+                    value = nested_reader.read()
+            else:
+                stack.pop()
+                value = request
+        return value
 
     def read_value_or_object(self, expected_type):
         if expected_type.is_value_type:
@@ -214,6 +406,81 @@ class XNBReader(BinaryStream):
         else:
             return self.read_object(expected_type=expected_type)
 
+    def _profiled_read_object(self, expected_type_reader=None, type_params=None, expected_type=None):
+        type_reader = self.read_object_type(expected_type_reader, type_params, expected_type)
+        if type_reader is None:
+            return None
+        if type_reader.is_iterative:
+            return self.read_iterative(type_reader)
+        return self._profiled_read(type_reader)
+
+    def _profiled_read_value_or_object(self, expected_type):
+        if expected_type.is_value_type:
+            return self._profiled_read(self.get_type_reader(expected_type))
+        else:
+            return self.read_object(expected_type=expected_type)
+
+    def _profiled_read(self, type_reader):
+        self._profile_enter()
+        try:
+            return type_reader.read()
+        finally:
+            self._profile_exit(type_reader)
+
+    def _profiled_read_iterative(self, type_reader):
+        """
+        read_iterative with each generator on the stack timed from its first request to its value
+        """
+        stack = [type_reader.read_iter()]
+        readers = [type_reader]
+        self._profile_enter()
+        value = None
+        try:
+            while stack:
+                request = stack[-1].send(value)
+                if type(request) is ReadObject:
+                    nested_reader = self.read_object_type(request[0], request[1])
+                    if nested_reader is None:
+                        value = None
+                    elif nested_reader.is_iterative:
+                        stack.append(nested_reader.read_iter())
+                        readers.append(nested_reader)
+                        self._profile_enter()
+                        value = None
+                    else:
+                        value = self._profiled_read(nested_reader)
+                else:
+                    stack.pop()
+                    self._profile_exit(readers.pop())
+                    value = request
+        finally:
+            # unwind the frames left by an error
+            while readers:
+                self._profile_exit(readers.pop())
+        return value
+
+    def _profile_enter(self):
+        # start time, start position, time and bytes of nested reads
+        self._profile_stack.append([default_timer(), self.tell(), 0.0, 0])
+
+    def _profile_exit(self, type_reader):
+        (start, start_pos, nested_time, nested_bytes) = self._profile_stack.pop()
+        elapsed = default_timer() - start
+        consumed = self.tell() - start_pos
+        name = type_reader.reader_name or type(type_reader).__name__
+        stats = self._profile_stats.get(name)
+        if stats is None:
+            stats = self._profile_stats[name] = [0, 0.0, 0.0, 0, 0]
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] += elapsed - nested_time
+        stats[3] += consumed
+        stats[4] += consumed - nested_bytes
+        if self._profile_stack:
+            parent = self._profile_stack[-1]
+            parent[2] += elapsed
+            parent[3] += consumed
+
     def read_type_id(self):
         type_id = self.read_7bit_encoded_int()
         if type_id == 0:
@@ -225,6 +492,9 @@ class XNBReader(BinaryStream):
             raise ReaderError("type id out of range: {} > {}".format(type_id, len(self.type_readers)))
 
     def export(self, filename, export_file=True, export_xml=True):
+        """
+        export the content to filename, returns the files written
+        """
         if not hasattr(self, 'content'):
             raise ReaderError("XNB content deleted")
         if self.content is None:
@@ -233,10 +503,13 @@ class XNBReader(BinaryStream):
         dirname = os.path.dirname(filename)
         if not os.path.isdir(dirname):
             os.makedirs(dirname)
+        outputs = []
         if export_file and hasattr(self.content, 'export'):
-            self.content.export(filename)
+            outputs.extend(self.content.export(filename))
         if export_xml and hasattr(self.content, 'xml'):
             output_xml(self.content.xml(), filename + '.xml')
+            outputs.append(filename + '.xml')
+        return outputs
 
     def read_color(self):
         return Color._make(self.unpack('4B'))